@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import uuid
+import tempfile
+import argparse
+import datetime
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine
+from database.backup import DEFAULT_BACKUP, run_backup
+
+def fill(engine, conversation_id, size_mb, batch=5000):
+    body = "yedekleme ölçümü için örnek mesaj gövdesi " * 20
+    now = datetime.datetime.now()
+    target = size_mb * 1024 * 1024
+    while os.path.getsize(engine.url.database) < target:
+        rows = [
+            {"message_id": str(uuid.uuid4()), "conversation_id": conversation_id, "message_content": body,
+             "response_message": body, "message_date": now, "sender": "user"}
+            for _ in range(batch)
+        ]
+        with engine.begin() as connection:
+            connection.execute(Message.__table__.insert(), rows)
+
+class Writer(threading.Thread):
+    def __init__(self, engine, conversation_id):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.conversation_id = conversation_id
+        self.stop_event = threading.Event()
+        self.stalls = []
+
+    def run(self):
+        while not self.stop_event.is_set():
+            t = time.perf_counter()
+            with self.engine.begin() as connection:
+                connection.execute(Message.__table__.insert(), {
+                    "message_id": str(uuid.uuid4()), "conversation_id": self.conversation_id,
+                    "message_content": "yazma", "message_date": datetime.datetime.now(), "sender": "user"
+                })
+            self.stalls.append((time.perf_counter() - t) * 1000)
+            time.sleep(0.005)
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimiçi yedekleme hızı ve yazıcı beklemesi ölçümü")
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--pages-per-step", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--step-sleep-ms", type=int, default=DEFAULT_BACKUP["step_sleep_ms"])
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        conversation_id = db.create_conversation("Bench", db.get_user("admin").user_id).conversation_id
+        db.session.close()
+        fill(engine, conversation_id, args.size_mb)
+        size = os.path.getsize(engine.url.database) / (1024 * 1024)
+        print(f"Veritabanı boyutu: {size:.1f} MB")
+
+        for pages in args.pages_per_step:
+            config = dict(DEFAULT_BACKUP, path=os.path.join(tmp, f"backups-{pages}"), compress=args.compress,
+                          pages_per_step=pages, step_sleep_ms=args.step_sleep_ms)
+            writer = Writer(engine, conversation_id)
+            writer.start()
+            stats = run_backup(engine.url.database, config)
+            writer.stop_event.set()
+            writer.join()
+            stalls = sorted(writer.stalls)
+            print(f"{pages} sayfa/adım: {stats['seconds']:.2f} sn, {size / stats['seconds']:.1f} MB/sn, "
+                  f"{stats['steps']} adım, yedek {stats['bytes'] / (1024 * 1024):.1f} MB, "
+                  f"yazıcı commit p50 {stalls[len(stalls) // 2]:.2f} ms, en uzun {stalls[-1]:.2f} ms "
+                  f"({len(stalls)} commit)")
+        dispose_engine()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+import argparse
+import datetime
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine, search, clear_caches
+from database.key_migration import migrate_keys
+
+def fill(engine, conversation_ids, count, batch=20000):
+    rng = random.Random(11)
+    now = datetime.datetime.now()
+    for start in range(0, count, batch):
+        rows = [
+            {"message_id": str(uuid.uuid4()), "conversation_id": rng.choice(conversation_ids),
+             "message_content": "kısa mesaj", "response_message": "kısa yanıt",
+             "message_date": now + datetime.timedelta(seconds=i), "sender": "user"}
+            for i in range(start, min(start + batch, count))
+        ]
+        with engine.begin() as connection:
+            connection.execute(Message.__table__.insert(), rows)
+
+def measure(engine, db, conversation_ids, message_ids, repeat):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("VACUUM")
+        page_size = connection.exec_driver_sql("PRAGMA page_size").scalar()
+        page_count = connection.exec_driver_sql("PRAGMA page_count").scalar()
+        sizes = dict(connection.exec_driver_sql(
+            "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN "
+            "('message', 'sqlite_autoindex_message_1', 'ix_message_conversation_date_id', "
+            "'conversation', 'sqlite_autoindex_conversation_1', 'conversation_stats') GROUP BY name"
+        ).all())
+
+    timings = {"get_messages": [], "get_messages_page": [], "mesaj birincil anahtarla": []}
+    for i in range(repeat):
+        conversation_id = conversation_ids[i % len(conversation_ids)]
+        db.session.expunge_all()
+        t = time.perf_counter()
+        db.get_messages(conversation_id)
+        timings["get_messages"].append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        db.get_messages_page(conversation_id)
+        timings["get_messages_page"].append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        db.session.get(Message, message_ids[i % len(message_ids)])
+        timings["mesaj birincil anahtarla"].append((time.perf_counter() - t) * 1000)
+
+    print(f"  Sayfa sayısı: {page_count} ({page_count * page_size / (1024 * 1024):.1f} MB)")
+    for name, size in sorted(sizes.items()):
+        print(f"  {name:>36}: {size / (1024 * 1024):.1f} MB")
+    for name, values in timings.items():
+        print(f"  {name:>36}: p50 {statistics.median(values):.2f} ms, max {max(values):.2f} ms")
+
+def check_search_keys(path, others=150):
+    # Dönüşümden önce dizine yazılmış satırlar da kullanıcının aramasında bulunmaya devam etmeli
+    # Önbellekte önceki veritabanının kullanıcıları kalmamalı
+    clear_caches()
+    engine = init_engine(db_file=path)
+    create_db(key_format="text")
+    db = Database()
+    owner = db.get_user("admin")
+    other = db.create_user("baska", "parola", "baska@dinamik.com", "Başka", "Kullanıcı")
+    own = db.create_conversation("Notlar", owner.user_id).conversation_id
+    foreign = db.create_conversation("Başka notlar", other.user_id).conversation_id
+    now = datetime.datetime.now()
+    rows = [{"message_id": str(uuid.uuid4()), "conversation_id": own if i == others else foreign,
+             "message_content": f"kelime {i}", "response_message": None,
+             "message_date": now + datetime.timedelta(seconds=i), "sender": "user"} for i in range(others + 1)]
+    with engine.begin() as connection:
+        connection.execute(Message.__table__.insert(), rows)
+    before = len(search(db.session, "kelime", owner.user_id, 5))
+    db.session.close()
+    migrate_keys(engine)
+    after = len(search(db.session, "kelime", owner.user_id, 5))
+    with engine.connect() as connection:
+        text_keys = connection.exec_driver_sql(
+            "SELECT (SELECT COUNT(*) FROM message_fts WHERE typeof(conversation_id) = 'text') + "
+            "(SELECT COUNT(*) FROM conversation_fts WHERE typeof(conversation_id) = 'text')"
+        ).scalar()
+    db.session.close()
+    dispose_engine()
+    print(f"Arama dizini: dönüşümden önce {before}, sonra {after} sonuç, metin anahtarlı dizin satırı {text_keys}")
+    return before == after == 1 and text_keys == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Metin ve 16 baytlık anahtarlarla dizin boyutu ve sorgu gecikmesi")
+    parser.add_argument("--messages", type=int, default=1000000)
+    parser.add_argument("--conversations", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db(key_format="text")
+        db = Database()
+        user_id = db.get_user("admin").user_id
+        conversation_ids = [db.create_conversation(f"Sohbet {i}", user_id).conversation_id
+                            for i in range(args.conversations)]
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP TRIGGER message_fts_insert")
+        fill(engine, conversation_ids, args.messages)
+        message_ids = [row[0] for row in db.session.query(Message.message_id).limit(args.repeat)]
+        db.session.close()
+
+        print("Metin anahtarlar (VARCHAR(36)):")
+        measure(engine, db, conversation_ids, message_ids, args.repeat)
+
+        start = time.perf_counter()
+        migrate_keys(engine)
+        elapsed = time.perf_counter() - start
+        print(f"Çevrimiçi dönüşüm: {elapsed:.1f} sn, {args.messages / elapsed:.0f} mesaj/sn")
+
+        db.session.close()
+        print("16 baytlık BLOB anahtarlar:")
+        measure(engine, db, conversation_ids, message_ids, args.repeat)
+        db.session.close()
+        dispose_engine()
+
+        if not check_search_keys(os.path.join(tmp, "search.db")):
+            print("BAŞARISIZ: anahtar dönüşümünden sonra arama dizini eski satırları bulamıyor")
+            sys.exit(1)
+        print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine
+from database.codec import configure_compression, train_dictionary, zstandard
+
+TURKISH = [
+    "Elbette, bu konuda size yardımcı olabilirim.",
+    "Öncelikle sorunun kaynağını anlamak için birkaç adımı birlikte inceleyelim.",
+    "Python'da bir listeyi sıralamak için sorted() fonksiyonunu ya da list.sort() metodunu kullanabilirsiniz.",
+    "Veritabanı bağlantısının açık kalması bellek sızıntısına yol açabilir, bu yüzden oturumu kapatmayı unutmayın.",
+    "Yapay zeka modelleri büyük veri kümeleri üzerinde eğitilir ve örüntüleri öğrenir.",
+    "Hava durumu tahminleri genellikle sayısal modeller ve gözlem verileri birleştirilerek yapılır.",
+    "Bu yaklaşımın avantajı, kodun daha okunabilir ve test edilebilir olmasıdır.",
+    "Aşağıdaki örnekte bir sözlük üzerinde nasıl döngü kurulacağını görebilirsiniz:",
+    "Sonuç olarak, performans için önbellekleme ve doğru indeksler büyük fark yaratır.",
+    "Başka bir sorunuz olursa sormaktan çekinmeyin.",
+    "İstanbul'un tarihi yarımadası Bizans ve Osmanlı dönemlerinden kalma yapılarla doludur.",
+    "Düzenli egzersiz, yeterli uyku ve dengeli beslenme sağlıklı yaşamın temelidir.",
+]
+ENGLISH = [
+    "Sure, I can help you with that.",
+    "First, let's look at a few steps to understand where the problem comes from.",
+    "In Python you can sort a list with the sorted() function or the list.sort() method.",
+    "Leaving the database connection open can leak memory, so remember to close the session.",
+    "Machine learning models are trained on large datasets and learn patterns from them.",
+    "The main advantage of this approach is that the code becomes easier to read and test.",
+    "Here is an example that shows how to iterate over a dictionary:",
+    "In short, caching and the right indexes make a big difference for performance.",
+    "Let me know if you have any other questions.",
+    "Regular exercise, enough sleep and a balanced diet are the foundations of a healthy life.",
+]
+CODE = [
+    "```python\nfor key, value in data.items():\n    print(f\"{key}: {value}\")\n```",
+    "```python\nsession = get_db_session()\ntry:\n    session.add(item)\n    session.commit()\nfinally:\n    session.close()\n```",
+    "```sql\nSELECT name, COUNT(*) FROM message GROUP BY name ORDER BY 2 DESC;\n```",
+]
+
+def response(rng):
+    sentences = TURKISH if rng.random() < 0.6 else ENGLISH
+    parts = []
+    for _ in range(rng.randint(3, 40)):
+        roll = rng.random()
+        if roll < 0.08:
+            parts.append("\n" + rng.choice(CODE) + "\n")
+        elif roll < 0.2:
+            parts.append(f"\n{rng.randint(1, 9)}. " + rng.choice(sentences))
+        else:
+            parts.append(rng.choice(sentences) + f" ({rng.randint(1, 1000)})" * (rng.random() < 0.1))
+    return " ".join(parts)
+
+def corpus(count, seed=5):
+    rng = random.Random(seed)
+    return [(f"Soru {i}: {rng.choice(TURKISH + ENGLISH)}", response(rng)) for i in range(count)]
+
+def run(name, config, messages, dictionary_samples):
+    dictionaries = []
+    if config.get("enabled") and config.get("dictionary"):
+        dictionaries = [(1, config["codec"], train_dictionary(dictionary_samples, config["codec"], 32768))]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        configure_compression(config, dictionaries)
+        db = Database()
+        conversation_id = db.create_conversation("Bench", db.get_user("admin").user_id).conversation_id
+        now = datetime.datetime.now()
+
+        start = time.perf_counter()
+        for offset in range(0, len(messages), 500):
+            for i, (content, answer) in enumerate(messages[offset:offset + 500], offset):
+                db.session.add(Message(message_id=Message.generate_message_id(), conversation_id=conversation_id,
+                                       message_content=content, response_message=answer,
+                                       message_date=now + datetime.timedelta(seconds=i), sender="user"))
+            db.session.commit()
+        write = time.perf_counter() - start
+        db.session.expunge_all()
+
+        with engine.connect() as connection:
+            size = connection.exec_driver_sql("SELECT SUM(pgsize) FROM dbstat WHERE name = 'message'").scalar()
+
+        start = time.perf_counter()
+        loaded = db.get_messages(conversation_id)
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        characters = sum(len(message.response_message) for message in loaded)
+        render = time.perf_counter() - start
+        db.session.close()
+        dispose_engine()
+
+    print(f"{name:>18}: message tablosu {size / (1024 * 1024):6.1f} MB, yazma {write:.2f} sn, "
+          f"yükleme {load * 1000:.0f} ms, gösterim için açma {render * 1000:.0f} ms ({characters} karakter)")
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description="Uzun mesaj gövdeleri için sıkıştırma ölçümü")
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    messages = corpus(args.messages)
+    samples = [answer for _, answer in corpus(1000, seed=99)]
+    configs = [
+        ("sıkıştırmasız", {"enabled": False}),
+        ("zlib", {"enabled": True, "codec": "zlib", "dictionary": False}),
+        ("zlib + sözlük", {"enabled": True, "codec": "zlib", "dictionary": True}),
+    ]
+    if zstandard is not None:
+        configs += [
+            ("zstd", {"enabled": True, "codec": "zstd", "level": 3, "dictionary": False}),
+            ("zstd + sözlük", {"enabled": True, "codec": "zstd", "level": 3, "dictionary": True}),
+        ]
+    else:
+        print("zstandard kurulu değil, zstd ölçümleri atlandı")
+
+    baseline = None
+    for name, config in configs:
+        size = run(name, config, messages, samples)
+        baseline = baseline or size
+        print(f"{'':>18}  boyut oranı {size / baseline:.2f}")
+
+if __name__ == "__main__":
+    main()
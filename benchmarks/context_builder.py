@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load.workload import percentile
+from database import Database, init_engine, create_db, dispose_engine, count_tokens
+from database.context import ContextBuilder, DEFAULT_CONTEXT
+from database.fastpath import message_row, write_messages
+from database.writer import start_write_queue, stop_write_queue
+
+WORDS = ("konuşma", "yapay", "zeka", "veritabanı", "mesaj", "model", "yanıt", "soru", "bağlam", "özet",
+         "token", "bütçe", "pencere", "geçmiş", "istek", "hızlı", "kısa", "uzun", "örnek", "açıklama")
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def fill_conversation(conversation_id, count, rng, start):
+    rows = []
+    for i in range(count):
+        rows.append(message_row(conversation_id, sentence(rng, rng.randint(5, 30)), response=sentence(rng, rng.randint(20, 120)),
+                                message_date=start + datetime.timedelta(seconds=i)))
+        if len(rows) == 5000:
+            write_messages(rows=rows)
+            rows = []
+    write_messages(rows=rows)
+
+def naive_history(db, conversation_id, message, budget):
+    # Eski yol: her turda tüm geçmiş okunur ve yeniden sayılır
+    remaining = budget - count_tokens(message)
+    history = []
+    for item in reversed(db.get_messages(conversation_id)):
+        tokens = count_tokens(item.message_content) + count_tokens(item.response_message)
+        if tokens > remaining:
+            break
+        remaining -= tokens
+        history.append(item)
+    db.session.expunge_all()
+    return history
+
+def prompt_tokens(history, message, overhead):
+    return sum(count_tokens(item["content"]) + overhead for item in history) + count_tokens(message) + overhead
+
+class Reply:
+    def __init__(self, conversation_id, content, when):
+        row = message_row(conversation_id, content, message_date=when)
+        for name, value in row.items():
+            setattr(self, name, value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Token bütçeli bağlam kurucusunun konuşma uzadıkça istek hazırlama süresi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    builder = ContextBuilder()
+    budget = DEFAULT_CONTEXT["max_tokens"]
+    overhead = DEFAULT_CONTEXT["message_overhead"]
+    failed = False
+    warm = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        user = db.get_user("admin")
+        print(f"Bütçe {budget} token, konuşma başına {args.turns} tur")
+        for size in args.sizes:
+            conversation = db.create_conversation(f"Sohbet {size}", user.user_id)
+            conversation_id = conversation.conversation_id
+            start = datetime.datetime.now() - datetime.timedelta(days=1)
+            fill_conversation(conversation_id, size, rng, start)
+
+            started = time.perf_counter()
+            naive_history(db, conversation_id, "Yeni soru?", budget)
+            naive_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            builder.build(conversation_id, "Yeni soru?")
+            cold_ms = (time.perf_counter() - started) * 1000
+
+            timings = []
+            over_budget = 0
+            builder.reset_metrics()
+            for turn in range(args.turns):
+                message = sentence(rng, rng.randint(5, 30))
+                started = time.perf_counter()
+                history = builder.build(conversation_id, message)
+                timings.append((time.perf_counter() - started) * 1000)
+                if prompt_tokens(history, message, overhead) > budget:
+                    over_budget += 1
+                reply = Reply(conversation_id, message, start + datetime.timedelta(seconds=size + turn))
+                builder.record(conversation_id, reply, sentence(rng, rng.randint(20, 120)))
+            metrics = builder.metrics()
+
+            # Özet yazma kuyruğundan diske geçmiş ve oradan geri okunabilmeli
+            summary = builder._contexts[conversation_id].summary
+            start_write_queue().flush(10)
+            builder.forget(conversation_id)
+            reloaded = builder.build(conversation_id, "Yeni soru?")
+            summary_persisted = not summary or (reloaded and summary in reloaded[0]["content"])
+
+            timings.sort()
+            warm[size] = percentile(timings, 0.5)
+            print(f"{size:>7} mesaj: tüm geçmişi say {naive_ms:8.2f} ms, ilk kurulum {cold_ms:6.2f} ms, "
+                  f"sıcak kurulum p50 {warm[size]:.3f} ms p95 {percentile(timings, 0.95):.3f} ms, "
+                  f"{metrics['summary_refreshes']} özet yenileme / {metrics['evicted_turns']} düşen tur, "
+                  f"ortalama {metrics['avg_prompt_tokens']:.0f} token, bütçe aşımı {over_budget}, "
+                  f"özet {'kalıcı' if summary_persisted else 'KAYBOLDU'}")
+            failed = failed or over_budget > 0 or not summary_persisted
+            failed = failed or metrics["summary_refreshes"] >= metrics["evicted_turns"]
+        stop_write_queue()
+        db.session.close()
+        dispose_engine()
+
+    smallest, largest = warm[args.sizes[0]], warm[args.sizes[-1]]
+    # Sıcak kurulum konuşma uzunluğundan bağımsız olmalı
+    if largest > smallest * 2 + 0.05:
+        print(f"BAŞARISIZ: {args.sizes[-1]} mesajda kurulum {largest:.3f} ms, {args.sizes[0]} mesajda {smallest:.3f} ms")
+        failed = True
+    if failed:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK: bağlam bütçede kaldı, kurulum süresi konuşma uzunluğuyla büyümedi")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from database import (Database, create_session, find_user, init_engine, get_engine, get_read_engine, create_db,
+                      dispose_engine, configure_cache, clear_caches, cache_metrics, user_cache, conversation_cache)
+
+class StatementCounter:
+    def __init__(self, engines):
+        self.count = 0
+        for engine in set(engines):
+            event.listen(engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
+
+def prepare(db, users, conversations):
+    usernames = []
+    conversation_ids = []
+    for i in range(users):
+        user = db.create_user(f"kullanici{i}", "parola", f"kullanici{i}@ornek.com", "Ad", "Soyad")
+        usernames.append(user.username)
+        for j in range(conversations):
+            conversation = db.create_conversation(f"Sohbet {i}-{j}", user.user_id)
+            conversation_ids.append(conversation.conversation_id)
+    return usernames, conversation_ids
+
+def run(db, rng, usernames, conversation_ids, operations):
+    session = create_session()
+    for _ in range(operations):
+        choice = rng.random()
+        if choice < 0.3:
+            find_user(session, rng.choice(usernames))
+        elif choice < 0.6:
+            db.get_user(rng.choice(usernames))
+        else:
+            conversation = db.get_conversation(rng.choice(conversation_ids))
+            conversation.stats
+            conversation.name
+        db.session.close()
+    session.close()
+
+def measure(enabled, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        configure_cache({"enabled": enabled})
+        db = Database()
+        usernames, conversation_ids = prepare(db, args.users, args.conversations)
+        clear_caches()
+        user_cache.reset_metrics()
+        conversation_cache.reset_metrics()
+        db.session.close()
+
+        counter = StatementCounter([get_engine(), get_read_engine()])
+        start = time.perf_counter()
+        run(db, random.Random(1), usernames, conversation_ids, args.operations)
+        elapsed = time.perf_counter() - start
+        metrics = cache_metrics()
+        db.session.close()
+        dispose_engine()
+
+    print(f"Önbellek {'açık' if enabled else 'kapalı'}: {args.operations} işlem, {counter.count} SQL ifadesi, "
+          f"{elapsed * 1000 / args.operations:.3f} ms/işlem")
+    for name, values in metrics.items():
+        print(f"  {name:>13}: isabet oranı {values['hit_rate']:.1%}, sorgu {values['queries']}, "
+              f"boyut {values['size']}, çıkarılan {values['evictions']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kullanıcı ve konuşma önbelleğinin sorgu sayısına etkisi")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=20000)
+    args = parser.parse_args()
+
+    measure(False, args)
+    measure(True, args)
+
+if __name__ == "__main__":
+    main()
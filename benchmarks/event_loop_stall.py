@@ -0,0 +1,112 @@
+import gc
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer, QEventLoop
+from PyQt6.QtWidgets import QApplication
+
+from database import Database, init_engine, create_db, dispose_engine, page_cursor
+from benchmarks.load.dataset import generate, sample_keys
+from utils.async_utils import get_async_bridge, get_async_database, stop_async_bridge
+
+TICK_MS = 2
+
+class FrameMonitor:
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.setInterval(TICK_MS)
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+        self.longest = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.longest = 0.0
+        self.timer.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.longest = max(self.longest, now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.tick()
+        self.timer.stop()
+        return self.longest * 1000
+
+def measure(run_query):
+    loop = QEventLoop()
+    monitor = FrameMonitor()
+    result = {}
+
+    def done(count):
+        result["count"] = count
+        result["elapsed"] = time.perf_counter() - start
+        QTimer.singleShot(50, loop.quit)
+
+    # Önceki ölçümün çöpü toplanır, bu ölçüm sırasında başka iş parçacığında tam toplamaya yol açmaz
+    gc.collect()
+    monitor.start()
+    start = time.perf_counter()
+    QTimer.singleShot(20, lambda: run_query(done))
+    loop.exec()
+    return monitor.stop(), result["count"], result["elapsed"] - 0.02
+
+def main():
+    parser = argparse.ArgumentParser(description="Büyük bir sorgu sırasında Qt olay döngüsünün kare süresinden uzun donup donmadığı")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--frame-ms", type=float, default=1000 / 60)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        generate(1, 1, args.messages)
+        conversation_id = sample_keys(1)[0][0]
+
+        db = Database()
+        def synchronous(done):
+            messages = db.get_messages(conversation_id)
+            db.session.close()
+            done(len(messages))
+
+        bridge = get_async_bridge()
+        async def load(done):
+            # Konuşma sayfa sayfa beklenir ve her sayfa geldiği anda işlenir; sayfalar arasında olay döngüsü çalışır,
+            # binlerce nesne tek bir geri çağrıda teslim edilip birlikte bellekte tutulmaz
+            count = 0
+            before = None
+            while True:
+                page = await bridge.call(get_async_database().get_messages_page(conversation_id, before, args.page_size))
+                count += len(page)
+                if len(page) < args.page_size:
+                    break
+                before = page_cursor(page)
+            done(count)
+
+        results = {
+            "GUI iş parçacığında senkron": measure(synchronous),
+            "AsyncBridge ile sayfalı await": measure(lambda done: bridge.start(load(done)))
+        }
+        stop_async_bridge()
+        dispose_engine()
+    app.quit()
+
+    for name, (stall, count, elapsed) in results.items():
+        print(f"{name:>28}: {count} mesaj, sorgu {elapsed * 1000:7.1f} ms, en uzun olay döngüsü donması {stall:6.1f} ms")
+    stall = results["AsyncBridge ile sayfalı await"][0]
+    if stall > args.frame_ms:
+        print(f"BAŞARISIZ: olay döngüsü {stall:.1f} ms dondu, kare bütçesi {args.frame_ms:.1f} ms")
+        sys.exit(1)
+    print(f"OK: olay döngüsü bir kareden ({args.frame_ms:.1f} ms) uzun donmadı")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, init_engine, create_db, dispose_engine
+from database.fastpath import create_message, update_message_response, message_row, response_values, write_messages
+
+def send_orm(db, conversation_id, i):
+    message = db.create_message(conversation_id, f"Mesaj {i} " * 8)
+    message.response_message = f"Yanıt {i} " * 40
+    db.update_message(message)
+    db.session.close()
+
+def send_core(db, conversation_id, i):
+    row = create_message(conversation_id, f"Mesaj {i} " * 8)
+    update_message_response(row["message_id"], f"Yanıt {i} " * 40)
+
+def run(count, send):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    send(count)
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesaj yazımında ORM ile Core hızlı yolunun mesaj başına maliyeti")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        conversation_id = db.create_conversation("Bench", db.get_user("admin").user_id).conversation_id
+        db.session.close()
+
+        def orm(count):
+            for i in range(count):
+                send_orm(db, conversation_id, i)
+
+        def core(count):
+            for i in range(count):
+                send_core(db, conversation_id, i)
+
+        def core_batch(count):
+            for start in range(0, count, args.batch):
+                rows = [message_row(conversation_id, f"Mesaj {i} " * 8) for i in range(start, min(start + args.batch, count))]
+                write_messages(rows=rows)
+                write_messages(updates=[response_values(row["message_id"], f"Yanıt {i} " * 40)
+                                        for i, row in enumerate(rows, start)])
+
+        results = {
+            "ORM (tek satır)": run(args.count, orm),
+            "Core (tek satır)": run(args.count, core),
+            f"Core executemany ({args.batch})": run(args.count, core_batch)
+        }
+        dispose_engine()
+
+    baseline = results["ORM (tek satır)"][0]
+    for name, (wall, cpu) in results.items():
+        print(f"{name:>24}: {wall * 1e6 / args.count:8.1f} µs/mesaj, CPU {cpu * 1e6 / args.count:8.1f} µs/mesaj, "
+              f"{args.count / wall:8.0f} mesaj/sn, {baseline / wall:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from benchmarks.load.replay_server import ReplayServer, DEFAULT_RECORDING
+from benchmarks.load.workload import percentile
+from utils.http_utils import HttpTransport
+from utils.openai_utils import OpenAIChatManager
+
+PAYLOAD = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "Yapay zeka nedir?"}], "stream": True}
+
+def direct_request(url):
+    # Eski yol: her istek yeni bağlantı, tek deneme
+    response = requests.post(url, json=PAYLOAD, stream=True, timeout=(10, 60))
+    try:
+        response.raise_for_status()
+        for _ in response.iter_lines(chunk_size=None):
+            pass
+    finally:
+        response.close()
+
+def pooled_request(transport):
+    def call(url):
+        response = transport.request("POST", url, json=PAYLOAD, stream=True)
+        try:
+            response.raise_for_status()
+            for _ in response.iter_lines(chunk_size=None):
+                pass
+        finally:
+            response.close()
+    return call
+
+def run(call, url, total, clients):
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            start = time.perf_counter()
+            try:
+                call(url)
+            except Exception as e:
+                with lock:
+                    failures.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), failures
+
+def check_failover(recording, speed):
+    server = ReplayServer(recording, speed=speed, failing_models={"gpt-3.5-turbo"}).start()
+    os.environ["OPENAI_API_KEY"] = "yerel-yeniden-oynatma"
+    manager = OpenAIChatManager()
+    manager.api_key = "OPENAI_API_KEY"
+    manager.api_base = server.base_url
+    manager.model = "gpt-3.5-turbo"
+    manager.fallback_models = ["gpt-4o-mini"]
+    parts = []
+    deliver = lambda delta: parts.append(delta) if delta else None
+    stats = manager._stream_with_failover(manager.resolve_api_key(), "Yapay zeka nedir?", None, None, deliver, 0, parts)
+    manager.scheduler.stop()
+    server.stop()
+    return stats, "".join(parts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Hata enjekte eden yerel sunucuya karşı havuzlu HTTP taşıyıcısının istek/sn ve kuyruk gecikmesi")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument("--speed", type=float, default=0.01)
+    parser.add_argument("--recording", default=DEFAULT_RECORDING)
+    args = parser.parse_args()
+
+    transport = HttpTransport({"pool_size": args.clients, "backoff_base_ms": 20, "backoff_max_ms": 500, "deadline_seconds": 30})
+    scenarios = [("doğrudan requests.post", direct_request), ("havuzlu taşıyıcı", pooled_request(transport))]
+    print(f"{args.requests} istek, {args.clients} istemci, hata oranı %{args.error_rate * 100:.0f}, kayıt hızı x{args.speed}")
+    failed = False
+    for name, call in scenarios:
+        server = ReplayServer(args.recording, speed=args.speed, error_rate=args.error_rate, retry_after=args.retry_after).start()
+        elapsed, latencies, failures = run(call, f"{server.base_url}/chat/completions", args.requests, args.clients)
+        server.stop()
+        print(f"{name:>24}: {len(latencies)}/{args.requests} başarılı, {len(latencies) / elapsed:7.1f} istek/sn, "
+              f"p50 {percentile(latencies, 0.5) * 1000:6.1f} ms, p95 {percentile(latencies, 0.95) * 1000:6.1f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:6.1f} ms, {server.connections} bağlantı, {server.faults} enjekte hata")
+        if call is not direct_request:
+            metrics = transport.metrics()
+            print(f"{'':>24}  {metrics['attempts']} deneme, {metrics['retries']} yeniden deneme")
+            failed = failed or len(latencies) != args.requests
+    transport.close()
+
+    stats, text = check_failover(args.recording, 0)
+    print(f"Yedek model: birincil model 503 döndürürken yanıt {stats['model']} ile alındı "
+          f"({stats['failovers']} geçiş, {len(text)} karakter)")
+    failed = failed or stats["model"] != "gpt-4o-mini" or not text
+
+    if failed:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import sqlite3
+import platform
+import tempfile
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from database import init_engine, create_db, dispose_engine, Database
+from benchmarks.load.dataset import generate, dataset_counts, sample_keys
+from benchmarks.load.workload import DEFAULT_MIX, run_workload
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def compare(current, baseline):
+    print(f"{'işlem':>20} {'p95 önce':>10} {'p95 sonra':>10} {'değişim':>9} {'işlem/sn önce':>14} {'sonra':>10}")
+    for name, after in current["workload"]["operations"].items():
+        before = baseline["workload"]["operations"].get(name)
+        if not before or before["p95_ms"] is None or after["p95_ms"] is None:
+            continue
+        change = (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        print(f"{name:>20} {before['p95_ms']:>10.2f} {after['p95_ms']:>10.2f} {change:>+8.1f}% "
+              f"{before['throughput']:>14.1f} {after['throughput']:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Veritabanı yük üretimi ve gecikme ölçümü")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--conversations", type=int, default=None)
+    parser.add_argument("--users", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="örnek: get_messages_page=50,create_message=50")
+    parser.add_argument("--db", help="veri kümesini bu dosyada tut ve sonraki çalıştırmalarda yeniden kullan")
+    parser.add_argument("--output", help="sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--compare", help="karşılaştırılacak önceki JSON sonucu")
+    args = parser.parse_args()
+    conversations = args.conversations or max(1, args.messages // 100)
+    users = args.users or max(1, conversations // 20)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = args.db or os.path.join(tmp, "load.db")
+        reuse = os.path.exists(db_file)
+        engine = init_engine(db_file=db_file)
+        create_db()
+        if not reuse:
+            generate(users, conversations, args.messages,
+                     progress=lambda done, total: print(f"\rVeri üretiliyor: {done}/{total}", end="", file=sys.stderr))
+            print(file=sys.stderr)
+        counts = dataset_counts(engine)
+        conversation_ids, usernames = sample_keys()
+        db = Database()
+        user_id = db.get_user(usernames[0]).user_id
+        db.session.close()
+
+        workload = run_workload(args.threads, args.duration, args.mix, conversation_ids, usernames, user_id)
+        dispose_engine()
+
+    result = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "dataset": counts,
+        "threads": args.threads,
+        "duration": args.duration,
+        "mix": args.mix,
+        "workload": workload
+    }
+    report = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+    print(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+if __name__ == "__main__":
+    main()
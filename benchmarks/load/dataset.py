@@ -0,0 +1,81 @@
+import random
+import datetime
+from sqlalchemy import func
+
+from database import User, Conversation, Message, Database, get_engine
+from database.search import SEARCH_SCHEMA, backfill_step, create_search_schema
+from database.stats import STATS_TRIGGERS, backfill_conversation_stats
+
+WORDS = ["merhaba", "yapay", "zeka", "python", "veritabanı", "sohbet", "model", "öğrenme", "hava", "durumu",
+         "kitap", "müzik", "proje", "kod", "hata", "çözüm", "soru", "cevap", "teşekkür", "lütfen",
+         "hello", "database", "search", "index", "query", "latency", "thread", "window", "message", "response"]
+BULK_TRIGGERS = ["message_fts_insert", "conversation_fts_insert", "conversation_stats_message_insert"]
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+def dataset_counts(engine):
+    with engine.connect() as connection:
+        return {
+            table: connection.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar()
+            for table in ("user", "conversation", "message")
+        }
+
+def _insert(engine, table, rows):
+    with engine.begin() as connection:
+        connection.execute(table.insert(), rows)
+
+def generate(users, conversations, messages, batch=20000, seed=1, progress=None):
+    engine = get_engine()
+    rng = random.Random(seed)
+    start = datetime.datetime.now() - datetime.timedelta(days=365)
+
+    with engine.begin() as connection:
+        for name in BULK_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+    user_ids = [User.generate_user_id() for _ in range(users)]
+    for offset in range(0, users, batch):
+        _insert(engine, User.__table__, [
+            {"user_id": user_id, "username": f"kullanici{i}", "password": "parola", "email": f"kullanici{i}@ornek.com",
+             "first_name": "Ad", "last_name": "Soyad", "is_admin": False, "is_verified": True, "created_at": start}
+            for i, user_id in enumerate(user_ids[offset:offset + batch], offset)
+        ])
+
+    conversation_ids = [Conversation.generate_conversation_id() for _ in range(conversations)]
+    for offset in range(0, conversations, batch):
+        _insert(engine, Conversation.__table__, [
+            {"conversation_id": conversation_id, "user_id": user_ids[i % users], "name": f"Sohbet {i} {sentence(rng, 2)}",
+             "created_at": start + datetime.timedelta(minutes=i), "is_archived": False}
+            for i, conversation_id in enumerate(conversation_ids[offset:offset + batch], offset)
+        ])
+
+    step = datetime.timedelta(days=365) / max(messages, 1)
+    for offset in range(0, messages, batch):
+        _insert(engine, Message.__table__, [
+            {"message_id": Message.generate_message_id(), "conversation_id": rng.choice(conversation_ids),
+             "message_content": sentence(rng, rng.randint(4, 20)), "response_message": sentence(rng, rng.randint(20, 120)),
+             "message_date": start + step * i, "sender": "user"}
+            for i in range(offset, min(offset + batch, messages))
+        ])
+        if progress:
+            progress(min(offset + batch, messages), messages)
+
+    with engine.begin() as connection:
+        for statement in SEARCH_SCHEMA + STATS_TRIGGERS:
+            if statement.startswith("CREATE TRIGGER"):
+                connection.exec_driver_sql(statement)
+        create_search_schema(connection)
+    backfill_conversation_stats(engine)
+    while not backfill_step(engine, chunk_size=50000):
+        pass
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA optimize")
+
+def sample_keys(limit=2000):
+    db = Database()
+    conversation_ids = [row[0] for row in
+                        db.session.query(Conversation.conversation_id).order_by(func.random()).limit(limit)]
+    usernames = [row[0] for row in db.session.query(User.username).order_by(func.random()).limit(limit)]
+    db.session.close()
+    return conversation_ids, usernames
@@ -0,0 +1,138 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from utils.config_utils import is_chat_model
+
+STREAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streams")
+DEFAULT_RECORDING = os.path.join(STREAMS_DIR, "chat_completion.sse")
+DELAY_LINE = re.compile(r"^: delay (\d+(?:\.\d+)?)$")
+
+def load_recording(path=DEFAULT_RECORDING):
+    # Kayıt geçerli bir SSE metnidir, ": delay <ms>" yorumları bir sonraki olaydan önceki beklemeyi verir
+    events = []
+    delay = 0.0
+    lines = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f.read().splitlines():
+            match = DELAY_LINE.match(line)
+            if match:
+                delay = float(match.group(1)) / 1000
+            elif line:
+                lines.append(line)
+            elif lines:
+                events.append((delay, ("\n".join(lines) + "\n\n").encode('utf-8')))
+                delay = 0.0
+                lines = []
+    if lines:
+        events.append((delay, ("\n".join(lines) + "\n\n").encode('utf-8')))
+    return events
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Küçük SSE parçaları Nagle algoritmasıyla bekletilmez, gerçek API sunucuları gibi hemen gönderilir
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_fault(self, status, retry_after=None):
+        body = json.dumps({"error": {"message": f"enjekte edilen hata {status}", "code": status}}).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        fault = server.next_fault(json.loads(body or b"{}").get("model"))
+        if fault is not None:
+            self.send_fault(*fault)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for delay, payload in server.events:
+            time.sleep(delay * server.speed)
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, recording=DEFAULT_RECORDING, speed=1.0, port=0, error_rate=0.0, retry_after=None,
+                 failing_models=(), seed=1):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        self.events = load_recording(recording)
+        self.speed = speed
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.failing_models = set(failing_models)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.faults = 0
+        self.connections = 0
+        self.thread = threading.Thread(target=self.serve_forever, name="sse-replay", daemon=True)
+
+    def next_fault(self, model):
+        # Hata oranı kadar istek 429 (Retry-After ile) ya da 503 alır, çalışmayan modeller hep 503 alır;
+        # gerçek API gibi sohbet modeli olmayanlar 404 alır
+        with self.lock:
+            self.requests += 1
+            if not is_chat_model(model):
+                self.faults += 1
+                return (404, None)
+            if model in self.failing_models:
+                self.faults += 1
+                return (503, None)
+            if self.rng.random() < self.error_rate:
+                self.faults += 1
+                if self.rng.random() < 0.5:
+                    return (429, self.retry_after)
+                return (503, None)
+            return None
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # İstemci akışı [DONE] olayından sonra kapattığında bağlantının sıfırlanması beklenen bir durumdur
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def recorded_first_token(self):
+        # Rol olayı içerik taşımaz, ilk içerikli olaya kadar geçen kayıtlı süre
+        elapsed = 0.0
+        for delay, payload in self.events:
+            elapsed += delay * self.speed
+            if b'"content":"' in payload and b'"content":""' not in payload:
+                return elapsed
+        return elapsed
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
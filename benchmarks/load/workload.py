@@ -0,0 +1,104 @@
+import time
+import random
+import threading
+
+from database import Database, get_db_session
+from benchmarks.load.dataset import WORDS, sentence
+
+DEFAULT_MIX = {
+    "get_messages_page": 30,
+    "get_messages": 10,
+    "get_conversations": 5,
+    "get_user": 20,
+    "create_message": 25,
+    "search": 10
+}
+
+def run_operation(db, name, rng, conversation_ids, usernames, user_id):
+    if name == "get_messages_page":
+        db.get_messages_page(rng.choice(conversation_ids))
+    elif name == "get_messages":
+        db.get_messages(rng.choice(conversation_ids))
+    elif name == "get_conversations":
+        db.get_conversations()
+    elif name == "get_user":
+        db.get_user(rng.choice(usernames))
+    elif name == "create_message":
+        db.create_message(rng.choice(conversation_ids), sentence(rng, 12), response=sentence(rng, 60))
+    elif name == "search":
+        db.search(" ".join(rng.sample(WORDS, 2)), user_id)
+    else:
+        raise ValueError(f"Bilinmeyen işlem: {name}")
+
+class WorkloadThread(threading.Thread):
+    def __init__(self, index, mix, deadline, conversation_ids, usernames, user_id):
+        super().__init__(name=f"load-{index}", daemon=True)
+        self.rng = random.Random(index)
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.deadline = deadline
+        self.conversation_ids = conversation_ids
+        self.usernames = usernames
+        self.user_id = user_id
+        self.latencies = {name: [] for name in self.names}
+        self.errors = 0
+
+    def run(self):
+        db = Database()
+        while time.perf_counter() < self.deadline:
+            name = self.rng.choices(self.names, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                run_operation(db, name, self.rng, self.conversation_ids, self.usernames, self.user_id)
+            except Exception:
+                db.session.rollback()
+                self.errors += 1
+                continue
+            finally:
+                db.session.close()
+            self.latencies[name].append(time.perf_counter() - start)
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+def summarize(latencies, elapsed):
+    result = {}
+    for name, values in latencies.items():
+        values = sorted(values)
+        result[name] = {
+            "count": len(values),
+            "throughput": len(values) / elapsed,
+            "p50_ms": percentile(values, 0.50) * 1000 if values else None,
+            "p95_ms": percentile(values, 0.95) * 1000 if values else None,
+            "p99_ms": percentile(values, 0.99) * 1000 if values else None,
+            "max_ms": values[-1] * 1000 if values else None
+        }
+    return result
+
+def run_workload(threads, duration, mix, conversation_ids, usernames, user_id):
+    deadline = time.perf_counter() + duration
+    workers = [WorkloadThread(i, mix, deadline, conversation_ids, usernames, user_id) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    get_db_session().close()
+
+    latencies = {name: [] for name in mix}
+    for worker in workers:
+        for name, values in worker.latencies.items():
+            latencies[name].extend(values)
+    operations = summarize(latencies, elapsed)
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "total_operations": total,
+        "throughput": total / elapsed,
+        "errors": sum(worker.errors for worker in workers),
+        "operations": operations
+    }
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import uuid
+import tempfile
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine
+
+def fill_conversation(engine, conversation_id, count):
+    now = datetime.datetime.now()
+    rows = [
+        {"message_id": str(uuid.uuid4()), "conversation_id": conversation_id, "message_content": f"Mesaj {i}",
+         "response_message": "Yanıt", "message_date": now + datetime.timedelta(seconds=i), "sender": "user"}
+        for i in range(count)
+    ]
+    with engine.begin() as connection:
+        connection.execute(Message.__table__.insert(), rows)
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, len(result)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tüm mesajları yükleme ile ilk sayfayı yükleme süresinin karşılaştırması")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        user = db.get_user("admin")
+        for size in args.sizes:
+            conversation = db.create_conversation(f"Sohbet {size}", user.user_id)
+            fill_conversation(engine, conversation.conversation_id, size)
+            all_ms, _ = timed(lambda: db.get_messages(conversation.conversation_id))
+            page_ms, page_len = timed(lambda: db.get_messages_page(conversation.conversation_id))
+            db.session.expunge_all()
+            print(f"{size:>8} mesaj: tümü {all_ms:8.1f} ms, ilk sayfa ({page_len}) {page_ms:6.2f} ms")
+        db.session.close()
+        dispose_engine()
+
+if __name__ == "__main__":
+    main()
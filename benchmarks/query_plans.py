@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import uuid
+import tempfile
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, and_, or_
+
+from database import Base, User, Conversation, Message, init_engine, dispose_engine, run_migrations, SCHEMA_VERSION
+from database.migrations import explain_query_plan, get_schema_version
+
+LEGACY_SCHEMA = [
+    """CREATE TABLE user (user_id VARCHAR NOT NULL PRIMARY KEY, username VARCHAR NOT NULL UNIQUE,
+       password VARCHAR NOT NULL, email VARCHAR NOT NULL UNIQUE, first_name VARCHAR NOT NULL,
+       last_name VARCHAR NOT NULL, is_admin BOOLEAN, is_verified BOOLEAN, created_at DATETIME)""",
+    """CREATE TABLE conversation (conversation_id VARCHAR NOT NULL PRIMARY KEY,
+       user_id VARCHAR NOT NULL REFERENCES user (user_id), name VARCHAR NOT NULL,
+       created_at DATETIME, is_archived BOOLEAN)""",
+    """CREATE TABLE message (message_id VARCHAR NOT NULL PRIMARY KEY,
+       conversation_id VARCHAR NOT NULL REFERENCES conversation (conversation_id),
+       message_content TEXT NOT NULL, response_message TEXT, message_date DATETIME)"""
+]
+
+def build_legacy_database(engine, conversations, messages_per_conversation):
+    user_id = str(uuid.uuid4())
+    now = datetime.datetime.now()
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO user VALUES (?, 'bench', 'bench', 'bench@dinamik.com', 'Bench', 'User', 0, 1, ?)",
+            (user_id, str(now))
+        )
+        conversation_ids = [str(uuid.uuid4()) for _ in range(conversations)]
+        connection.exec_driver_sql(
+            "INSERT INTO conversation VALUES (?, ?, ?, ?, 0)",
+            [(cid, user_id, f"Sohbet {i}", str(now + datetime.timedelta(minutes=i))) for i, cid in enumerate(conversation_ids)]
+        )
+        rows = []
+        for cid in conversation_ids:
+            for i in range(messages_per_conversation):
+                rows.append((str(uuid.uuid4()), cid, f"Mesaj {i}", "Yanıt", str(now + datetime.timedelta(seconds=i))))
+        connection.exec_driver_sql("INSERT INTO message VALUES (?, ?, ?, ?, ?)", rows)
+    return user_id, conversation_ids[0]
+
+def hot_queries(user_id, conversation_id):
+    before_date, before_id = datetime.datetime.now(), "ffffffff-ffff-ffff-ffff-ffffffffffff"
+    return {
+        "get_messages": select(Message).where(Message.conversation_id == conversation_id).order_by(Message.message_date),
+        "get_messages_page": select(Message).where(
+            Message.conversation_id == conversation_id,
+            or_(Message.message_date < before_date,
+                and_(Message.message_date == before_date, Message.message_id < before_id))
+        ).order_by(Message.message_date.desc(), Message.message_id.desc()).limit(50),
+        "get_conversations": select(Conversation).order_by(Conversation.created_at.desc()),
+        "user_conversations": select(Conversation).where(
+            Conversation.user_id == user_id, Conversation.is_archived == False
+        ).order_by(Conversation.created_at.desc()),
+        "get_user": select(User).where(User.username == "bench")
+    }
+
+def check_plan(plan):
+    for step in plan:
+        if step.startswith("SCAN") and "USING" not in step:
+            return False
+        if "TEMP B-TREE" in step:
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Şema göçü süresi ve sıcak sorguların EXPLAIN QUERY PLAN denetimi")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "legacy.db"))
+        user_id, conversation_id = build_legacy_database(engine, args.conversations, args.messages)
+
+        start = time.perf_counter()
+        Base.metadata.create_all(engine)
+        run_migrations(engine, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+        with engine.connect() as connection:
+            version = get_schema_version(connection)
+            print(f"Göç: {args.conversations * args.messages} mesaj, {elapsed:.2f} sn, şema sürümü {version}")
+            if version != SCHEMA_VERSION:
+                failed = True
+            stats_count = connection.exec_driver_sql(
+                "SELECT message_count FROM conversation_stats WHERE conversation_id = ?", (conversation_id,)
+            ).scalar()
+            if stats_count != args.messages:
+                print(f"HATA conversation_stats: {stats_count} != {args.messages}")
+                failed = True
+            for name, statement in hot_queries(user_id, conversation_id).items():
+                plan = explain_query_plan(connection, statement)
+                ok = check_plan(plan)
+                failed = failed or not ok
+                print(f"{'OK ' if ok else 'HATA'} {name}: {' | '.join(plan)}")
+        dispose_engine()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, get_engine, create_db, dispose_engine
+from database.engine import DEFAULT_PRAGMAS
+from benchmarks.load.dataset import generate, sample_keys, sentence
+from benchmarks.load.workload import percentile
+
+READ_OPERATIONS = ("get_conversations", "get_messages_page", "get_messages")
+
+class Writer(threading.Thread):
+    def __init__(self, index, deadline, conversation_ids, batch):
+        super().__init__(daemon=True)
+        self.rng = random.Random(index)
+        self.deadline = deadline
+        self.conversation_ids = conversation_ids
+        self.batch = batch
+        self.commits = []
+        self.errors = 0
+
+    def run(self):
+        engine = get_engine()
+        while time.perf_counter() < self.deadline:
+            conversation_id = self.rng.choice(self.conversation_ids)
+            rows = [
+                {"message_id": str(uuid.uuid4()), "conversation_id": conversation_id,
+                 "message_content": sentence(self.rng, 12), "response_message": sentence(self.rng, 60),
+                 "sender": "user"}
+                for _ in range(self.batch)
+            ]
+            start = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(Message.__table__.insert(), rows)
+            except Exception:
+                self.errors += 1
+                continue
+            self.commits.append(time.perf_counter() - start)
+
+class Reader(threading.Thread):
+    def __init__(self, index, deadline, conversation_ids):
+        super().__init__(daemon=True)
+        self.rng = random.Random(100 + index)
+        self.deadline = deadline
+        self.conversation_ids = conversation_ids
+        self.latencies = {name: [] for name in READ_OPERATIONS}
+        self.errors = 0
+
+    def run(self):
+        db = Database()
+        while time.perf_counter() < self.deadline:
+            name = self.rng.choice(READ_OPERATIONS)
+            start = time.perf_counter()
+            try:
+                if name == "get_conversations":
+                    db.get_conversations()
+                elif name == "get_messages_page":
+                    db.get_messages_page(self.rng.choice(self.conversation_ids))
+                else:
+                    db.get_messages(self.rng.choice(self.conversation_ids))
+            except Exception:
+                db.session.rollback()
+                self.errors += 1
+                continue
+            finally:
+                db.session.close()
+            self.latencies[name].append(time.perf_counter() - start)
+
+def report(label, values):
+    values = sorted(values)
+    if not values:
+        print(f"{label:>20}: ölçüm yok")
+        return
+    print(f"{label:>20}: {len(values):6d} işlem, p50 {percentile(values, 0.50) * 1000:7.2f} ms, "
+          f"p95 {percentile(values, 0.95) * 1000:7.2f} ms, p99 {percentile(values, 0.99) * 1000:7.2f} ms")
+
+def measure(read_pool_size, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_settings = {"connection": {"read_pool_size": read_pool_size}, "pragmas": DEFAULT_PRAGMAS}
+        init_engine(db_settings=db_settings, db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        generate(20, args.conversations, args.messages)
+        conversation_ids, _ = sample_keys()
+
+        deadline = time.perf_counter() + args.duration
+        writers = [Writer(i, deadline, conversation_ids, args.batch) for i in range(args.writers)]
+        readers = [Reader(i, deadline, conversation_ids) for i in range(args.readers)]
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers + readers:
+            thread.join()
+        dispose_engine()
+
+    title = f"read_pool_size={read_pool_size}" + (" (tek havuz)" if read_pool_size == 0 else "")
+    print(title)
+    for name in READ_OPERATIONS:
+        report(name, [value for reader in readers for value in reader.latencies[name]])
+    report(f"yazma ({args.batch} satır)", [value for writer in writers for value in writer.commits])
+    errors = sum(thread.errors for thread in writers + readers)
+    if errors:
+        print(f"{'hata':>20}: {errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Yoğun yazma altında ayrı okuma havuzunun arayüz sorgu gecikmesine etkisi")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--conversations", type=int, default=500)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--read-pool-sizes", type=int, nargs="+", default=[0, 4])
+    args = parser.parse_args()
+
+    for read_pool_size in args.read_pool_sizes:
+        measure(read_pool_size, args)
+
+if __name__ == "__main__":
+    main()
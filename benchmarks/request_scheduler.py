@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.load.replay_server import ReplayServer, DEFAULT_RECORDING
+from utils.openai_utils import OpenAIChatManager
+from database.response_cache import response_cache
+from utils.scheduler_utils import RequestScheduler, PRIORITY_HIGH, PRIORITY_LOW
+
+def check_ordering(conversations, messages, limit, job_ms):
+    scheduler = RequestScheduler(workers=limit, max_concurrent=limit)
+    lock = threading.Lock()
+    started = {}
+    active = set()
+    overlaps = []
+
+    def job(conversation_id, index):
+        with lock:
+            if conversation_id in active:
+                overlaps.append(conversation_id)
+            active.add(conversation_id)
+            started.setdefault(conversation_id, []).append(index)
+        time.sleep(job_ms / 1000)
+        with lock:
+            active.discard(conversation_id)
+
+    rng = random.Random(1)
+    order = [(conversation_id, index) for index in range(messages) for conversation_id in range(conversations)]
+    rng.shuffle(order)
+    # Karıştırılmış gönderimde de her konuşmanın kendi sırası korunmalı
+    counters = {}
+    for conversation_id, _ in order:
+        index = counters.get(conversation_id, 0)
+        counters[conversation_id] = index + 1
+        scheduler.submit(conversation_id, job, conversation_id, index)
+    start = time.perf_counter()
+    while scheduler.metrics()["completed"] < conversations * messages:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    metrics = scheduler.metrics()
+    scheduler.stop()
+    ordered = all(indexes == sorted(indexes) for indexes in started.values())
+    return elapsed, ordered, not overlaps, metrics
+
+def check_priority():
+    scheduler = RequestScheduler(workers=1, max_concurrent=1)
+    gate = threading.Event()
+    done = []
+    scheduler.submit("engel", gate.wait)
+    futures = [scheduler.submit(f"dusuk-{i}", done.append, f"dusuk-{i}", priority=PRIORITY_LOW) for i in range(3)]
+    futures.append(scheduler.submit("yuksek", done.append, "yuksek", priority=PRIORITY_HIGH))
+    gate.set()
+    for future in futures:
+        future.result(5)
+    scheduler.stop()
+    return done[0] == "yuksek"
+
+class Collector(QObject):
+    def __init__(self, expected, loop):
+        super().__init__()
+        self.expected = expected
+        self.loop = loop
+        self.finished = 0
+        self.max_depth = 0
+
+    def on_finished(self, *args):
+        self.finished += 1
+        if self.finished >= self.expected:
+            self.loop.quit()
+
+    def on_depth(self, depth):
+        self.max_depth = max(self.max_depth, depth)
+
+def end_to_end(server, conversations, messages, limit):
+    manager = OpenAIChatManager()
+    # Tekrarlanan istemler ağa gitmeli, önbellek ölçümü benchmarks/response_cache.py'de
+    response_cache.configure({"enabled": False})
+    manager.api_key = "OPENAI_API_KEY"
+    manager.api_base = server.base_url
+    manager.scheduler.set_limits(workers=limit, max_concurrent=limit)
+    loop = QEventLoop()
+    collector = Collector(conversations * messages, loop)
+    manager.response_completed.connect(collector.on_finished)
+    manager.response_failed.connect(collector.on_finished)
+    manager.queue_depth_changed.connect(collector.on_depth)
+    start = time.perf_counter()
+    for index in range(messages):
+        for conversation_id in range(conversations):
+            manager.stream_response(f"konusma-{conversation_id}", f"mesaj {index}")
+    QTimer.singleShot(120000, loop.quit)
+    loop.exec()
+    elapsed = time.perf_counter() - start
+    metrics = manager.metrics()
+    manager.scheduler.stop()
+    return elapsed, collector.finished, collector.max_depth, metrics
+
+def main():
+    parser = argparse.ArgumentParser(description="Konuşma başına FIFO istek zamanlayıcısının sıra, öncelik ve eşzamanlılık ölçümü")
+    parser.add_argument("--conversations", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=4)
+    parser.add_argument("--job-ms", type=float, default=20)
+    parser.add_argument("--limits", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--speed", type=float, default=0.25)
+    args = parser.parse_args()
+
+    failed = False
+    total = args.conversations * args.messages
+    print(f"Zamanlayıcı: {args.conversations} konuşma x {args.messages} istek, iş başına {args.job_ms:.0f} ms")
+    for limit in args.limits:
+        elapsed, ordered, exclusive, metrics = check_ordering(args.conversations, args.messages, limit, args.job_ms)
+        print(f"  sınır {limit}: {elapsed * 1000:7.1f} ms, {total / elapsed:6.1f} istek/sn, en derin kuyruk {metrics['max_depth']}, "
+              f"ortalama bekleme {metrics['avg_wait_ms']:.1f} ms, sıra {'korundu' if ordered else 'BOZULDU'}, "
+              f"konuşma içi çakışma {'yok' if exclusive else 'VAR'}")
+        failed = failed or not ordered or not exclusive
+    priority = check_priority()
+    print(f"  yüksek öncelikli istek bekleyen düşük öncelikli isteklerin önüne {'geçti' if priority else 'GEÇEMEDİ'}")
+    failed = failed or not priority
+
+    app = QApplication(sys.argv)
+    server = ReplayServer(DEFAULT_RECORDING, speed=args.speed).start()
+    os.environ["OPENAI_API_KEY"] = "yerel-yeniden-oynatma"
+    print(f"\nUçtan uca: yerel SSE sunucusu, kayıt hızı x{args.speed}")
+    for limit in args.limits:
+        elapsed, finished, max_depth, metrics = end_to_end(server, args.conversations, args.messages, limit)
+        print(f"  sınır {limit}: {finished}/{total} yanıt {elapsed * 1000:8.1f} ms'de, en derin kuyruk {max_depth}, "
+              f"ortalama bekleme {metrics['avg_wait_ms']:.1f} ms")
+        failed = failed or finished != total
+    server.stop()
+    app.quit()
+
+    if failed:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK: konuşma içi sıra korundu, hiçbir istek düşürülmedi")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.load.replay_server import ReplayServer, DEFAULT_RECORDING
+from benchmarks.load.workload import percentile
+from database import init_engine, create_db, dispose_engine
+from database.response_cache import response_cache, cache_key
+from utils.openai_utils import OpenAIChatManager
+
+PROMPTS = [
+    "Yapay zeka nedir?",
+    "Python'da liste ile demet arasındaki fark nedir?",
+    "SQLite WAL modu ne işe yarar?",
+    "Bana kısa bir şiir yaz",
+    "HTTP bağlantı havuzu neden hızlıdır?",
+    "Türkiye'nin başkenti neresidir?",
+    "Bir e-postayı nasıl resmi yazarım?",
+    "Rekürsiyonu bir örnekle açıkla"
+]
+
+def variant(prompt, rng):
+    # Kullanıcılar aynı soruyu farklı büyük/küçük harf ve boşluklarla yazar
+    choice = rng.randrange(3)
+    if choice == 1:
+        return "  " + prompt.lower()
+    if choice == 2:
+        return prompt.upper().rstrip("?") + "  ?"
+    return prompt
+
+class Receiver(QObject):
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+        self.response = None
+        self.stats = None
+
+    def on_completed(self, conversation_id, response, stats):
+        self.response = response
+        self.stats = stats
+        self.loop.quit()
+
+    def on_failed(self, conversation_id, error):
+        print(f"Yanıt başarısız: {error}")
+        self.loop.quit()
+
+def ask(manager, prompt, system_prompt=None):
+    loop = QEventLoop()
+    receiver = Receiver(loop)
+    manager.response_completed.connect(receiver.on_completed)
+    manager.response_failed.connect(receiver.on_failed)
+    QTimer.singleShot(30000, loop.quit)
+    start = time.perf_counter()
+    manager.stream_response("kiyaslama", prompt, system_prompt)
+    loop.exec()
+    elapsed = time.perf_counter() - start
+    manager.response_completed.disconnect(receiver.on_completed)
+    manager.response_failed.disconnect(receiver.on_failed)
+    return elapsed * 1000, receiver.response, receiver.stats
+
+def check_ttl():
+    response_cache.configure({"ttl_hours": 0.2 / 3600})
+    key = cache_key("ttl-model", 0.7, None, "süresi dolacak soru")
+    response_cache.put(key, "ttl-model", "yanıt", {"elapsed_ms": 100.0})
+    fresh = response_cache.get(key) is not None
+    time.sleep(0.3)
+    expired = response_cache.get(key) is None
+    response_cache.purge()
+    response_cache.configure({})
+    return fresh and expired
+
+def main():
+    parser = argparse.ArgumentParser(description="İki katmanlı yanıt önbelleğinin isabet oranı ve kazandırdığı gecikme")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--speed", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--recording", default=DEFAULT_RECORDING)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    server = ReplayServer(args.recording, speed=args.speed).start()
+    os.environ["OPENAI_API_KEY"] = "yerel-yeniden-oynatma"
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        manager = OpenAIChatManager()
+        manager.api_key = "OPENAI_API_KEY"
+        manager.api_base = server.base_url
+        response_cache.reset_metrics()
+
+        rng = random.Random(args.seed)
+        latencies = {"network": [], "memory": [], "disk": []}
+        texts = set()
+        # Sık sorulan birkaç soru iş yükünün çoğunu oluşturur
+        weights = [1 / (rank + 1) for rank in range(len(PROMPTS))]
+        for _ in range(args.requests):
+            prompt = variant(rng.choices(PROMPTS, weights)[0], rng)
+            elapsed, response, stats = ask(manager, prompt)
+            if stats is None:
+                failed = True
+                continue
+            latencies[stats["source"]].append(elapsed)
+            texts.add(response)
+
+        # Bellek boşaltılınca aynı istemler SQLite katmanından gelmeli
+        response_cache.clear(disk=False)
+        for prompt in PROMPTS:
+            elapsed, response, stats = ask(manager, prompt)
+            if stats is None:
+                failed = True
+                continue
+            latencies[stats["source"]].append(elapsed)
+            texts.add(response)
+
+        # Farklı mod istemi aynı soruyu önbellekten almamalı
+        _, _, stats = ask(manager, PROMPTS[0], "Yanıtlarını edebi bir dille yaz.")
+        mode_isolated = stats is not None and stats["source"] == "network"
+
+        ttl = check_ttl()
+        metrics = response_cache.metrics()
+        manager.scheduler.stop()
+        dispose_engine()
+    server.stop()
+    app.quit()
+
+    print(f"{args.requests} istek, {len(PROMPTS)} farklı soru, kayıt hızı x{args.speed}")
+    for source, values in latencies.items():
+        values.sort()
+        if values:
+            print(f"  {source:>8}: {len(values):3d} yanıt, p50 {percentile(values, 0.5):8.2f} ms, p95 {percentile(values, 0.95):8.2f} ms")
+    print(f"  isabet oranı {metrics['hit_ratio'] * 100:.1f}% (bellek {metrics['memory_hits']}, disk {metrics['disk_hits']}, "
+          f"ıska {metrics['misses']}), kazanılan süre {metrics['saved_ms']:.0f} ms, ortalama arama {metrics['avg_lookup_ms']:.3f} ms")
+    print(f"  mod istemi ayrı anahtar {'oluşturdu' if mode_isolated else 'OLUŞTURMADI'}, TTL sonrası kayıt {'düştü' if ttl else 'DÜŞMEDİ'}")
+
+    network = percentile(latencies["network"], 0.5) if latencies["network"] else 0
+    for source in ("memory", "disk"):
+        if not latencies[source] or percentile(latencies[source], 0.5) * 10 > network:
+            print(f"BAŞARISIZ: {source} isabetleri ağdan en az 10 kat hızlı değil")
+            failed = True
+    if len(texts) != 1 or not mode_isolated or not ttl:
+        failed = True
+    if failed:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK: tekrarlanan istemler önbellekten anında döndü")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+import argparse
+import datetime
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine
+from database.retention import DEFAULT_RETENTION, run_retention
+
+def fill(engine, conversation_ids, count, days, batch=20000):
+    rng = random.Random(7)
+    oldest = datetime.datetime.now() - datetime.timedelta(days=days)
+    step = datetime.timedelta(days=days) / count
+    for start in range(0, count, batch):
+        rows = [
+            {"message_id": str(uuid.uuid4()), "conversation_id": rng.choice(conversation_ids),
+             "message_content": "eski mesaj " * 20, "response_message": "eski yanıt " * 40,
+             "message_date": oldest + step * i, "sender": "user"}
+            for i in range(start, min(start + batch, count))
+        ]
+        with engine.begin() as connection:
+            connection.execute(Message.__table__.insert(), rows)
+
+class Writer(threading.Thread):
+    def __init__(self, engine, conversation_id):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.conversation_id = conversation_id
+        self.stop_event = threading.Event()
+        self.stalls = []
+
+    def run(self):
+        while not self.stop_event.is_set():
+            t = time.perf_counter()
+            with self.engine.begin() as connection:
+                connection.execute(Message.__table__.insert(), {
+                    "message_id": str(uuid.uuid4()), "conversation_id": self.conversation_id,
+                    "message_content": "yeni", "message_date": datetime.datetime.now(), "sender": "user"
+                })
+            self.stalls.append((time.perf_counter() - t) * 1000)
+            time.sleep(0.01)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sohbet geçmişi temizleme hızı ve kilit süresi ölçümü")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--max-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_RETENTION["batch_size"])
+    parser.add_argument("--batch-pause-ms", type=int, default=DEFAULT_RETENTION["batch_pause_ms"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        engine = init_engine(db_file=db_file)
+        create_db()
+        db = Database()
+        user_id = db.get_user("admin").user_id
+        conversation_ids = [db.create_conversation(f"Sohbet {i}", user_id).conversation_id for i in range(200)]
+        db.session.close()
+        fill(engine, conversation_ids, args.messages, args.days)
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = os.path.getsize(db_file) / (1024 * 1024)
+
+        config = dict(DEFAULT_RETENTION, max_days=args.max_days, batch_size=args.batch_size,
+                      batch_pause_ms=args.batch_pause_ms)
+        writer = Writer(engine, conversation_ids[0])
+        writer.start()
+        stats = run_retention(engine, config)
+        writer.stop_event.set()
+        writer.join()
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_after = os.path.getsize(db_file) / (1024 * 1024)
+        dispose_engine()
+
+    stalls = sorted(writer.stalls)
+    print(f"Silinen satır: {stats.rows} ({stats.batches} parti), {stats.rows_per_second():.0f} satır/sn, "
+          f"en uzun kilit {stats.longest_lock * 1000:.1f} ms")
+    print(f"Artımlı vakum: {stats.vacuumed_pages} sayfa, dosya {size_before:.1f} MB -> {size_after:.1f} MB")
+    print(f"Eşzamanlı yazıcı commit p50 {stalls[len(stalls) // 2]:.2f} ms, en uzun {stalls[-1]:.2f} ms ({len(stalls)} commit)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import uuid
+import random
+import itertools
+import tempfile
+import argparse
+import datetime
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine, search, clear_caches
+from database.search import backfill_step, create_search_schema
+
+WORDS = ["merhaba", "yapay", "zeka", "python", "veritabanı", "sohbet", "model", "öğrenme", "hava", "durumu",
+         "kitap", "müzik", "proje", "kod", "hata", "çözüm", "soru", "cevap", "günaydın", "teşekkür",
+         "hello", "database", "search", "index", "query", "latency", "thread", "window", "message", "response"]
+VOCABULARY = WORDS + [f"terim{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+QUERIES = ["yapay zeka", "veritabanı hata", "merh", "teşekkür", "python kod", "terim150", "terim4242 yapay"]
+
+def sentence(rng, length):
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=length))
+
+def fill(engine, conversation_ids, count, batch=20000):
+    now = datetime.datetime.now()
+    rng = random.Random(42)
+    for start in range(0, count, batch):
+        rows = [
+            {"message_id": str(uuid.uuid4()), "conversation_id": rng.choice(conversation_ids),
+             "message_content": sentence(rng, 12),
+             "response_message": sentence(rng, 40),
+             "message_date": now + datetime.timedelta(seconds=i), "sender": "user"}
+            for i in range(start, min(start + batch, count))
+        ]
+        with engine.begin() as connection:
+            connection.execute(Message.__table__.insert(), rows)
+
+def check_relevance(tmp, newer=1000):
+    # Eski ama en güçlü eşleşme, yeni zayıf eşleşmelerin ve başka kullanıcının eşleşmelerinin arkasında kalmamalı
+    # Önbellekte önceki veritabanının kullanıcıları kalmamalı
+    clear_caches()
+    engine = init_engine(db_file=os.path.join(tmp, "relevance.db"))
+    create_db()
+    db = Database()
+    owner = db.get_user("admin")
+    other = db.create_user("baska", "parola", "baska@dinamik.com", "Başka", "Kullanıcı")
+    own = db.create_conversation("Notlar", owner.user_id).conversation_id
+    foreign = db.create_conversation("Başka notlar", other.user_id).conversation_id
+    now = datetime.datetime.now()
+    rows = [{"message_id": str(uuid.uuid4()), "conversation_id": own, "message_content": "kedi kedi kedi kedi kedi",
+             "response_message": None, "message_date": now, "sender": "user"}]
+    for i in range(newer):
+        for conversation_id in (own, foreign):
+            rows.append({"message_id": str(uuid.uuid4()), "conversation_id": conversation_id,
+                         "message_content": f"kedi ve {sentence(random.Random(i), 30)}", "response_message": None,
+                         "message_date": now + datetime.timedelta(seconds=i + 1), "sender": "user"})
+    with engine.begin() as connection:
+        connection.execute(Message.__table__.insert(), rows)
+    results = search(db.session, "kedi", owner.user_id, limit=5)
+    foreign_results = search(db.session, "kedi", other.user_id, limit=5, offset=newer - 2)
+    db.session.close()
+    dispose_engine()
+    strongest = bool(results) and results[0]["snippet"].count("kedi") == 5
+    isolated = all(hit["user_id"] == owner.user_id for hit in results) and len(results) == 5
+    return strongest, isolated and len(foreign_results) == 2
+
+def main():
+    parser = argparse.ArgumentParser(description="FTS5 arama gecikmesi ölçümü")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--conversations", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        user = db.get_user("admin")
+        # Konuşmalar kullanıcılara sırayla dağıtılır, ölçüm ilk kullanıcının (admin) araması üzerinden yapılır
+        users = [user] + [db.create_user(f"kullanici{i}", "parola", f"kullanici{i}@dinamik.com", "Test", str(i))
+                          for i in range(1, args.users)]
+        conversation_ids = [db.create_conversation(f"Sohbet {i} {WORDS[i % len(WORDS)]}",
+                                                   users[i % len(users)].user_id).conversation_id
+                            for i in range(args.conversations)]
+
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP TRIGGER message_fts_insert")
+        fill(engine, conversation_ids, args.messages)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM message_fts")
+            create_search_schema(connection)
+
+        start = time.perf_counter()
+        while not backfill_step(engine):
+            pass
+        print(f"Dizin doldurma: {args.messages} mesaj, {time.perf_counter() - start:.1f} sn, "
+              f"{len(users)} kullanıcı, aranan kullanıcının payı ~{args.messages // len(users)} mesaj")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                results = search(db.session, query, user.user_id, limit=20)
+                timings.append((time.perf_counter() - t) * 1000)
+            print(f"{query!r:>20}: {len(results)} sonuç, p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+        db.session.close()
+        dispose_engine()
+
+        strongest, isolated = check_relevance(tmp)
+    print(f"En güçlü eski eşleşme ilk sırada: {'evet' if strongest else 'HAYIR'}, "
+          f"başka kullanıcının eşleşmeleri sonuçları {'etkilemedi' if isolated else 'ETKİLEDİ'}")
+    if not strongest or not isolated:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
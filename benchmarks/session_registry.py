@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, User, Conversation, Message, init_engine, get_db_session, dispose_engine
+
+def prepare(db_file):
+    engine = init_engine(db_file=db_file)
+    Base.metadata.create_all(engine)
+    session = get_db_session()
+    user = User(user_id=User.generate_user_id(), username="bench", password="bench",
+                email="bench@dinamik.com", first_name="Bench", last_name="User")
+    conversation = Conversation(conversation_id=Conversation.generate_conversation_id(),
+                                name="Bench", user=user)
+    session.add_all([user, conversation])
+    session.commit()
+    conversation_id = conversation.conversation_id
+    session.close()
+    return conversation_id
+
+def send_legacy(db_file, conversation_id, text):
+    engine = create_engine(f'sqlite:///{db_file}')
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(Message(message_id=Message.generate_message_id(), conversation_id=conversation_id, message_content=text))
+    session.commit()
+    session.close()
+    engine.dispose()
+
+def send_registry(db_file, conversation_id, text):
+    session = get_db_session()
+    session.add(Message(message_id=Message.generate_message_id(), conversation_id=conversation_id, message_content=text))
+    session.commit()
+    session.close()
+
+def measure(send, db_file, conversation_id, count):
+    start = time.perf_counter()
+    for i in range(count):
+        send(db_file, conversation_id, f"Mesaj {i}")
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesaj başına engine oluşturma ile paylaşılan engine kaydının karşılaştırması")
+    parser.add_argument("--count", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        conversation_id = prepare(db_file)
+        legacy = measure(send_legacy, db_file, conversation_id, args.count)
+        registry = measure(send_registry, db_file, conversation_id, args.count)
+        dispose_engine()
+
+    print(f"Eski yol (çağrı başına engine): {legacy:.1f} mesaj/sn")
+    print(f"Paylaşılan engine kaydı:       {registry:.1f} mesaj/sn")
+    print(f"Hızlanma: {registry / legacy:.2f}x")
+
+if __name__ == "__main__":
+    main()
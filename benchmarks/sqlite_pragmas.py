@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Base, User, Conversation, Message, init_engine, create_session, dispose_engine
+from database.engine import DEFAULT_PRAGMAS
+
+PROFILES = {
+    "varsayılan (rollback journal)": {"busy_timeout": 5000},
+    "ayarlı (WAL)": DEFAULT_PRAGMAS
+}
+
+def prepare(db_file, pragmas):
+    engine = init_engine(db_settings={"pragmas": pragmas}, db_file=db_file)
+    Base.metadata.create_all(engine)
+    session = create_session()
+    user = User(user_id=User.generate_user_id(), username="bench", password="bench",
+                email="bench@dinamik.com", first_name="Bench", last_name="User")
+    conversation = Conversation(conversation_id=Conversation.generate_conversation_id(),
+                                name="Bench", user=user)
+    session.add_all([user, conversation])
+    session.commit()
+    conversation_id = conversation.conversation_id
+    session.close()
+    return conversation_id
+
+def writer(conversation_id, count, result):
+    session = create_session()
+    start = time.perf_counter()
+    for i in range(count):
+        session.add(Message(message_id=Message.generate_message_id(), conversation_id=conversation_id,
+                            message_content=f"Mesaj {i}", response_message="Yanıt " * 50))
+        session.commit()
+    result["commits_per_second"] = count / (time.perf_counter() - start)
+    session.close()
+
+def reader(conversation_id, stop, latencies):
+    session = create_session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        session.query(Message).filter_by(conversation_id=conversation_id).order_by(Message.message_date).all()
+        session.rollback()
+        latencies.append((time.perf_counter() - start) * 1000)
+    session.close()
+
+def run_profile(pragmas, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        conversation_id = prepare(os.path.join(tmp, "bench.db"), pragmas)
+        result = {}
+        latencies = []
+        stop = threading.Event()
+        read_thread = threading.Thread(target=reader, args=(conversation_id, stop, latencies))
+        read_thread.start()
+        writer(conversation_id, count, result)
+        stop.set()
+        read_thread.join()
+        dispose_engine()
+    latencies.sort()
+    result["read_p50_ms"] = statistics.median(latencies)
+    result["read_max_ms"] = latencies[-1]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite pragma profili: commit hızı ve eşzamanlı okuma gecikmesi")
+    parser.add_argument("--count", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, pragmas in PROFILES.items():
+        result = run_profile(pragmas, args.count)
+        print(f"{name}: {result['commits_per_second']:.1f} commit/sn, "
+              f"okuma p50 {result['read_p50_ms']:.2f} ms, okuma max {result['read_max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
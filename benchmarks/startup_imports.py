@@ -0,0 +1,113 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.load.workload import percentile
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+RESULT_MARKER = "STARTUP_RESULT "
+
+# Alt süreçte main.main() olduğu gibi çalışır, giriş penceresi ilk kez boyandığında uygulama kapatılır
+CHILD = """
+import sys, json, time
+import main
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from utils.services import services, initialize_service, service_timings, WARM_UP_ORDER
+
+EAGER = {eager}
+result = {{"imports": time.time()}}
+
+class ProbeLoginWindow(main.LoginWindow):
+    def __init__(self, *args, **kwargs):
+        if EAGER:
+            for name in WARM_UP_ORDER:
+                initialize_service(name)
+        super().__init__(*args, **kwargs)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first_paint" not in result:
+            result["first_paint"] = time.time()
+            QTimer.singleShot(0, QApplication.instance().quit)
+
+main.LoginWindow = ProbeLoginWindow
+try:
+    main.main()
+except SystemExit:
+    pass
+result["services"] = service_timings()
+print("{marker}" + json.dumps(result), flush=True)
+"""
+
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), len(indent) - 1))
+    return modules
+
+def run_once(eager):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "settings.json"), tmp)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])), QT_QPA_PLATFORM="offscreen")
+        started = time.time()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD.format(eager=eager, marker=RESULT_MARKER)],
+            cwd=tmp, env=env, capture_output=True, text=True, timeout=120
+        )
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+            break
+    else:
+        errors = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-10:]) or f"alt süreç {process.returncode} koduyla çıktı")
+    result["imports"] -= started
+    result["first_paint"] -= started
+    result["modules"] = parse_importtime(process.stderr)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="-X importtime ile modül içe aktarma süreleri ve giriş penceresinin ilk boyanma süresi")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--modes", nargs="+", choices=["lazy", "eager"], default=["eager", "lazy"])
+    args = parser.parse_args()
+
+    summary = {}
+    for mode in args.modes:
+        runs = []
+        for _ in range(args.runs):
+            try:
+                runs.append(run_once(mode == "eager"))
+            except Exception as e:
+                print(f"{mode}: başlangıç ölçülemedi:\n{e}")
+                sys.exit(1)
+        modules = runs[-1]["modules"]
+        total = sum(cumulative for _, _, cumulative, depth in modules if depth == 0)
+        print(f"\n{mode}: en yavaş {args.top} içe aktarma (son çalıştırma, kümülatif)")
+        for name, own, cumulative, depth in sorted(modules, key=lambda module: -module[2])[:args.top]:
+            print(f"  {cumulative / 1000:8.1f} ms  (kendi {own / 1000:6.1f} ms)  {name}")
+        services = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in runs[-1]["services"].items())
+        print(f"  toplam içe aktarma {total / 1000:.1f} ms, {len(modules)} modül; servisler: {services or '-'}")
+        summary[mode] = [sorted(run[key] * 1000 for run in runs) for key in ("imports", "first_paint")]
+
+    print()
+    for mode, (imports, paints) in summary.items():
+        print(f"{mode:>6}: main içe aktarıldı p50 {percentile(imports, 0.5):7.1f} ms, "
+              f"ilk pencere boyandı p50 {percentile(paints, 0.5):7.1f} ms, p95 {percentile(paints, 0.95):7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.load.workload import percentile
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+# Alt süreçte main.main() olduğu gibi çalışır, ilk boyamadan sonra uygulama kapatılır
+CHILD = """
+import json, time
+import main
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from utils.startup_utils import startup
+
+def finished(summary):
+    with open({result_file!r}, 'w', encoding='utf-8') as f:
+        json.dump(dict(summary, wall=time.time()), f)
+    QTimer.singleShot(0, QApplication.instance().quit)
+
+startup.when_finished(finished)
+try:
+    main.main()
+except SystemExit:
+    pass
+"""
+
+def run_once(workdir, pycache, trace_file):
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+        PYTHONPYCACHEPREFIX=pycache,
+        QT_QPA_PLATFORM="offscreen",
+        DINAMIKCHAT_STARTUP_TRACE=trace_file
+    )
+    # Sıcak başlangıçta bayt kodu önbelleğinin dolması gerekir
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result_file = trace_file + ".result"
+    started = time.time()
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD.format(result_file=result_file)],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=120
+    )
+    if not os.path.exists(result_file):
+        raise RuntimeError(process.stderr.strip()[-2000:] or f"alt süreç {process.returncode} koduyla çıktı")
+    with open(result_file, 'r', encoding='utf-8') as f:
+        result = json.load(f)
+    result["process"] = (result.pop("wall") - started) * 1000
+    return result
+
+def prepare(directory):
+    os.makedirs(directory, exist_ok=True)
+    shutil.copy(os.path.join(ROOT, "settings.json"), directory)
+    return directory
+
+def measure(mode, runs, tmp):
+    results = []
+    warm_dir = prepare(os.path.join(tmp, "warm"))
+    warm_cache = os.path.join(tmp, "warm_pycache")
+    if mode == "warm":
+        # Veritabanı, bayt kodu ve işletim sistemi önbelleği ısınsın diye bir çalıştırma atılır
+        run_once(warm_dir, warm_cache, os.path.join(tmp, "trace_warmup.json"))
+    for index in range(runs):
+        trace_file = os.path.join(tmp, f"trace_{mode}_{index}.json")
+        if mode == "cold":
+            # Her soğuk başlangıç boş bir veritabanı ve boş bir bayt kodu önbelleğiyle açılır
+            run_dir = prepare(os.path.join(tmp, f"cold_{index}"))
+            results.append(run_once(run_dir, os.path.join(tmp, f"cold_pycache_{index}"), trace_file))
+        else:
+            results.append(run_once(warm_dir, warm_cache, trace_file))
+    phases = {}
+    for result in results:
+        for name, value in result.items():
+            phases.setdefault(name, []).append(value)
+    return {name: sorted(values) for name, values in phases.items()}, trace_file
+
+def find_regressions(current, baseline, tolerance, slack_ms):
+    # Başlangıç süreleri gürültülü olduğundan karşılaştırma en iyi çalıştırmalar üzerinden yapılır
+    regressions = []
+    for mode, phases in current.items():
+        for name, values in phases.items():
+            value = values[0]
+            previous = baseline.get(mode, {}).get(name)
+            if previous is None:
+                continue
+            if value > previous * (1 + tolerance) and value - previous > slack_ms:
+                regressions.append(f"{mode}/{name}: {previous:.1f} ms -> {value:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Başlangıç evrelerinin offscreen soğuk/sıcak ölçümü ve gerileme denetimi")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=["cold", "warm"], default=["cold", "warm"])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--slack-ms", type=float, default=25.0)
+    parser.add_argument("--trace-dir")
+    args = parser.parse_args()
+
+    current = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            try:
+                current[mode], trace_file = measure(mode, args.runs, tmp)
+            except Exception as e:
+                print(f"{mode}: başlangıç ölçülemedi:\n{e}")
+                sys.exit(1)
+            if args.trace_dir:
+                os.makedirs(args.trace_dir, exist_ok=True)
+                shutil.copy(trace_file, os.path.join(args.trace_dir, f"startup_{mode}.json"))
+
+    names = list(dict.fromkeys(name for phases in current.values() for name in phases))
+    print(f"{'evre':>18} " + " ".join(f"{mode + ' en iyi':>14} {mode + ' p50':>12}" for mode in current))
+    for name in names:
+        print(f"{name:>18} " + " ".join(
+            f"{current[mode][name][0]:11.1f} ms {percentile(current[mode][name], 0.5):9.1f} ms" for mode in current
+        ))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({mode: {name: values[0] for name, values in phases.items()} for mode, phases in current.items()}, f, indent=4)
+        print(f"Taban ölçüm kaydedildi: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        # Taban ölçüm makineye özgüdür ve depoda tutulmaz; yoksa denetim geçmiş sayılmaz
+        print(f"BAŞARISIZ: taban ölçüm yok ({args.baseline}), önce bu makinede --save-baseline ile oluşturun")
+        sys.exit(1)
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = find_regressions(current, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print("BAŞARISIZ: başlangıç gerilemesi")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"OK: hiçbir evre taban ölçümden %{args.tolerance * 100:.0f} ve {args.slack_ms:.0f} ms'den fazla yavaşlamadı")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import threading
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.load.replay_server import ReplayServer, DEFAULT_RECORDING
+from benchmarks.load.workload import percentile
+from utils.openai_utils import OpenAIChatManager
+from database.response_cache import response_cache
+
+class Receiver(QObject):
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+        self.started = None
+        self.first_token = None
+        self.completed = None
+        self.tokens = 0
+        self.usage = None
+        self.gui_thread = threading.get_ident()
+        self.off_thread = False
+
+    def on_token(self, conversation_id, delta):
+        if self.first_token is None:
+            self.first_token = time.perf_counter() - self.started
+        self.tokens += 1
+        self.off_thread = self.off_thread or threading.get_ident() != self.gui_thread
+
+    def on_completed(self, conversation_id, response, usage):
+        self.completed = time.perf_counter() - self.started
+        self.usage = usage
+        self.loop.quit()
+
+    def on_failed(self, conversation_id, error):
+        print(f"Akış başarısız: {error}")
+        self.loop.quit()
+
+def run_once(manager):
+    loop = QEventLoop()
+    receiver = Receiver(loop)
+    manager.token_received.connect(receiver.on_token)
+    manager.response_completed.connect(receiver.on_completed)
+    manager.response_failed.connect(receiver.on_failed)
+    QTimer.singleShot(30000, loop.quit)
+    receiver.started = time.perf_counter()
+    manager.stream_response("kiyaslama", "Yapay zeka nedir?")
+    loop.exec()
+    manager.token_received.disconnect(receiver.on_token)
+    manager.response_completed.disconnect(receiver.on_completed)
+    manager.response_failed.disconnect(receiver.on_failed)
+    return receiver
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı SSE akışlarını yeniden oynatan yerel sunucuya karşı ilk token süresi")
+    parser.add_argument("--recording", default=DEFAULT_RECORDING)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--max-overhead-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    server = ReplayServer(args.recording, speed=args.speed).start()
+    os.environ["OPENAI_API_KEY"] = "yerel-yeniden-oynatma"
+    manager = OpenAIChatManager()
+    # Tekrarlanan istemler ağa gitmeli, önbellek ölçümü benchmarks/response_cache.py'de
+    response_cache.configure({"enabled": False})
+    manager.api_key = "OPENAI_API_KEY"
+    manager.api_base = server.base_url
+
+    first_tokens, completions = [], []
+    tokens = 0
+    off_thread = False
+    for _ in range(args.runs):
+        receiver = run_once(manager)
+        if receiver.first_token is None or receiver.completed is None:
+            print("BAŞARISIZ: akış tamamlanmadı")
+            sys.exit(1)
+        first_tokens.append(receiver.first_token * 1000)
+        completions.append(receiver.completed * 1000)
+        tokens = receiver.tokens
+        off_thread = off_thread or receiver.off_thread
+    server.stop()
+    app.quit()
+
+    first_tokens.sort()
+    completions.sort()
+    recorded = server.recorded_first_token() * 1000
+    overhead = percentile(first_tokens, 0.5) - recorded
+    print(f"{args.runs} akış, yanıt başına {tokens} parça, kullanım: {receiver.usage}")
+    print(f"  kayıtlı ilk token gecikmesi  {recorded:8.1f} ms")
+    print(f"  ilk token (akışlı)      p50 {percentile(first_tokens, 0.5):8.1f} ms, p95 {percentile(first_tokens, 0.95):8.1f} ms")
+    print(f"  tam yanıt (akışsız bekleme) p50 {percentile(completions, 0.5):8.1f} ms, p95 {percentile(completions, 0.95):8.1f} ms")
+    print(f"  istemci ek yükü p50 {overhead:.1f} ms")
+    if off_thread:
+        print("BAŞARISIZ: token sinyalleri GUI iş parçacığı dışında işlendi")
+        sys.exit(1)
+    if overhead > args.max_overhead_ms:
+        print(f"BAŞARISIZ: ilk token kayıttan {overhead:.1f} ms geç geldi, sınır {args.max_overhead_ms:.1f} ms")
+        sys.exit(1)
+    print("OK: tokenlar GUI iş parçacığına kayıttaki hızda ulaştı")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import time
+import uuid
+import tempfile
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine
+from database.transfer import export_history, import_history
+from benchmarks.load.dataset import generate
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    stats = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return stats, elapsed, peak / (1024 * 1024)
+
+def check_foreign_archive(tmp):
+    # Başka bir kullanıcının konuşmasını hedefleyen arşiv o konuşmaya yazamamalı
+    init_engine(db_file=os.path.join(tmp, "owners.db"))
+    create_db()
+    db = Database()
+    owner = db.get_user("admin")
+    intruder = db.create_user("baska", "parola", "baska@dinamik.com", "Başka", "Kullanıcı")
+    conversation = db.create_conversation("Sahibin sohbeti", owner.user_id)
+    victim = db.create_message(conversation.conversation_id, "sahibin mesajı", response="sahibin yanıtı")
+    own_conversation = str(uuid.uuid4())
+    records = [
+        {"type": "header", "format": 1},
+        {"type": "conversation", "conversation_id": own_conversation, "name": "Kendi sohbeti",
+         "created_at": "2024-01-01T00:00:00", "is_archived": False},
+        {"type": "message", "message_id": str(uuid.uuid4()), "conversation_id": own_conversation,
+         "message_content": "kendi mesajı", "response_message": None, "message_date": "2024-01-01T00:00:01", "sender": "user"},
+        {"type": "message", "message_id": victim.message_id, "conversation_id": conversation.conversation_id,
+         "message_content": "üzerine yazma", "response_message": "ele geçirildi", "message_date": "2024-01-01T00:00:02", "sender": "user"},
+        {"type": "message", "message_id": str(uuid.uuid4()), "conversation_id": conversation.conversation_id,
+         "message_content": "araya girme", "response_message": None, "message_date": "2024-01-01T00:00:03", "sender": "user"}
+    ]
+    archive = os.path.join(tmp, "yabanci.jsonl")
+    with open(archive, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stats = import_history(archive, intruder.user_id, conflict="replace")
+    db.session.expire_all()
+    owner_messages = db.get_messages(conversation.conversation_id)
+    own_messages = db.get_messages(own_conversation)
+    untouched = [message.message_content for message in owner_messages] == ["sahibin mesajı"]
+    db.session.close()
+    dispose_engine()
+    return stats, untouched and len(own_messages) == 1 and stats["rejected"] == 2
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL dışa/içe aktarma hızı ve bellek kullanımı")
+    parser.add_argument("--messages", type=int, nargs="+", default=[20000, 200000])
+    args = parser.parse_args()
+
+    failed = False
+    for count in args.messages:
+        with tempfile.TemporaryDirectory() as tmp:
+            init_engine(db_file=os.path.join(tmp, "source.db"))
+            create_db()
+            generate(users=1, conversations=max(1, count // 200), messages=count)
+            db = Database()
+            user_id = db.get_user("kullanici0").user_id
+            db.session.close()
+            archive = os.path.join(tmp, "gecmis.jsonl")
+            exported, export_time, export_peak = measure(export_history, archive, user_id)
+            dispose_engine()
+
+            init_engine(db_file=os.path.join(tmp, "target.db"))
+            create_db()
+            db = Database()
+            target_user = db.get_user("admin").user_id
+            db.session.close()
+            imported, import_time, import_peak = measure(import_history, archive, target_user)
+            dispose_engine()
+
+            size = os.path.getsize(archive) / (1024 * 1024)
+            print(f"{count} mesaj ({size:.1f} MB arşiv):")
+            print(f"  dışa aktarma: {export_time:.2f} sn, {exported['messages'] / export_time:.0f} mesaj/sn, "
+                  f"en yüksek bellek {export_peak:.1f} MB")
+            print(f"  içe aktarma:  {import_time:.2f} sn, {imported['messages'] / import_time:.0f} mesaj/sn, "
+                  f"en yüksek bellek {import_peak:.1f} MB")
+            failed = failed or imported["messages"] != exported["messages"] or imported["rejected"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats, isolated = check_foreign_archive(tmp)
+    print(f"Başka kullanıcının arşivi: {stats}, sahibin konuşması {'korundu' if isolated else 'DEĞİŞTİ'}")
+    if failed or not isolated:
+        print("BAŞARISIZ")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, Message, init_engine, create_db, dispose_engine, get_db_session
+from database.fastpath import message_row
+from database.writer import WriteBehindQueue, start_write_queue, stop_write_queue
+
+def send_synchronous(conversation_id, i):
+    session = get_db_session()
+    message = Message(message_id=Message.generate_message_id(), conversation_id=conversation_id, message_content=f"Mesaj {i}")
+    session.add(message)
+    session.commit()
+    db_message = session.query(Message).filter_by(message_id=message.message_id).first()
+    db_message.response_message = f"Yanıt {i}"
+    session.commit()
+    session.close()
+
+def run(count, send, finish=None):
+    stalls = []
+    start = time.perf_counter()
+    for i in range(count):
+        t = time.perf_counter()
+        send(i)
+        stalls.append((time.perf_counter() - t) * 1000)
+    if finish:
+        finish()
+    elapsed = time.perf_counter() - start
+    stalls.sort()
+    return count / elapsed, stalls[len(stalls) // 2], stalls[-1], sum(stalls)
+
+def check_poisoned_batch(writer, conversation_id):
+    # Aynı toplu commit içinde hatalı bir satır (tekrarlanan anahtar) yalnızca kendisini başarısız kılmalı
+    existing, _ = writer.create_message(conversation_id, "Var olan mesaj")
+    writer.flush(10)
+    futures = []
+    for i in range(10):
+        if i == 5:
+            futures.append(writer.submit("insert_message", dict(message_row(conversation_id, "Tekrar"), message_id=existing.message_id)))
+        else:
+            futures.append(writer.create_message(conversation_id, f"Toplu {i}")[1])
+    writer.flush(10)
+    failed = [i for i, future in enumerate(futures) if future.exception(10) is not None]
+    print(f"Hatalı satır içeren toplu yazım: {len(futures) - len(failed)} kaydedildi, başarısız {failed}")
+    return failed == [5]
+
+def check_stop(conversation_id):
+    # Durdurma işaretinden hemen sonra kuyruğa giren bir işlem yazma iş parçacığını açık bırakmamalı
+    writer = WriteBehindQueue(64, 0.5)
+    writer.start()
+    writer.create_message(conversation_id, "Önce")
+    writer.flush(10)
+    writer.stop(timeout=0)
+    writer.create_message(conversation_id, "Durdurmadan sonra")
+    writer.join(3)
+    print(f"Durdurma sonrası yazma iş parçacığı: {'açık kaldı' if writer.is_alive() else 'kapandı'}")
+    return not writer.is_alive()
+
+def main():
+    parser = argparse.ArgumentParser(description="Eşzamanlı commit ile arkadan yazma kuyruğunun karşılaştırması")
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        init_engine(db_file=os.path.join(tmp, "bench.db"))
+        create_db()
+        db = Database()
+        conversation_id = db.create_conversation("Bench", db.get_user("admin").user_id).conversation_id
+        db.session.close()
+
+        results = {"eşzamanlı commit": run(args.count, lambda i: send_synchronous(conversation_id, i))}
+
+        writer = start_write_queue(db_settings={})
+        futures = []
+        def send_queued(i):
+            message, _ = writer.create_message(conversation_id, f"Mesaj {i}")
+            futures.append(writer.update_response(message.message_id, f"Yanıt {i}"))
+        def finish():
+            for future in futures:
+                future.result()
+        results["arkadan yazma kuyruğu"] = run(args.count, send_queued, finish)
+        print(f"Toplu commit sayısı: {writer.batches_committed}, işlem: {writer.operations_committed}")
+        isolated = check_poisoned_batch(writer, conversation_id)
+        stop_write_queue()
+        stopped = check_stop(conversation_id)
+        dispose_engine()
+
+    for name, (rate, p50, worst, total) in results.items():
+        print(f"{name}: {rate:.1f} mesaj/sn, GUI iş parçacığı beklemesi p50 {p50:.3f} ms, "
+              f"max {worst:.2f} ms, toplam {total:.0f} ms")
+    if not isolated:
+        print("BAŞARISIZ: hatalı satır toplu yazımdaki diğer işlemleri de düşürdü")
+        sys.exit(1)
+    if not stopped:
+        print("BAŞARISIZ: yazma iş parçacığı durdurma işaretinden sonra kapanmadı")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
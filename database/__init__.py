@@ -1,15 +1,23 @@
-import os
 import uuid
 import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, create_engine, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Integer, Index, and_, or_
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, synonym
+
+from database.engine import init_engine, get_engine, get_read_engine, create_session, get_db_session, remove_session, dispose_engine, load_database_settings
+from database.keys import UUIDKey, set_key_format, DEFAULT_KEY_FORMAT
+from database.codec import CompressedText, lazy_text, setup_compression
+from database.migrations import run_migrations, read_key_format, write_key_format, SCHEMA_VERSION
+from database.search import search, start_search_backfill, stop_search_backfill
+from database.cache import user_cache, conversation_cache, configure_cache, clear_caches, cache_metrics
+from database.response_cache import response_cache, cache_key
+from database.tokens import count_tokens, message_tokens
 
 Base = declarative_base()
 
 class User(Base):
     __tablename__ = 'user'
-    user_id = Column(String(36), primary_key=True)
+    user_id = Column(UUIDKey, primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
     password = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False)
@@ -20,47 +28,111 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.datetime.now)
     conversations = relationship("Conversation", back_populates="user")
     @staticmethod
+    def hash_password(password):
+        return password
+    @staticmethod
     def generate_user_id():
         return str(uuid.uuid4())
 
 class Conversation(Base):
     __tablename__ = 'conversation'
-    conversation_id = Column(String(36), primary_key=True)
-    user_id = Column(String(36), ForeignKey('user.user_id'))
+    __table_args__ = (
+        Index('ix_conversation_user_archived_created', 'user_id', 'is_archived', 'created_at'),
+        Index('ix_conversation_created_at', 'created_at'),
+    )
+    conversation_id = Column(UUIDKey, primary_key=True)
+    user_id = Column(UUIDKey, ForeignKey('user.user_id'))
     name = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.now)
     is_archived = Column(Boolean, default=False)
     user = relationship("User", back_populates="conversations")
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
+    stats = relationship("ConversationStats", uselist=False, lazy="joined", viewonly=True)
     @staticmethod
     def generate_conversation_id():
         return str(uuid.uuid4())
 
 class Message(Base):
     __tablename__ = 'message'
-    message_id = Column(String(36), primary_key=True)
-    conversation_id = Column(String(36), ForeignKey('conversation.conversation_id'))
-    message_content = Column(Text, nullable=False)
-    response_message = Column(Text)
+    __table_args__ = (
+        Index('ix_message_conversation_date_id', 'conversation_id', 'message_date', 'message_id'),
+    )
+    message_id = Column(UUIDKey, primary_key=True)
+    conversation_id = Column(UUIDKey, ForeignKey('conversation.conversation_id'))
+    _message_content = Column('message_content', CompressedText, nullable=False)
+    _response_message = Column('response_message', CompressedText)
+    message_content = synonym('_message_content', descriptor=lazy_text('_message_content'))
+    response_message = synonym('_response_message', descriptor=lazy_text('_response_message'))
     message_date = Column(DateTime, default=datetime.datetime.now)
     sender = Column(String(10), default="user")
+    content_tokens = Column(Integer)
+    response_tokens = Column(Integer)
     conversation = relationship("Conversation", back_populates="messages")
     @staticmethod
     def generate_message_id():
         return str(uuid.uuid4())
 
+class ConversationStats(Base):
+    __tablename__ = 'conversation_stats'
+    conversation_id = Column(UUIDKey, ForeignKey('conversation.conversation_id'), primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+    last_message_at = Column(DateTime)
+    last_snippet = Column(Text)
+    total_characters = Column(Integer, nullable=False, default=0)
+
+class ConversationSummary(Base):
+    __tablename__ = 'conversation_summary'
+    conversation_id = Column(UUIDKey, ForeignKey('conversation.conversation_id'), primary_key=True)
+    summary = Column(Text, nullable=False, default="")
+    summary_tokens = Column(Integer, nullable=False, default=0)
+    covered_date = Column(DateTime)
+    covered_id = Column(UUIDKey)
+    updated_at = Column(DateTime, default=datetime.datetime.now)
+
+class Setting(Base):
+    __tablename__ = 'settings'
+    setting_id = Column(Integer, primary_key=True, autoincrement=True)
+    setting_name = Column(String, nullable=False)
+    setting_sub = Column(String)
+
+MESSAGE_PAGE_SIZE = 50
+
+def fetch_messages_page(session, conversation_id, before=None, limit=MESSAGE_PAGE_SIZE):
+    query = session.query(Message).filter(Message.conversation_id == conversation_id)
+    if before is not None:
+        before_date, before_id = before
+        query = query.filter(or_(
+            Message.message_date < before_date,
+            and_(Message.message_date == before_date, Message.message_id < before_id)
+        ))
+    page = query.order_by(Message.message_date.desc(), Message.message_id.desc()).limit(limit).all()
+    page.reverse()
+    return page
+
+def page_cursor(page):
+    if not page:
+        return None
+    return (page[0].message_date, page[0].message_id)
+
+def find_user(session, login):
+    user = user_cache.get(login, "username", "email")
+    if user is not None:
+        return user
+    return user_cache.load(
+        lambda: session.query(User).filter((User.email == login) | (User.username == login)).first()
+    )
+
 class Database:
     def __init__(self):
-        db_dir = 'database'
-        if not os.path.exists(db_dir):
-            os.makedirs(db_dir)
-        db_file = os.path.join(db_dir, 'dinamik_chat.db')
-        self.engine = create_engine(f'sqlite:///{db_file}')
-        Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        self.engine = get_engine()
+        self.session = create_session()
     def get_user(self, username):
-        return self.session.query(User).filter_by(username=username).first()
+        user = user_cache.get(username, "username")
+        if user is not None:
+            return user
+        return user_cache.load(lambda: self.session.query(User).filter_by(username=username).first())
+    def get_user_by_id(self, user_id):
+        return user_cache.get(user_id) or user_cache.load(lambda: self.session.get(User, user_id))
     def create_user(self, username, password, email, first_name, last_name):
         user = User(
             user_id=User.generate_user_id(),
@@ -72,9 +144,18 @@ class Database:
         )
         self.session.add(user)
         self.session.commit()
-        return user
+        return user_cache.store(user)
+    def update_user(self, user):
+        self.session.merge(user)
+        self.session.commit()
+        user_cache.invalidate(user.user_id)
     def get_conversations(self):
-        return self.session.query(Conversation).order_by(Conversation.created_at.desc()).all()
+        return conversation_cache.load(
+            lambda: self.session.query(Conversation).populate_existing().order_by(Conversation.created_at.desc()).all()
+        )
+    def get_conversation(self, conversation_id):
+        return (conversation_cache.get(conversation_id)
+                or conversation_cache.load(lambda: self.session.get(Conversation, conversation_id)))
     def create_conversation(self, name, user_id):
         conversation = Conversation(
             conversation_id=Conversation.generate_conversation_id(),
@@ -83,40 +164,56 @@ class Database:
         )
         self.session.add(conversation)
         self.session.commit()
-        return conversation
+        return conversation_cache.store(conversation)
     def update_conversation(self, conversation):
+        self.session.merge(conversation)
         self.session.commit()
+        conversation_cache.invalidate(conversation.conversation_id)
     def delete_conversation(self, conversation):
-        self.session.delete(conversation)
+        self.session.delete(self.session.merge(conversation))
         self.session.commit()
+        conversation_cache.invalidate(conversation.conversation_id)
     def get_messages(self, conversation_id):
         return self.session.query(Message).filter_by(conversation_id=conversation_id).order_by(Message.message_date).all()
+    def get_messages_page(self, conversation_id, before=None, limit=MESSAGE_PAGE_SIZE):
+        return fetch_messages_page(self.session, conversation_id, before, limit)
     def create_message(self, conversation_id, content, sender="user", response=None):
         message = Message(
             message_id=Message.generate_message_id(),
             conversation_id=conversation_id,
             message_content=content,
             response_message=response,
-            sender=sender
+            sender=sender,
+            **message_tokens(content, response)
         )
         self.session.add(message)
         self.session.commit()
         return message
+    def search(self, query, user_id, limit=20, offset=0):
+        return search(self.session, query, user_id, limit, offset)
     def update_message(self, message):
+        message.content_tokens = count_tokens(message.message_content)
+        message.response_tokens = count_tokens(message.response_message) if message.response_message is not None else None
         self.session.commit()
     def delete_message(self, message):
         self.session.delete(message)
         self.session.commit()
 
-def create_db():
-    db_dir = 'database'
-    if not os.path.exists(db_dir):
-        os.makedirs(db_dir)
-    db_file = os.path.join(db_dir, 'dinamik_chat.db')
-    engine = create_engine(f'sqlite:///{db_file}')
+def create_db(key_format=None):
+    engine = init_engine()
+    db_settings = load_database_settings()
+    with engine.connect() as connection:
+        stored_format = read_key_format(connection)
+    if stored_format is None:
+        stored_format = key_format or db_settings.get('key_format', DEFAULT_KEY_FORMAT)
+    set_key_format(stored_format)
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    run_migrations(engine)
+    with engine.begin() as connection:
+        write_key_format(connection, stored_format)
+    setup_compression(engine, db_settings.get('compression'))
+    configure_cache(db_settings.get('cache'))
+    session = create_session()
     admin = session.query(User).filter_by(username="admin").first()
     if not admin:
         admin = User(
@@ -133,9 +230,3 @@ def create_db():
         session.commit()
     session.close()
     return engine
-
-def get_db_session():
-    db_file = os.path.join('database', 'dinamik_chat.db')
-    engine = create_engine(f'sqlite:///{db_file}')
-    Session = sessionmaker(bind=engine)
-    return Session() 
\ No newline at end of file
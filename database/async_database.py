@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from sqlalchemy import select, event, or_, and_
+
+from database import User, Conversation, Message, Database, user_cache, conversation_cache, MESSAGE_PAGE_SIZE
+from database.engine import get_engine, load_database_settings, apply_pragmas, DEFAULT_PRAGMAS
+from database.keys import register_key_functions
+from database.codec import register_codec_functions
+from database.terms import register_term_functions
+from database.fastpath import INSERT_MESSAGE, message_row
+
+try:
+    import aiosqlite
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+except ImportError:
+    aiosqlite = None
+
+class AsyncDatabase:
+    def __init__(self, db_file=None, db_settings=None):
+        self.db_file = db_file or get_engine().url.database
+        self.db_settings = db_settings if db_settings is not None else load_database_settings()
+        self.engine = None
+        self.session_factory = None
+        self._local = threading.local()
+        if aiosqlite is None:
+            print("aiosqlite paketi bulunamadı, asenkron sorgular iş parçacığı havuzunda çalışacak")
+
+    def _async_engine(self):
+        if self.engine is None:
+            pragmas = self.db_settings.get('pragmas', DEFAULT_PRAGMAS)
+            self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_file}")
+            sync_engine = self.engine.sync_engine
+            event.listen(sync_engine, "connect", lambda dbapi_connection, record: apply_pragmas(dbapi_connection, pragmas))
+            event.listen(sync_engine, "connect", lambda dbapi_connection, record: register_key_functions(dbapi_connection))
+            event.listen(sync_engine, "connect", lambda dbapi_connection, record: register_codec_functions(dbapi_connection))
+            event.listen(sync_engine, "connect", lambda dbapi_connection, record: register_term_functions(dbapi_connection))
+            self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        return self.engine
+
+    def _database(self):
+        # aiosqlite yoksa her havuz iş parçacığı kendi senkron Database nesnesini kullanır
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = Database()
+        return db
+
+    async def _in_thread(self, method, *args):
+        def call():
+            db = self._database()
+            try:
+                return getattr(db, method)(*args)
+            finally:
+                db.session.close()
+        return await asyncio.to_thread(call)
+
+    async def _scalars(self, statement):
+        self._async_engine()
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            return result.scalars().all()
+
+    async def get_user(self, username):
+        if aiosqlite is None:
+            return await self._in_thread("get_user", username)
+        user = user_cache.get(username, "username")
+        if user is not None:
+            return user
+        users = await self._scalars(select(User).filter_by(username=username).limit(1))
+        return user_cache.load(lambda: users[0] if users else None)
+
+    async def get_conversations(self):
+        if aiosqlite is None:
+            return await self._in_thread("get_conversations")
+        conversations = await self._scalars(select(Conversation).order_by(Conversation.created_at.desc()))
+        return conversation_cache.load(lambda: list(conversations))
+
+    async def get_messages(self, conversation_id):
+        if aiosqlite is None:
+            return await self._in_thread("get_messages", conversation_id)
+        return await self._scalars(
+            select(Message).filter_by(conversation_id=conversation_id).order_by(Message.message_date)
+        )
+
+    async def get_messages_page(self, conversation_id, before=None, limit=MESSAGE_PAGE_SIZE):
+        if aiosqlite is None:
+            return await self._in_thread("get_messages_page", conversation_id, before, limit)
+        statement = select(Message).filter(Message.conversation_id == conversation_id)
+        if before is not None:
+            before_date, before_id = before
+            statement = statement.filter(or_(
+                Message.message_date < before_date,
+                and_(Message.message_date == before_date, Message.message_id < before_id)
+            ))
+        page = await self._scalars(statement.order_by(Message.message_date.desc(), Message.message_id.desc()).limit(limit))
+        page.reverse()
+        return page
+
+    async def create_message(self, conversation_id, content, sender="user", response=None):
+        if aiosqlite is None:
+            return await self._in_thread("create_message", conversation_id, content, sender, response)
+        row = message_row(conversation_id, content, sender, response)
+        async with self._async_engine().begin() as connection:
+            await connection.execute(INSERT_MESSAGE, [row])
+        return Message(**row)
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
@@ -0,0 +1,148 @@
+import os
+import glob
+import gzip
+import time
+import shutil
+import sqlite3
+import datetime
+import threading
+
+from database.engine import get_engine, load_database_settings
+
+DEFAULT_BACKUP = {
+    "enabled": False,
+    "interval_days": 7,
+    "max_backups": 5,
+    "path": "backups/",
+    "compress": False,
+    "pages_per_step": 256,
+    "step_sleep_ms": 10,
+    "check_interval_minutes": 60
+}
+
+BACKUP_PREFIX = "dinamik_chat-"
+
+def backup_files(path):
+    files = glob.glob(os.path.join(path, f"{BACKUP_PREFIX}*.db")) + glob.glob(os.path.join(path, f"{BACKUP_PREFIX}*.db.gz"))
+    return sorted(files, key=os.path.getmtime)
+
+def last_backup_time(path):
+    files = backup_files(path)
+    if not files:
+        return None
+    return datetime.datetime.fromtimestamp(os.path.getmtime(files[-1]))
+
+def verify_backup(db_file):
+    connection = sqlite3.connect(db_file)
+    try:
+        return connection.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    finally:
+        connection.close()
+
+def compress_backup(db_file):
+    target = db_file + ".gz"
+    with open(db_file, "rb") as source, gzip.open(target, "wb", compresslevel=6) as compressed:
+        shutil.copyfileobj(source, compressed, 1024 * 1024)
+    os.remove(db_file)
+    return target
+
+def rotate_backups(path, max_backups):
+    files = backup_files(path)
+    for old_file in files[:max(0, len(files) - max_backups)]:
+        os.remove(old_file)
+
+def run_backup(source_file, config, stop_event=None):
+    os.makedirs(config['path'], exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    target_file = os.path.join(config['path'], f"{BACKUP_PREFIX}{stamp}.db")
+    partial_file = target_file + ".partial"
+    step_sleep = config['step_sleep_ms'] / 1000
+    stats = {"steps": 0, "pages": 0}
+
+    def progress(status, remaining, total):
+        if stop_event is not None and stop_event.is_set():
+            raise InterruptedError("Yedekleme durduruldu")
+        stats["steps"] += 1
+        stats["pages"] = total
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    start = time.perf_counter()
+    source = sqlite3.connect(source_file, timeout=30, isolation_level=None)
+    target = sqlite3.connect(partial_file)
+    try:
+        # WAL'da açık bir okuma işlemi yedeği tek bir anlık görüntüye sabitler;
+        # aksi halde her yazma commit'i yedeği baştan başlatır.
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(target, pages=config['pages_per_step'], progress=progress)
+    except BaseException:
+        target.close()
+        os.remove(partial_file)
+        raise
+    finally:
+        target.close()
+        source.close()
+    stats["seconds"] = time.perf_counter() - start
+
+    if not verify_backup(partial_file):
+        os.remove(partial_file)
+        raise RuntimeError("Yedek bütünlük denetiminden geçemedi")
+
+    os.replace(partial_file, target_file)
+    if config['compress']:
+        target_file = compress_backup(target_file)
+    rotate_backups(config['path'], config['max_backups'])
+    stats["file"] = target_file
+    stats["bytes"] = os.path.getsize(target_file)
+    return stats
+
+class BackupScheduler(threading.Thread):
+    def __init__(self, source_file, config):
+        super().__init__(name="db-backup", daemon=True)
+        self.source_file = source_file
+        self.config = config
+        self.stop_event = threading.Event()
+        self.last_stats = None
+
+    def is_due(self):
+        last = last_backup_time(self.config['path'])
+        if last is None:
+            return True
+        return datetime.datetime.now() - last >= datetime.timedelta(days=self.config['interval_days'])
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if self.is_due():
+                try:
+                    self.last_stats = run_backup(self.source_file, self.config, self.stop_event)
+                    print(f"Veritabanı yedeği alındı: {self.last_stats['file']}")
+                except Exception as e:
+                    print(f"Veritabanı yedeği alınamadı: {e}")
+            self.stop_event.wait(self.config['check_interval_minutes'] * 60)
+
+    def stop(self):
+        self.stop_event.set()
+
+backup_scheduler = None
+
+def start_backup_scheduler(db_settings=None):
+    global backup_scheduler
+    if backup_scheduler is not None:
+        return backup_scheduler
+    if db_settings is None:
+        db_settings = load_database_settings()
+    config = dict(DEFAULT_BACKUP, **db_settings.get('backup', {}))
+    if not config['enabled']:
+        return None
+    backup_scheduler = BackupScheduler(get_engine().url.database, config)
+    backup_scheduler.start()
+    return backup_scheduler
+
+def stop_backup_scheduler():
+    global backup_scheduler
+    if backup_scheduler is None:
+        return
+    backup_scheduler.stop()
+    backup_scheduler.join(timeout=5)
+    backup_scheduler = None
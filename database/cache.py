@@ -0,0 +1,152 @@
+import threading
+import collections
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+DEFAULT_CACHE = {
+    "enabled": True,
+    "max_users": 256,
+    "max_conversations": 1024
+}
+
+def detached_copy(obj, target=None):
+    # Oturum kapandıktan sonra tembel yükleme gerektirmesin diye sütunlar ve yüklenmiş tekil ilişkiler kopyalanır
+    state = inspect(obj)
+    mapper = state.mapper
+    for attr in mapper.column_attrs:
+        getattr(obj, attr.key)
+    copy = target if target is not None else mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(copy, attr.key, state.dict[attr.key])
+    for relationship in mapper.relationships:
+        if relationship.uselist or relationship.key not in state.dict:
+            continue
+        value = state.dict[relationship.key]
+        set_committed_value(copy, relationship.key, detached_copy(value) if value is not None else None)
+    if target is None:
+        make_transient_to_detached(copy)
+    return copy
+
+class EntityCache:
+    def __init__(self, key, indexes=(), max_size=256):
+        self.key = key
+        self.indexes = indexes
+        self.max_size = max_size
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self._index = {name: {} for name in indexes}
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def configure(self, max_size, enabled=True):
+        with self._lock:
+            self.max_size = max_size
+            self.enabled = enabled
+            self._evict()
+        if not enabled:
+            self.clear()
+
+    def get(self, value, *fields):
+        with self._lock:
+            key = value
+            for field in fields:
+                key = self._index[field].get(value)
+                if key is not None:
+                    break
+            obj = self._items.get(key) if self.enabled and key is not None else None
+            if obj is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return obj
+
+    def load(self, loader):
+        with self._lock:
+            self.queries += 1
+        result = loader()
+        if result is None:
+            return None
+        if isinstance(result, list):
+            return [self.store(obj) for obj in result]
+        return self.store(result)
+
+    def store(self, obj):
+        key = getattr(obj, self.key)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._unindex(cached)
+                detached_copy(obj, cached)
+            else:
+                cached = detached_copy(obj)
+            if not self.enabled:
+                return cached
+            self._items[key] = cached
+            self._items.move_to_end(key)
+            for name in self.indexes:
+                self._index[name][getattr(cached, name)] = key
+            self._evict()
+            return cached
+
+    def invalidate(self, key):
+        with self._lock:
+            cached = self._items.pop(key, None)
+            if cached is not None:
+                self._unindex(cached)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._items)
+            self._items.clear()
+            for index in self._index.values():
+                index.clear()
+
+    def _unindex(self, cached):
+        for name in self.indexes:
+            self._index[name].pop(getattr(cached, name), None)
+
+    def _evict(self):
+        while len(self._items) > self.max_size:
+            _, cached = self._items.popitem(last=False)
+            self._unindex(cached)
+            self.evictions += 1
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "queries": self.queries,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def reset_metrics(self):
+        with self._lock:
+            self.hits = self.misses = self.queries = self.evictions = self.invalidations = 0
+
+user_cache = EntityCache("user_id", ("username", "email"), DEFAULT_CACHE['max_users'])
+conversation_cache = EntityCache("conversation_id", (), DEFAULT_CACHE['max_conversations'])
+
+def configure_cache(config=None):
+    config = dict(DEFAULT_CACHE, **(config or {}))
+    user_cache.configure(config['max_users'], config['enabled'])
+    conversation_cache.configure(config['max_conversations'], config['enabled'])
+
+def clear_caches():
+    user_cache.clear()
+    conversation_cache.clear()
+
+def cache_metrics():
+    return {"users": user_cache.metrics(), "conversations": conversation_cache.metrics()}
@@ -0,0 +1,181 @@
+import re
+import zlib
+import struct
+import collections
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_COMPRESSION = {
+    "enabled": False,
+    "codec": "zlib",
+    "threshold_bytes": 512,
+    "level": 6,
+    "dictionary": True,
+    "dictionary_size": 32768,
+    "dictionary_samples": 2000
+}
+
+CODEC_IDS = {"zlib": 1, "zstd": 2}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+HEADER = struct.Struct(">BH")
+MIN_DICTIONARY_SAMPLES = 50
+
+_config = dict(DEFAULT_COMPRESSION)
+_dictionaries = {}
+_active_dictionary = 0
+
+def compression_config():
+    return _config
+
+def configure_compression(config, dictionaries=None):
+    global _config, _active_dictionary
+    _config = dict(DEFAULT_COMPRESSION, **(config or {}))
+    if _config['codec'] == "zstd" and zstandard is None:
+        print("zstandard paketi bulunamadı, mesaj sıkıştırması zlib ile yapılacak")
+        _config['codec'] = "zlib"
+    _dictionaries.clear()
+    _active_dictionary = 0
+    for dictionary_id, codec, data in dictionaries or []:
+        _dictionaries[dictionary_id] = data
+        if codec == _config['codec'] and _config['dictionary']:
+            _active_dictionary = max(_active_dictionary, dictionary_id)
+
+def _compress(codec, data, dictionary, level):
+    if codec == "zstd":
+        compressor = zstandard.ZstdCompressor(
+            level=level, dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        )
+        return compressor.compress(data)
+    if dictionary:
+        compressor = zlib.compressobj(level, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level)
+    return compressor.compress(data) + compressor.flush()
+
+def _decompress(codec, payload, dictionary):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd ile sıkıştırılmış mesaj için zstandard paketi gerekli")
+        decompressor = zstandard.ZstdDecompressor(
+            dict_data=zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        )
+        return decompressor.decompress(payload)
+    if dictionary:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+    else:
+        decompressor = zlib.decompressobj()
+    return decompressor.decompress(payload) + decompressor.flush()
+
+def encode_text(value):
+    if not isinstance(value, str) or not _config['enabled']:
+        return value
+    data = value.encode("utf-8")
+    if len(data) < _config['threshold_bytes']:
+        return value
+    codec = _config['codec']
+    dictionary = _dictionaries.get(_active_dictionary)
+    compressed = HEADER.pack(CODEC_IDS[codec], _active_dictionary) + _compress(codec, data, dictionary, _config['level'])
+    if len(compressed) >= len(data):
+        return value
+    return compressed
+
+def decode_text(value):
+    if not isinstance(value, bytes):
+        return value
+    codec_id, dictionary_id = HEADER.unpack_from(value)
+    dictionary = _dictionaries.get(dictionary_id) if dictionary_id else None
+    if dictionary_id and dictionary is None:
+        raise RuntimeError(f"Sıkıştırma sözlüğü bulunamadı: {dictionary_id}")
+    return _decompress(CODEC_NAMES[codec_id], value[HEADER.size:], dictionary).decode("utf-8")
+
+def register_codec_functions(dbapi_connection):
+    dbapi_connection.create_function("message_text", 1, decode_text, deterministic=True)
+
+class CompressedText(TypeDecorator):
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return encode_text(value)
+
+    def process_result_value(self, value, dialect):
+        return value
+
+def lazy_text(attribute):
+    cache_key = f"{attribute}_decoded"
+
+    def get(self):
+        raw = getattr(self, attribute)
+        cached = self.__dict__.get(cache_key)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        text = decode_text(raw)
+        self.__dict__[cache_key] = (raw, text)
+        return text
+
+    def set(self, value):
+        setattr(self, attribute, value)
+
+    return property(get, set)
+
+def build_zlib_dictionary(samples, size):
+    phrases = collections.Counter()
+    for sample in samples:
+        words = re.findall(r"\S+\s*", sample)
+        for n in (2, 3, 4, 6):
+            for i in range(0, len(words) - n + 1, n):
+                phrases["".join(words[i:i + n])] += 1
+    scored = sorted(
+        ((count * len(phrase.encode("utf-8")), phrase) for phrase, count in phrases.items() if count > 1),
+        reverse=True
+    )
+    chosen = []
+    total = 0
+    for _, phrase in scored:
+        data = phrase.encode("utf-8")
+        if total + len(data) > size:
+            continue
+        chosen.append(data)
+        total += len(data)
+    # zlib en yakın baytları en ucuza kodlar, en değerli ifadeler sona gelir
+    return b"".join(reversed(chosen))
+
+def train_dictionary(samples, codec, size):
+    if codec == "zstd":
+        return zstandard.train_dictionary(size, [sample.encode("utf-8") for sample in samples]).as_bytes()
+    return build_zlib_dictionary(samples, size)
+
+def load_dictionaries(connection):
+    return connection.exec_driver_sql(
+        "SELECT dictionary_id, codec, data FROM compression_dictionary ORDER BY dictionary_id"
+    ).fetchall()
+
+def train_stored_dictionary(engine):
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT message_text(response_message) FROM message WHERE response_message IS NOT NULL "
+            "ORDER BY rowid DESC LIMIT ?", (_config['dictionary_samples'],)
+        ).scalars().all()
+    samples = [row for row in rows if len(row) >= _config['threshold_bytes'] // 2]
+    if len(samples) < MIN_DICTIONARY_SAMPLES:
+        return None
+    data = train_dictionary(samples, _config['codec'], _config['dictionary_size'])
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO compression_dictionary(codec, data) VALUES (?, ?)", (_config['codec'], data)
+        )
+        dictionaries = load_dictionaries(connection)
+    configure_compression(_config, dictionaries)
+    return _active_dictionary
+
+def setup_compression(engine, config):
+    with engine.connect() as connection:
+        dictionaries = load_dictionaries(connection)
+    configure_compression(config, dictionaries)
+    if _config['enabled'] and _config['dictionary'] and not _active_dictionary:
+        train_stored_dictionary(engine)
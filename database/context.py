@@ -0,0 +1,271 @@
+import re
+import time
+import datetime
+import threading
+import collections
+
+from database import ConversationSummary, create_session, fetch_messages_page, page_cursor
+from database.tokens import count_tokens
+from database.writer import queue_summary
+
+DEFAULT_CONTEXT = {
+    "max_tokens": 2000,
+    "summary_tokens": 300,
+    "refresh_tokens": 400,
+    "line_characters": 160,
+    "message_overhead": 4,
+    "max_conversations": 64,
+    "page_size": 50
+}
+
+SUMMARY_HEADER = "Önceki konuşmanın özeti:"
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s")
+
+def first_sentence(text, limit):
+    text = " ".join((text or "").split())
+    sentence = SENTENCE_END.split(text, 1)[0]
+    if len(sentence) > limit:
+        sentence = sentence[:limit - 1].rstrip() + "…"
+    return sentence
+
+class Turn:
+    __slots__ = ("cursor", "content", "response", "tokens")
+
+    def __init__(self, message, overhead, response=None):
+        self.cursor = (message.message_date, message.message_id)
+        self.content = message.message_content
+        if response is not None:
+            self.response = response
+            response_tokens = count_tokens(response)
+        else:
+            self.response = message.response_message
+            response_tokens = message.response_tokens
+        # Göç öncesi satırlarda sayı yoktur, yalnızca o satırlar için yeniden sayılır
+        content_tokens = message.content_tokens
+        if content_tokens is None:
+            content_tokens = count_tokens(self.content)
+        self.tokens = content_tokens + overhead
+        if self.response is not None:
+            if response_tokens is None:
+                response_tokens = count_tokens(self.response)
+            self.tokens += response_tokens + overhead
+
+    def messages(self):
+        messages = [{"role": "user", "content": self.content}]
+        if self.response is not None:
+            messages.append({"role": "assistant", "content": self.response})
+        return messages
+
+class ConversationContext:
+    def __init__(self):
+        self.turns = collections.deque()
+        self.tokens = 0
+        self.lines = collections.deque()
+        self.summary = ""
+        self.summary_tokens = 0
+        self.covered = None
+        self.stale = []
+        self.stale_tokens = 0
+
+class ContextBuilder:
+    def __init__(self, config=None):
+        self._lock = threading.Lock()
+        self._contexts = collections.OrderedDict()
+        self.configure(config)
+        self.reset_metrics()
+
+    def configure(self, config=None):
+        config = dict(DEFAULT_CONTEXT, **(config or {}))
+        with self._lock:
+            self.max_tokens = config['max_tokens']
+            self.summary_budget = config['summary_tokens']
+            self.refresh_tokens = config['refresh_tokens']
+            self.line_characters = config['line_characters']
+            self.overhead = config['message_overhead']
+            self.max_conversations = config['max_conversations']
+            self.page_size = config['page_size']
+            # Pencere, özet için ayrılan pay dışında kalan bütçeyi kullanır
+            self.window_tokens = max(0, self.max_tokens - self.summary_budget)
+            self.header_tokens = count_tokens(SUMMARY_HEADER) + self.overhead
+            self._contexts.clear()
+
+    def reset_metrics(self):
+        with self._lock:
+            self.builds = 0
+            self.cold_loads = 0
+            self.refreshes = 0
+            self.evicted_turns = 0
+            self.build_seconds = 0.0
+            self.load_seconds = 0.0
+            self.history_tokens = 0
+
+    def _summary_line(self, turn):
+        half = self.line_characters // 2
+        line = f"- {first_sentence(turn.content, half)}"
+        if turn.response:
+            line += f" → {first_sentence(turn.response, half)}"
+        return line
+
+    def _append(self, context, turn):
+        context.turns.append(turn)
+        context.tokens += turn.tokens
+        while context.tokens > self.window_tokens and context.turns:
+            old = context.turns.popleft()
+            context.tokens -= old.tokens
+            context.stale.append(old)
+            context.stale_tokens += old.tokens
+            self.evicted_turns += 1
+
+    def _refresh(self, context):
+        # Özet yalnızca pencereden düşen metin eşiği aşınca güncellenir; en yeni satırlar bütçede kalır
+        if context.stale_tokens < self.refresh_tokens:
+            return None
+        for turn in context.stale:
+            line = self._summary_line(turn)
+            tokens = count_tokens(line)
+            context.lines.append((line, tokens))
+            context.summary_tokens += tokens
+        while context.summary_tokens > self.summary_budget and context.lines:
+            _, tokens = context.lines.popleft()
+            context.summary_tokens -= tokens
+        context.covered = context.stale[-1].cursor
+        context.summary = "\n".join(line for line, _ in context.lines)
+        context.stale = []
+        context.stale_tokens = 0
+        self.refreshes += 1
+        return {
+            "summary": context.summary,
+            "summary_tokens": context.summary_tokens,
+            "covered_date": context.covered[0],
+            "covered_id": context.covered[1],
+            "updated_at": datetime.datetime.now()
+        }
+
+    def _save_summary(self, conversation_id, summary):
+        # Özet yazma kuyruğuna bırakılır; yazılamazsa bellekteki bağlam atılır ve sonraki istek diskten yeniden kurar
+        def on_saved(future):
+            if future.exception() is not None:
+                print(f"Konuşma özeti kaydedilemedi: {future.exception()}")
+                self.forget(conversation_id)
+        queue_summary(conversation_id, summary).add_done_callback(on_saved)
+
+    def _load(self, conversation_id, exclude=None):
+        # Sayfalar yeniden eskiye okunur; pencere ve özet bütçesi dolunca durulur, konuşmanın tamamı okunmaz
+        context = ConversationContext()
+        newest, overflow = [], []
+        window_tokens = overflow_line_tokens = 0
+        session = create_session()
+        try:
+            row = session.get(ConversationSummary, conversation_id)
+            if row is not None and row.covered_date is not None:
+                for line in row.summary.splitlines():
+                    tokens = count_tokens(line)
+                    context.lines.append((line, tokens))
+                    context.summary_tokens += tokens
+                context.summary = row.summary
+                context.covered = (row.covered_date, row.covered_id)
+            before = None
+            done = False
+            while not done:
+                page = fetch_messages_page(session, conversation_id, before, self.page_size)
+                for message in reversed(page):
+                    if message.message_id == exclude:
+                        continue
+                    turn = Turn(message, self.overhead)
+                    if context.covered is not None and turn.cursor <= context.covered:
+                        done = True
+                        break
+                    if not overflow and window_tokens + turn.tokens <= self.window_tokens:
+                        newest.append(turn)
+                        window_tokens += turn.tokens
+                        continue
+                    overflow.append(turn)
+                    overflow_line_tokens += count_tokens(self._summary_line(turn))
+                    if overflow_line_tokens >= self.summary_budget:
+                        done = True
+                        break
+                if len(page) < self.page_size:
+                    break
+                before = page_cursor(page)
+        finally:
+            session.close()
+        newest.reverse()
+        overflow.reverse()
+        context.turns.extend(newest)
+        context.tokens = window_tokens
+        context.stale = overflow
+        context.stale_tokens = sum(turn.tokens for turn in overflow)
+        return context
+
+    def _context(self, conversation_id, exclude=None):
+        with self._lock:
+            context = self._contexts.get(conversation_id)
+            if context is not None:
+                self._contexts.move_to_end(conversation_id)
+                return context, False
+        started = time.perf_counter()
+        context = self._load(conversation_id, exclude)
+        with self._lock:
+            self.cold_loads += 1
+            self.load_seconds += time.perf_counter() - started
+            self._contexts[conversation_id] = context
+            while len(self._contexts) > self.max_conversations:
+                self._contexts.popitem(last=False)
+            summary = self._refresh(context)
+        if summary is not None:
+            self._save_summary(conversation_id, summary)
+        return context, True
+
+    def build(self, conversation_id, message, system_prompt=None, exclude=None):
+        context, _ = self._context(conversation_id, exclude)
+        started = time.perf_counter()
+        budget = self.max_tokens - count_tokens(system_prompt) - count_tokens(message) - 2 * self.overhead
+        history = []
+        with self._lock:
+            if context.summary and context.summary_tokens + self.header_tokens <= budget:
+                budget -= context.summary_tokens + self.header_tokens
+                history.append({"role": "system", "content": f"{SUMMARY_HEADER}\n{context.summary}"})
+            selected = []
+            for turn in reversed(context.turns):
+                if turn.tokens > budget:
+                    break
+                budget -= turn.tokens
+                selected.append(turn)
+            for turn in reversed(selected):
+                history.extend(turn.messages())
+            self.builds += 1
+            self.build_seconds += time.perf_counter() - started
+            self.history_tokens += self.max_tokens - budget
+        return history
+
+    def record(self, conversation_id, message, response):
+        with self._lock:
+            context = self._contexts.get(conversation_id)
+            if context is None:
+                return
+            turn = Turn(message, self.overhead, response)
+            if context.turns and turn.cursor <= context.turns[-1].cursor:
+                return
+            self._append(context, turn)
+            summary = self._refresh(context)
+        if summary is not None:
+            self._save_summary(conversation_id, summary)
+
+    def forget(self, conversation_id):
+        with self._lock:
+            self._contexts.pop(conversation_id, None)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "conversations": len(self._contexts),
+                "builds": self.builds,
+                "cold_loads": self.cold_loads,
+                "summary_refreshes": self.refreshes,
+                "evicted_turns": self.evicted_turns,
+                "avg_build_ms": self.build_seconds / self.builds * 1000 if self.builds else 0.0,
+                "avg_load_ms": self.load_seconds / self.cold_loads * 1000 if self.cold_loads else 0.0,
+                "avg_prompt_tokens": self.history_tokens / self.builds if self.builds else 0.0
+            }
+
+context_builder = ContextBuilder()
@@ -0,0 +1,166 @@
+import os
+import time
+import sqlite3
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+
+from database.keys import register_key_functions
+from database.codec import register_codec_functions
+from database.terms import register_term_functions
+from utils.config_utils import config
+
+DB_DIR = 'database'
+DEFAULT_DB_NAME = 'dinamik_chat.db'
+DEFAULT_CONNECTION = {
+    "pool_size": 10,
+    "read_pool_size": 4,
+    "timeout": 30,
+    "retry_attempts": 3
+}
+DEFAULT_PRAGMAS = {
+    "auto_vacuum": "incremental",
+    "busy_timeout": 5000,
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -16000,
+    "mmap_size": 268435456,
+    "temp_store": "memory"
+}
+ALLOWED_PRAGMAS = {"busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store",
+                   "foreign_keys", "wal_autocheckpoint", "auto_vacuum"}
+
+_lock = threading.Lock()
+_engine = None
+_read_engine = None
+_session_factory = None
+_scoped_sessions = None
+
+def load_database_settings():
+    return config.get('database')
+
+def _connection_creator(db_file, timeout, retry_attempts):
+    def connect():
+        attempt = 0
+        while True:
+            try:
+                return sqlite3.connect(db_file, timeout=timeout, check_same_thread=False)
+            except sqlite3.OperationalError:
+                attempt += 1
+                if attempt >= retry_attempts:
+                    raise
+                time.sleep(0.1 * (2 ** attempt))
+    return connect
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if name not in ALLOWED_PRAGMAS:
+                print(f"Bilinmeyen pragma atlandı: {name}")
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+class RoutingSession(Session):
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.writer_active = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        # Yazma başlamış bir işlem kendi değişikliklerini görebilmek için yazıcıda okumaya devam eder
+        if (_read_engine is not None and not self._flushing and getattr(clause, "is_select", False)
+                and not self.writer_active):
+            return _read_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+@event.listens_for(RoutingSession, "after_begin")
+def _writer_begun(session, transaction, connection):
+    if connection.engine is _engine:
+        session.writer_active = True
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _transaction_ended(session, transaction):
+    if transaction.parent is None:
+        session.writer_active = False
+
+def _create_engine(db_file, pragmas, pool_size, timeout, retry_attempts, read_only=False):
+    engine = create_engine(
+        f'sqlite:///{db_file}',
+        creator=_connection_creator(db_file, timeout, retry_attempts),
+        pool_size=pool_size,
+        max_overflow=0 if pool_size == 1 else pool_size,
+        pool_timeout=timeout
+    )
+    event.listen(engine, "connect", lambda dbapi_connection, record: apply_pragmas(dbapi_connection, pragmas))
+    event.listen(engine, "connect", lambda dbapi_connection, record: register_key_functions(dbapi_connection))
+    event.listen(engine, "connect", lambda dbapi_connection, record: register_codec_functions(dbapi_connection))
+    event.listen(engine, "connect", lambda dbapi_connection, record: register_term_functions(dbapi_connection))
+    if read_only:
+        event.listen(engine, "connect", lambda dbapi_connection, record: dbapi_connection.execute("PRAGMA query_only=1"))
+    return engine
+
+def init_engine(db_settings=None, db_file=None):
+    global _engine, _read_engine, _session_factory, _scoped_sessions
+    with _lock:
+        if _engine is not None:
+            return _engine
+        if db_settings is None:
+            db_settings = load_database_settings()
+        if db_file is None:
+            if not os.path.exists(DB_DIR):
+                os.makedirs(DB_DIR)
+            db_file = os.path.join(DB_DIR, db_settings.get('name', DEFAULT_DB_NAME))
+        connection = dict(DEFAULT_CONNECTION, **db_settings.get('connection', {}))
+        timeout = connection['timeout']
+        retry_attempts = max(1, int(connection['retry_attempts']))
+        pragmas = db_settings.get('pragmas', DEFAULT_PRAGMAS)
+        if connection['read_pool_size'] > 0:
+            # Tüm yazmalar tek bağlantıdan sırayla geçer, WAL okuyucuları ayrı havuzdan okur
+            if db_settings.get('connection', {}).get('pool_size', 1) != 1:
+                print(f"database.connection.pool_size ({connection['pool_size']}) yok sayıldı: "
+                      f"read_pool_size > 0 iken yazıcı tek bağlantı kullanır")
+            _engine = _create_engine(db_file, pragmas, 1, timeout, retry_attempts)
+            _read_engine = _create_engine(db_file, pragmas, connection['read_pool_size'], timeout, retry_attempts,
+                                          read_only=True)
+        else:
+            _engine = _create_engine(db_file, pragmas, connection['pool_size'], timeout, retry_attempts)
+        _session_factory = sessionmaker(bind=_engine, class_=RoutingSession, expire_on_commit=False)
+        _scoped_sessions = scoped_session(_session_factory)
+        return _engine
+
+def get_engine():
+    if _engine is None:
+        return init_engine()
+    return _engine
+
+def get_read_engine():
+    get_engine()
+    return _read_engine or _engine
+
+def create_session():
+    get_engine()
+    return _session_factory()
+
+def get_db_session():
+    get_engine()
+    return _scoped_sessions()
+
+def remove_session():
+    if _scoped_sessions is not None:
+        _scoped_sessions.remove()
+
+def dispose_engine():
+    global _engine, _read_engine, _session_factory, _scoped_sessions
+    with _lock:
+        if _scoped_sessions is not None:
+            _scoped_sessions.remove()
+        if _read_engine is not None:
+            _read_engine.dispose()
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _read_engine = None
+        _session_factory = None
+        _scoped_sessions = None
@@ -0,0 +1,63 @@
+import datetime
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.sqlite import insert
+
+from database import Message, ConversationSummary
+from database.engine import get_engine
+from database.tokens import count_tokens, message_tokens
+
+message_table = Message.__table__
+
+# İfadeler bir kez kurulur, SQLAlchemy derlenmiş hallerini önbellekten tekrar kullanır
+INSERT_MESSAGE = message_table.insert()
+UPDATE_RESPONSE = message_table.update().where(message_table.c.message_id == bindparam("target_message_id"))
+UPSERT_SUMMARY = insert(ConversationSummary.__table__)
+UPSERT_SUMMARY = UPSERT_SUMMARY.on_conflict_do_update(
+    index_elements=["conversation_id"],
+    set_={name: UPSERT_SUMMARY.excluded[name]
+          for name in ("summary", "summary_tokens", "covered_date", "covered_id", "updated_at")}
+)
+
+def message_row(conversation_id, content, sender="user", response=None, message_id=None, message_date=None):
+    return {
+        "message_id": message_id or Message.generate_message_id(),
+        "conversation_id": conversation_id,
+        "message_content": content,
+        "response_message": response,
+        "message_date": message_date or datetime.datetime.now(),
+        "sender": sender,
+        **message_tokens(content, response)
+    }
+
+def response_values(message_id, response):
+    # Token sayısı yazma anında bir kez hesaplanır, bağlam kurulurken yeniden sayılmaz
+    return {"message_id": message_id, "response_message": response, "response_tokens": count_tokens(response)}
+
+def insert_messages(connection, rows):
+    if rows:
+        connection.execute(INSERT_MESSAGE, list(rows))
+
+def update_responses(connection, updates):
+    if updates:
+        connection.execute(UPDATE_RESPONSE, [
+            {"target_message_id": values["message_id"], "response_message": values["response_message"],
+             "response_tokens": values["response_tokens"]}
+            for values in updates
+        ])
+
+def upsert_summaries(connection, rows):
+    if rows:
+        connection.execute(UPSERT_SUMMARY, list(rows))
+
+def write_messages(rows=(), updates=(), engine=None):
+    with (engine or get_engine()).begin() as connection:
+        insert_messages(connection, rows)
+        update_responses(connection, updates)
+
+def create_message(conversation_id, content, sender="user", response=None):
+    row = message_row(conversation_id, content, sender, response)
+    write_messages(rows=[row])
+    return row
+
+def update_message_response(message_id, response):
+    write_messages(updates=[response_values(message_id, response)])
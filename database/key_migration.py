@@ -0,0 +1,168 @@
+import re
+import time
+import threading
+
+from database.engine import get_engine, load_database_settings
+from database.keys import get_key_format, set_key_format
+from database.migrations import write_key_format
+from database.search import SEARCH_SCHEMA
+from database.stats import STATS_TRIGGERS
+from database.summary import SUMMARY_SCHEMA
+
+KEY_TABLES = ["user", "conversation", "message", "conversation_stats", "conversation_summary"]
+# Arama dizinleri gölge tabloyla kopyalanamaz, anahtar sütunları yerinde dönüştürülür
+FTS_KEY_COLUMNS = {"message_fts": ["conversation_id"], "conversation_fts": ["conversation_id"]}
+KEY_COLUMN_TYPE = "VARCHAR(36)"
+COPY_CHUNK_SIZE = 5000
+
+def shadow_table(table):
+    return f"{table}_blob"
+
+def table_columns(connection, table):
+    rows = connection.exec_driver_sql(f"PRAGMA table_info('{table}')").fetchall()
+    return [(row[1], row[2].upper() == KEY_COLUMN_TYPE) for row in rows]
+
+def _converted(columns, prefix=""):
+    return ", ".join(f"uuid_blob({prefix}{name})" if is_key else f"{prefix}{name}" for name, is_key in columns)
+
+def prepare_key_migration(connection):
+    for table in KEY_TABLES:
+        shadow = shadow_table(table)
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {shadow}")
+        ddl = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).scalar()
+        ddl = re.sub(r'^CREATE TABLE\s+"?\w+"?', f"CREATE TABLE {shadow}", ddl)
+        connection.exec_driver_sql(ddl.replace(KEY_COLUMN_TYPE, "BLOB"))
+
+        columns = table_columns(connection, table)
+        names = ", ".join(name for name, _ in columns)
+        mirror = (f"INSERT OR REPLACE INTO {shadow}(rowid, {names}) "
+                  f"VALUES (new.rowid, {_converted(columns, 'new.')});")
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_insert AFTER INSERT ON {table} BEGIN {mirror} END"
+        )
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_update AFTER UPDATE ON {table} BEGIN {mirror} END"
+        )
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_delete AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {shadow} WHERE rowid = old.rowid; END"
+        )
+
+def copy_table(engine, table, chunk_size=COPY_CHUNK_SIZE, pause=0.0, stop_event=None):
+    shadow = shadow_table(table)
+    with engine.connect() as connection:
+        columns = table_columns(connection, table)
+        target = connection.exec_driver_sql(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").scalar()
+    names = ", ".join(name for name, _ in columns)
+    statement = (f"INSERT OR REPLACE INTO {shadow}(rowid, {names}) SELECT rowid, {_converted(columns)} "
+                 f"FROM {table} WHERE rowid > ? AND rowid <= ?")
+    last_rowid = 0
+    while last_rowid < target:
+        if stop_event is not None and stop_event.is_set():
+            return None
+        with engine.begin() as connection:
+            batch_end = connection.exec_driver_sql(
+                f"SELECT MAX(source_rowid) FROM (SELECT rowid AS source_rowid FROM {table} "
+                "WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?)",
+                (last_rowid, target, chunk_size)
+            ).scalar()
+            if batch_end is None:
+                break
+            connection.exec_driver_sql(statement, (last_rowid, batch_end))
+        last_rowid = batch_end
+        if pause:
+            time.sleep(pause)
+    return target
+
+def swap_key_tables(connection):
+    indexes = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN "
+        f"({', '.join('?' * len(KEY_TABLES))})", tuple(KEY_TABLES)
+    ).scalars().all()
+    high_water = {
+        table: connection.exec_driver_sql(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").scalar()
+        for table in KEY_TABLES
+    }
+    for table in reversed(KEY_TABLES):
+        connection.exec_driver_sql(f"DROP TABLE {table}")
+    for table in KEY_TABLES:
+        connection.exec_driver_sql(f"ALTER TABLE {shadow_table(table)} RENAME TO {table}")
+    for statement in indexes:
+        connection.exec_driver_sql(statement)
+    for statement in SEARCH_SCHEMA + STATS_TRIGGERS + SUMMARY_SCHEMA:
+        if statement.startswith("CREATE TRIGGER"):
+            connection.exec_driver_sql(statement)
+    for table, keys in FTS_KEY_COLUMNS.items():
+        high_water[table] = connection.exec_driver_sql(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").scalar()
+        _convert_keys(connection, table, keys)
+    write_key_format(connection, "blob")
+    return high_water
+
+def _convert_keys(connection, table, keys, after=0):
+    assignments = ", ".join(f"{name} = uuid_blob({name})" for name in keys)
+    condition = " OR ".join(f"typeof({name}) = 'text'" for name in keys)
+    connection.exec_driver_sql(f"UPDATE {table} SET {assignments} WHERE rowid > ? AND ({condition})", (after,))
+
+def convert_late_rows(engine, high_water, key_columns):
+    # Anahtar biçimi değişmeden önce bağlanmış bir yazma, yeni tabloya metin anahtar bırakabilir
+    with engine.begin() as connection:
+        for table, keys in key_columns.items():
+            _convert_keys(connection, table, keys, high_water[table])
+
+def migrate_keys(engine, chunk_size=COPY_CHUNK_SIZE, pause=0.0, stop_event=None):
+    with engine.begin() as connection:
+        prepare_key_migration(connection)
+    for table in KEY_TABLES:
+        if copy_table(engine, table, chunk_size, pause, stop_event) is None:
+            return False
+    with engine.begin() as connection:
+        key_columns = {
+            table: [name for name, is_key in table_columns(connection, table) if is_key] for table in KEY_TABLES
+        }
+        key_columns.update(FTS_KEY_COLUMNS)
+        high_water = swap_key_tables(connection)
+        set_key_format("blob")
+    convert_late_rows(engine, high_water, key_columns)
+    return True
+
+class KeyMigrationWorker(threading.Thread):
+    def __init__(self, engine, chunk_size=COPY_CHUNK_SIZE, pause=0.05):
+        super().__init__(name="key-migration", daemon=True)
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.stop_event = threading.Event()
+
+    def run(self):
+        try:
+            if migrate_keys(self.engine, self.chunk_size, self.pause, self.stop_event):
+                print("Veritabanı anahtarları 16 baytlık biçime dönüştürüldü")
+        except Exception as e:
+            print(f"Anahtar dönüşümü başarısız: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+
+key_migration_worker = None
+
+def start_key_migration(db_settings=None):
+    global key_migration_worker
+    if key_migration_worker is not None and key_migration_worker.is_alive():
+        return key_migration_worker
+    if db_settings is None:
+        db_settings = load_database_settings()
+    if db_settings.get('key_format', 'text') != "blob" or get_key_format() == "blob":
+        return None
+    key_migration_worker = KeyMigrationWorker(get_engine())
+    key_migration_worker.start()
+    return key_migration_worker
+
+def stop_key_migration():
+    global key_migration_worker
+    if key_migration_worker is None:
+        return
+    key_migration_worker.stop()
+    key_migration_worker.join(timeout=5)
+    key_migration_worker = None
@@ -0,0 +1,47 @@
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.compiler import compiles
+
+KEY_FORMATS = ("text", "blob")
+DEFAULT_KEY_FORMAT = "text"
+
+_key_format = DEFAULT_KEY_FORMAT
+
+def get_key_format():
+    return _key_format
+
+def set_key_format(key_format):
+    global _key_format
+    if key_format not in KEY_FORMATS:
+        raise ValueError(f"Bilinmeyen anahtar biçimi: {key_format}")
+    _key_format = key_format
+
+def uuid_to_blob(value):
+    if isinstance(value, str):
+        return bytes.fromhex(value.replace("-", ""))
+    return value
+
+def blob_to_uuid(value):
+    if isinstance(value, bytes):
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    return value
+
+def register_key_functions(dbapi_connection):
+    dbapi_connection.create_function("uuid_blob", 1, uuid_to_blob, deterministic=True)
+
+class UUIDKey(TypeDecorator):
+    impl = String(36)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if _key_format == "blob":
+            return uuid_to_blob(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return blob_to_uuid(value)
+
+@compiles(UUIDKey)
+def compile_uuid_key(type_, compiler, **kw):
+    return "BLOB" if _key_format == "blob" else "VARCHAR(36)"
@@ -0,0 +1,65 @@
+import time
+import threading
+from sqlalchemy import event
+
+from database.engine import get_engine, load_database_settings
+
+DEFAULT_MAINTENANCE = {
+    "checkpoint_interval_seconds": 300,
+    "idle_seconds": 30
+}
+
+class MaintenanceWorker(threading.Thread):
+    def __init__(self, engine, interval, idle_seconds):
+        super().__init__(name="db-maintenance", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.last_activity = time.monotonic()
+        self.stop_event = threading.Event()
+        event.listen(engine, "commit", self._mark_activity)
+
+    def _mark_activity(self, connection):
+        self.last_activity = time.monotonic()
+
+    def is_idle(self):
+        return time.monotonic() - self.last_activity >= self.idle_seconds
+
+    def run_maintenance(self):
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+            connection.exec_driver_sql("PRAGMA optimize")
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            if not self.is_idle():
+                continue
+            try:
+                self.run_maintenance()
+            except Exception as e:
+                print(f"Veritabanı bakımı başarısız: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        event.remove(self.engine, "commit", self._mark_activity)
+
+maintenance_worker = None
+
+def start_maintenance(db_settings=None):
+    global maintenance_worker
+    if maintenance_worker is not None:
+        return maintenance_worker
+    if db_settings is None:
+        db_settings = load_database_settings()
+    config = dict(DEFAULT_MAINTENANCE, **db_settings.get('maintenance', {}))
+    maintenance_worker = MaintenanceWorker(get_engine(), config['checkpoint_interval_seconds'], config['idle_seconds'])
+    maintenance_worker.start()
+    return maintenance_worker
+
+def stop_maintenance():
+    global maintenance_worker
+    if maintenance_worker is None:
+        return
+    maintenance_worker.stop()
+    maintenance_worker.join(timeout=5)
+    maintenance_worker = None
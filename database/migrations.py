@@ -0,0 +1,164 @@
+import time
+
+from database.search import create_search_schema, SEARCH_SCHEMA
+from database.stats import create_stats_triggers, backfill_conversation_stats, STATS_TRIGGERS
+from database.response_cache import RESPONSE_CACHE_SCHEMA
+from database.summary import create_summary_schema
+
+SCHEMA_VERSION = 10
+DEFAULT_CHUNK_SIZE = 5000
+
+def get_schema_version(connection):
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+def set_schema_version(connection, version):
+    connection.exec_driver_sql(f"PRAGMA user_version={int(version)}")
+
+def column_exists(connection, table, column):
+    rows = connection.exec_driver_sql(f"PRAGMA table_info('{table}')").fetchall()
+    return any(row[1] == column for row in rows)
+
+def table_exists(connection, table):
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).first() is not None
+
+def read_key_format(connection):
+    if table_exists(connection, 'schema_options'):
+        value = connection.exec_driver_sql("SELECT value FROM schema_options WHERE name = 'key_format'").scalar()
+        if value:
+            return value
+    if table_exists(connection, 'user'):
+        return "text"
+    return None
+
+def write_key_format(connection, key_format):
+    connection.exec_driver_sql(
+        "INSERT OR REPLACE INTO schema_options(name, value) VALUES ('key_format', ?)", (key_format,)
+    )
+
+def run_in_chunks(engine, statement, chunk_size=DEFAULT_CHUNK_SIZE, pause=0.0):
+    total = 0
+    while True:
+        with engine.begin() as connection:
+            affected = connection.exec_driver_sql(statement, (chunk_size,)).rowcount
+        total += affected
+        if affected < chunk_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+def migrate_v1_message_sender(engine, chunk_size):
+    with engine.begin() as connection:
+        if not column_exists(connection, 'message', 'sender'):
+            connection.exec_driver_sql("ALTER TABLE message ADD COLUMN sender VARCHAR(10)")
+    run_in_chunks(
+        engine,
+        "UPDATE message SET sender = 'user' WHERE rowid IN "
+        "(SELECT rowid FROM message WHERE sender IS NULL LIMIT ?)",
+        chunk_size
+    )
+
+def migrate_v2_hot_path_indexes(engine, chunk_size):
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_message_conversation_date ON message (conversation_id, message_date)",
+        "CREATE INDEX IF NOT EXISTS ix_conversation_user_archived_created ON conversation (user_id, is_archived, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_conversation_created_at ON conversation (created_at)"
+    ]
+    for statement in statements:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(statement)
+
+def migrate_v3_message_keyset_index(engine, chunk_size):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_message_conversation_date_id ON message (conversation_id, message_date, message_id)"
+        )
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_message_conversation_date")
+
+def migrate_v4_full_text_search(engine, chunk_size):
+    with engine.begin() as connection:
+        create_search_schema(connection)
+
+def migrate_v5_conversation_stats(engine, chunk_size):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS conversation_stats ("
+            "conversation_id VARCHAR(36) NOT NULL PRIMARY KEY REFERENCES conversation (conversation_id), "
+            "message_count INTEGER NOT NULL DEFAULT 0, last_message_at DATETIME, last_snippet TEXT, "
+            "total_characters INTEGER NOT NULL DEFAULT 0)"
+        )
+        create_stats_triggers(connection)
+    backfill_conversation_stats(engine)
+
+def migrate_v6_schema_options(engine, chunk_size):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_options (name VARCHAR PRIMARY KEY, value VARCHAR NOT NULL)"
+        )
+
+def migrate_v7_message_compression(engine, chunk_size):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS compression_dictionary ("
+            "dictionary_id INTEGER PRIMARY KEY, codec VARCHAR NOT NULL, data BLOB NOT NULL)"
+        )
+        for statement in SEARCH_SCHEMA + STATS_TRIGGERS:
+            if statement.startswith("CREATE TRIGGER"):
+                name = statement.split()[5]
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+                connection.exec_driver_sql(statement)
+
+def migrate_v8_response_cache(engine, chunk_size):
+    with engine.begin() as connection:
+        for statement in RESPONSE_CACHE_SCHEMA:
+            connection.exec_driver_sql(statement)
+
+def migrate_v9_context_tokens(engine, chunk_size):
+    # Eski mesajların token sayısı boş kalır, bağlam kurulurken ilk okumada hesaplanır
+    with engine.begin() as connection:
+        for column in ("content_tokens", "response_tokens"):
+            if not column_exists(connection, 'message', column):
+                connection.exec_driver_sql(f"ALTER TABLE message ADD COLUMN {column} INTEGER")
+        create_summary_schema(connection)
+
+def migrate_v10_search_owner(engine, chunk_size):
+    # Terimler artık sahibin önekiyle dizinlenir; dizin yeniden kurulur ve arka planda yeniden doldurulur
+    with engine.begin() as connection:
+        for statement in SEARCH_SCHEMA:
+            if statement.startswith("CREATE TRIGGER"):
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {statement.split()[5]}")
+        connection.exec_driver_sql("DROP TABLE IF EXISTS message_fts")
+        connection.exec_driver_sql("DROP TABLE IF EXISTS conversation_fts")
+        create_search_schema(connection)
+
+MIGRATIONS = [
+    (1, migrate_v1_message_sender),
+    (2, migrate_v2_hot_path_indexes),
+    (3, migrate_v3_message_keyset_index),
+    (4, migrate_v4_full_text_search),
+    (5, migrate_v5_conversation_stats),
+    (6, migrate_v6_schema_options),
+    (7, migrate_v7_message_compression),
+    (8, migrate_v8_response_cache),
+    (9, migrate_v9_context_tokens),
+    (10, migrate_v10_search_owner)
+]
+
+def run_migrations(engine, chunk_size=DEFAULT_CHUNK_SIZE):
+    with engine.connect() as connection:
+        current = get_schema_version(connection)
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"Veritabanı şeması {version}. sürüme yükseltiliyor...")
+        migration(engine, chunk_size)
+        with engine.begin() as connection:
+            set_schema_version(connection, version)
+        current = version
+    return current
+
+def explain_query_plan(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+    return [row[-1] for row in rows]
@@ -0,0 +1,192 @@
+import re
+import json
+import time
+import hashlib
+import threading
+import collections
+import unicodedata
+
+from database.engine import get_engine, get_read_engine
+
+DEFAULT_RESPONSE_CACHE = {
+    "enabled": True,
+    "memory_items": 256,
+    "ttl_hours": 24,
+    "max_rows": 5000,
+    "purge_every": 100
+}
+
+RESPONSE_CACHE_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS response_cache ("
+    "cache_key VARCHAR(64) NOT NULL PRIMARY KEY, model VARCHAR NOT NULL, response TEXT NOT NULL, "
+    "stats TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL, "
+    "hits INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS ix_response_cache_expires_at ON response_cache (expires_at)"
+]
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt):
+    # Büyük/küçük harf, boşluk ve sondaki noktalama farkları aynı soruyu farklı anahtara düşürmez
+    text = unicodedata.normalize("NFKC", prompt).lower()
+    return WHITESPACE.sub(" ", text).strip().rstrip("?!.… ")
+
+def history_hash(history):
+    digest = hashlib.sha256()
+    for item in history or ():
+        digest.update(item["role"].encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(item["content"].encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def cache_key(model, temperature, system_prompt, prompt, history=None):
+    parts = [model, repr(float(temperature)), system_prompt or "", normalize_prompt(prompt), history_hash(history)]
+    return hashlib.sha256("\x1f".join(parts).encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    def __init__(self, config=None):
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self.stores = 0
+        self.configure(config)
+        self.reset_metrics()
+
+    def configure(self, config=None):
+        config = dict(DEFAULT_RESPONSE_CACHE, **(config or {}))
+        with self._lock:
+            self.enabled = config['enabled']
+            self.memory_items = config['memory_items']
+            self.ttl = config['ttl_hours'] * 3600
+            self.max_rows = config['max_rows']
+            self.purge_every = max(1, config['purge_every'])
+            self._evict()
+            if not self.enabled:
+                self._items.clear()
+
+    def reset_metrics(self):
+        with self._lock:
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.expired = 0
+            self.evictions = 0
+            self.saved_seconds = 0.0
+            self.lookup_seconds = 0.0
+
+    def _evict(self):
+        while len(self._items) > self.memory_items:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def _remember(self, key, entry):
+        self._items[key] = entry
+        self._items.move_to_end(key)
+        self._evict()
+
+    def _hit(self, key, entry, source, started):
+        response, stats, expires_at = entry
+        self.saved_seconds += stats.get("elapsed_ms", 0) / 1000
+        self.lookup_seconds += time.perf_counter() - started
+        return response, dict(stats, source=source)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._items.move_to_end(key)
+                    self.memory_hits += 1
+                    return self._hit(key, entry, "memory", started)
+                del self._items[key]
+                self.expired += 1
+        try:
+            with get_read_engine().connect() as connection:
+                row = connection.exec_driver_sql(
+                    "SELECT response, stats, expires_at FROM response_cache WHERE cache_key = ? AND expires_at > ?",
+                    (key, now)
+                ).first()
+        except Exception as e:
+            print(f"Yanıt önbelleği okunamadı: {e}")
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                self.lookup_seconds += time.perf_counter() - started
+                return None
+            entry = (row[0], json.loads(row[1]), row[2])
+            self._remember(key, entry)
+            self.disk_hits += 1
+            result = self._hit(key, entry, "disk", started)
+        self._count_disk_hit(key)
+        return result
+
+    def _count_disk_hit(self, key):
+        try:
+            with get_engine().begin() as connection:
+                connection.exec_driver_sql("UPDATE response_cache SET hits = hits + 1 WHERE cache_key = ?", (key,))
+        except Exception as e:
+            print(f"Yanıt önbelleği güncellenemedi: {e}")
+
+    def put(self, key, model, response, stats):
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        stats = {name: value for name, value in stats.items() if name != "source"}
+        with self._lock:
+            self._remember(key, (response, stats, now + self.ttl))
+            self.stores += 1
+            purge = self.stores % self.purge_every == 0
+        try:
+            with get_engine().begin() as connection:
+                connection.exec_driver_sql(
+                    "INSERT OR REPLACE INTO response_cache(cache_key, model, response, stats, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, json.dumps(stats), now, now + self.ttl)
+                )
+                if purge:
+                    self._purge(connection, now)
+        except Exception as e:
+            print(f"Yanıt önbelleğe yazılamadı: {e}")
+
+    def _purge(self, connection, now):
+        connection.exec_driver_sql("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        connection.exec_driver_sql(
+            "DELETE FROM response_cache WHERE cache_key IN "
+            "(SELECT cache_key FROM response_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+
+    def purge(self):
+        with get_engine().begin() as connection:
+            self._purge(connection, time.time())
+
+    def clear(self, disk=True):
+        with self._lock:
+            self._items.clear()
+        if not disk:
+            return
+        with get_engine().begin() as connection:
+            connection.exec_driver_sql("DELETE FROM response_cache")
+
+    def metrics(self):
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_size": len(self._items),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "saved_ms": self.saved_seconds * 1000,
+                "avg_lookup_ms": self.lookup_seconds / lookups * 1000 if lookups else 0.0
+            }
+
+response_cache = ResponseCache()
@@ -0,0 +1,160 @@
+import time
+import datetime
+import threading
+
+from database.engine import get_engine
+from database.cache import conversation_cache
+from utils.config_utils import config
+
+DEFAULT_RETENTION = {
+    "max_days": 30,
+    "auto_cleanup": False,
+    "action": "delete",
+    "batch_size": 500,
+    "batch_pause_ms": 50,
+    "check_interval_hours": 6,
+    "vacuum_threshold": 0.1,
+    "vacuum_pages_per_step": 512
+}
+
+EXPIRED_MESSAGES_QUERY = """
+    SELECT rowid FROM message WHERE rowid > ? AND message_date < ? ORDER BY rowid LIMIT ?
+"""
+EXPIRED_CONVERSATIONS_QUERY = """
+    SELECT c.rowid FROM conversation c
+    LEFT JOIN conversation_stats s ON s.conversation_id = c.conversation_id
+    WHERE c.rowid > ? AND c.created_at < ? AND coalesce(s.message_count, 0) = 0
+    ORDER BY c.rowid LIMIT ?
+"""
+STALE_CONVERSATIONS_QUERY = """
+    SELECT c.rowid FROM conversation c
+    LEFT JOIN conversation_stats s ON s.conversation_id = c.conversation_id
+    WHERE c.rowid > ? AND c.is_archived = 0 AND coalesce(s.last_message_at, c.created_at) < ?
+    ORDER BY c.rowid LIMIT ?
+"""
+
+def load_retention_settings():
+    return config.get('storage.chat_history')
+
+class RetentionStats:
+    def __init__(self):
+        self.rows = 0
+        self.batches = 0
+        self.longest_lock = 0.0
+        self.seconds = 0.0
+        self.vacuumed_pages = 0
+
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+def _in_batches(engine, select_query, apply_statement, cutoff, config, stats, stop_event=None):
+    last_rowid = 0
+    pause = config['batch_pause_ms'] / 1000
+    while stop_event is None or not stop_event.is_set():
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            rowids = [row[0] for row in connection.exec_driver_sql(
+                select_query, (last_rowid, cutoff, config['batch_size'])
+            )]
+            if not rowids:
+                return
+            placeholders = ",".join("?" * len(rowids))
+            connection.exec_driver_sql(apply_statement.format(placeholders), tuple(rowids))
+        stats.longest_lock = max(stats.longest_lock, time.perf_counter() - start)
+        stats.rows += len(rowids)
+        stats.batches += 1
+        last_rowid = rowids[-1]
+        if pause:
+            time.sleep(pause)
+
+def free_page_ratio(engine):
+    with engine.connect() as connection:
+        page_count = connection.exec_driver_sql("PRAGMA page_count").scalar()
+        freelist_count = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+    return freelist_count / page_count if page_count else 0.0, freelist_count
+
+def incremental_vacuum(engine, config, stats, stop_event=None):
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            print("Artımlı vakum kapalı; boş sayfalar yeniden kullanılmak üzere bırakıldı")
+            return
+    pause = config['batch_pause_ms'] / 1000
+    while stop_event is None or not stop_event.is_set():
+        ratio, freelist_count = free_page_ratio(engine)
+        if not freelist_count:
+            return
+        start = time.perf_counter()
+        with engine.connect() as connection:
+            # execute() yalnızca tek bir sayfa boşaltır; executescript pragmayı sonuna kadar çalıştırır
+            connection.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(config['vacuum_pages_per_step'])})"
+            )
+        stats.longest_lock = max(stats.longest_lock, time.perf_counter() - start)
+        stats.vacuumed_pages += min(freelist_count, config['vacuum_pages_per_step'])
+        if pause:
+            time.sleep(pause)
+
+def run_retention(engine, config, stop_event=None):
+    stats = RetentionStats()
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=config['max_days'])
+    start = time.perf_counter()
+    if config['action'] == "archive":
+        _in_batches(engine, STALE_CONVERSATIONS_QUERY,
+                    "UPDATE conversation SET is_archived = 1 WHERE rowid IN ({})", cutoff, config, stats, stop_event)
+    else:
+        _in_batches(engine, EXPIRED_MESSAGES_QUERY,
+                    "DELETE FROM message WHERE rowid IN ({})", cutoff, config, stats, stop_event)
+        _in_batches(engine, EXPIRED_CONVERSATIONS_QUERY,
+                    "DELETE FROM conversation WHERE rowid IN ({})", cutoff, config, stats, stop_event)
+    stats.seconds = time.perf_counter() - start
+    if stats.rows:
+        conversation_cache.clear()
+    if free_page_ratio(engine)[0] >= config['vacuum_threshold']:
+        incremental_vacuum(engine, config, stats, stop_event)
+    return stats
+
+class RetentionWorker(threading.Thread):
+    def __init__(self, engine, config):
+        super().__init__(name="db-retention", daemon=True)
+        self.engine = engine
+        self.config = config
+        self.stop_event = threading.Event()
+        self.last_stats = None
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                stats = run_retention(self.engine, self.config, self.stop_event)
+                self.last_stats = stats
+                if stats.rows:
+                    print(f"Eski sohbet geçmişi temizlendi: {stats.rows} satır, {stats.rows_per_second():.0f} satır/sn, "
+                          f"en uzun kilit {stats.longest_lock * 1000:.1f} ms")
+            except Exception as e:
+                print(f"Sohbet geçmişi temizlenemedi: {e}")
+            self.stop_event.wait(self.config['check_interval_hours'] * 3600)
+
+    def stop(self):
+        self.stop_event.set()
+
+retention_worker = None
+
+def start_retention(retention_settings=None):
+    global retention_worker
+    if retention_worker is not None:
+        return retention_worker
+    if retention_settings is None:
+        retention_settings = load_retention_settings()
+    config = dict(DEFAULT_RETENTION, **retention_settings)
+    if not config['auto_cleanup']:
+        return None
+    retention_worker = RetentionWorker(get_engine(), config)
+    retention_worker.start()
+    return retention_worker
+
+def stop_retention():
+    global retention_worker
+    if retention_worker is None:
+        return
+    retention_worker.stop()
+    retention_worker.join(timeout=5)
+    retention_worker = None
@@ -0,0 +1,235 @@
+import re
+import time
+import threading
+from sqlalchemy import text, bindparam, Float, DateTime, Integer
+
+from database.engine import get_engine
+from database.keys import UUIDKey
+from database.terms import WORD_PATTERN, owner_prefix
+from database.codec import decode_text
+
+BACKFILL_CHUNK_SIZE = 2000
+SNIPPET_TOKENS = 12
+
+# Kelimeler sahibin önekiyle dizinlenir (bkz. database/terms.py); MATCH yalnızca kullanıcının doclist'lerini okur,
+# bm25 ve önek açılımı da yalnızca kullanıcının satırları üzerinde çalışır
+MESSAGE_OWNER = """(SELECT u.rowid FROM conversation c JOIN user u ON u.user_id = c.user_id
+                    WHERE c.conversation_id = new.conversation_id)"""
+CONVERSATION_OWNER = "(SELECT rowid FROM user WHERE user_id = new.user_id)"
+
+SEARCH_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+        message_content, response_message, conversation_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS conversation_fts USING fts5(
+        name, conversation_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TABLE IF NOT EXISTS search_backfill (
+        table_name VARCHAR PRIMARY KEY, last_rowid INTEGER NOT NULL, target_rowid INTEGER NOT NULL
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS message_fts_insert AFTER INSERT ON message BEGIN
+        INSERT OR REPLACE INTO message_fts(rowid, message_content, response_message, conversation_id)
+        VALUES (new.rowid, owner_terms({MESSAGE_OWNER}, message_text(new.message_content)),
+                owner_terms({MESSAGE_OWNER}, message_text(new.response_message)), new.conversation_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS message_fts_update AFTER UPDATE OF message_content, response_message ON message BEGIN
+        UPDATE message_fts SET message_content = owner_terms({MESSAGE_OWNER}, message_text(new.message_content)),
+                               response_message = owner_terms({MESSAGE_OWNER}, message_text(new.response_message))
+        WHERE rowid = old.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS message_fts_delete AFTER DELETE ON message BEGIN
+        DELETE FROM message_fts WHERE rowid = old.rowid;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS conversation_fts_insert AFTER INSERT ON conversation BEGIN
+        INSERT OR REPLACE INTO conversation_fts(rowid, name, conversation_id)
+        VALUES (new.rowid, owner_terms({CONVERSATION_OWNER}, new.name), new.conversation_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS conversation_fts_update AFTER UPDATE OF name ON conversation BEGIN
+        UPDATE conversation_fts SET name = owner_terms({CONVERSATION_OWNER}, new.name) WHERE rowid = old.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS conversation_fts_delete AFTER DELETE ON conversation BEGIN
+        DELETE FROM conversation_fts WHERE rowid = old.rowid;
+    END"""
+]
+
+BACKFILL_SOURCES = {
+    "message_fts": (
+        "INSERT OR REPLACE INTO message_fts(rowid, message_content, response_message, conversation_id) "
+        "SELECT m.rowid, owner_terms(u.rowid, message_text(m.message_content)), "
+        "owner_terms(u.rowid, message_text(m.response_message)), m.conversation_id FROM message m "
+        "JOIN conversation c ON c.conversation_id = m.conversation_id JOIN user u ON u.user_id = c.user_id "
+        "WHERE m.rowid > ? AND m.rowid <= ?"
+    ),
+    "conversation_fts": (
+        "INSERT OR REPLACE INTO conversation_fts(rowid, name, conversation_id) "
+        "SELECT c.rowid, owner_terms(u.rowid, c.name), c.conversation_id FROM conversation c "
+        "JOIN user u ON u.user_id = c.user_id WHERE c.rowid > ? AND c.rowid <= ?"
+    )
+}
+
+SOURCE_TABLES = {"message_fts": "message", "conversation_fts": "conversation"}
+
+HIT_COLUMNS = dict(rank=Float, message_id=UUIDKey, message_date=DateTime, conversation_id=UUIDKey, user_id=UUIDKey)
+
+MESSAGE_HITS_QUERY = text("""
+    SELECT hits.rank AS rank, m.message_id AS message_id, m.message_date AS message_date,
+           m.message_content AS message_content, m.response_message AS response_message,
+           c.conversation_id AS conversation_id, c.name AS conversation_name, c.user_id AS user_id
+    FROM (SELECT rowid, bm25(message_fts) AS rank FROM message_fts
+          WHERE message_fts MATCH :match ORDER BY rank LIMIT :limit) AS hits
+    JOIN message m ON m.rowid = hits.rowid
+    JOIN conversation c ON c.conversation_id = m.conversation_id
+    ORDER BY hits.rank
+""").columns(**HIT_COLUMNS)
+
+OWNER_QUERY = text("SELECT rowid FROM user WHERE user_id = :user_id").bindparams(
+    bindparam("user_id", type_=UUIDKey)).columns(rowid=Integer)
+
+CONVERSATION_HITS_QUERY = text("""
+    SELECT hits.rank AS rank, NULL AS message_id, c.created_at AS message_date,
+           c.conversation_id AS conversation_id, c.name AS conversation_name, c.user_id AS user_id
+    FROM (SELECT rowid, bm25(conversation_fts) AS rank FROM conversation_fts
+          WHERE conversation_fts MATCH :match ORDER BY rank LIMIT :limit) AS hits
+    JOIN conversation c ON c.rowid = hits.rowid
+    ORDER BY hits.rank
+""").columns(**HIT_COLUMNS)
+
+def create_search_schema(connection):
+    for statement in SEARCH_SCHEMA:
+        connection.exec_driver_sql(statement)
+    for fts_table, source_table in SOURCE_TABLES.items():
+        target = connection.exec_driver_sql(f"SELECT COALESCE(MAX(rowid), 0) FROM {source_table}").scalar()
+        connection.exec_driver_sql(
+            "INSERT OR REPLACE INTO search_backfill(table_name, last_rowid, target_rowid) VALUES (?, 0, ?)",
+            (fts_table, target)
+        )
+
+def query_terms(query):
+    return WORD_PATTERN.findall(query or "")
+
+def build_match_query(query, owner):
+    terms = query_terms(query)
+    if not terms:
+        return ""
+    prefix = owner_prefix(owner)
+    exact = [f'"{prefix}{term}"' for term in terms[:-1]]
+    return " ".join(exact + [f'"{prefix}{terms[-1]}"*'])
+
+def make_snippet(text, terms, width=SNIPPET_TOKENS):
+    words = (text or "").split()
+    folded_terms = [term.casefold() for term in terms]
+    matches = [
+        i for i, word in enumerate(words)
+        if any(re.sub(r"\W", "", word).casefold().startswith(term) for term in folded_terms)
+    ]
+    if not matches:
+        return None
+    start = max(0, min(matches[0] - width // 3, len(words) - width))
+    end = min(len(words), start + width)
+    marked = [f"<b>{word}</b>" if i in matches else word for i, word in enumerate(words[start:end], start)]
+    return ("…" if start > 0 else "") + " ".join(marked) + ("…" if end < len(words) else "")
+
+def _ranked_hits(session, statement, kind, match, wanted):
+    rows = session.execute(statement, {"match": match, "limit": wanted})
+    return [dict(row, kind=kind) for row in rows.mappings()]
+
+def search(session, query, user_id, limit=20, offset=0):
+    owner = session.execute(OWNER_QUERY, {"user_id": user_id}).scalar()
+    if owner is None:
+        return []
+    # Kullanıcı filtresi MATCH terimlerinin içindedir, sıralama ve LIMIT yalnızca kullanıcının eşleşmeleri üzerinde çalışır
+    match = build_match_query(query, owner)
+    if not match:
+        return []
+    terms = query_terms(query)
+    # İki liste birleştirilip sayfalandığı için her birinden ilk limit + offset sonuç alınır
+    wanted = limit + offset
+    hits = _ranked_hits(session, CONVERSATION_HITS_QUERY, "conversation", match, wanted)
+    hits += _ranked_hits(session, MESSAGE_HITS_QUERY, "message", match, wanted)
+    hits.sort(key=lambda hit: hit["rank"])
+    results = hits[offset:wanted]
+    for hit in results:
+        if hit["kind"] == "conversation":
+            name = hit["conversation_name"]
+            hit["snippet"] = make_snippet(name, terms, width=len(name.split())) or name
+        else:
+            content = decode_text(hit.pop("message_content"))
+            response = decode_text(hit.pop("response_message"))
+            hit["snippet"] = make_snippet(content, terms) or make_snippet(response, terms) or content[:SNIPPET_TOKENS * 8]
+    return results
+
+def backfill_step(engine, chunk_size=BACKFILL_CHUNK_SIZE):
+    done = True
+    for fts_table, statement in BACKFILL_SOURCES.items():
+        with engine.begin() as connection:
+            state = connection.exec_driver_sql(
+                "SELECT last_rowid, target_rowid FROM search_backfill WHERE table_name = ?", (fts_table,)
+            ).first()
+            if state is None or state[0] >= state[1]:
+                continue
+            last_rowid, target_rowid = state
+            batch_end = connection.exec_driver_sql(
+                f"SELECT MAX(source_rowid) FROM (SELECT rowid AS source_rowid FROM {SOURCE_TABLES[fts_table]} "
+                "WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?)",
+                (last_rowid, target_rowid, chunk_size)
+            ).scalar()
+            if batch_end is None:
+                batch_end = target_rowid
+            else:
+                connection.exec_driver_sql(statement, (last_rowid, batch_end))
+            connection.exec_driver_sql(
+                "UPDATE search_backfill SET last_rowid = ? WHERE table_name = ?", (batch_end, fts_table)
+            )
+            if batch_end < target_rowid:
+                done = False
+            else:
+                connection.exec_driver_sql(f"INSERT INTO {fts_table}({fts_table}) VALUES('optimize')")
+    return done
+
+def rebuild_search_index(engine=None):
+    engine = engine or get_engine()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM message_fts")
+        connection.exec_driver_sql("DELETE FROM conversation_fts")
+        create_search_schema(connection)
+
+class SearchBackfillWorker(threading.Thread):
+    def __init__(self, engine, chunk_size=BACKFILL_CHUNK_SIZE, pause=0.05):
+        super().__init__(name="search-backfill", daemon=True)
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                if backfill_step(self.engine, self.chunk_size):
+                    return
+            except Exception as e:
+                print(f"Arama dizini doldurulurken hata: {e}")
+                return
+            time.sleep(self.pause)
+
+    def stop(self):
+        self.stop_event.set()
+
+backfill_worker = None
+
+def start_search_backfill():
+    global backfill_worker
+    if backfill_worker is not None and backfill_worker.is_alive():
+        return backfill_worker
+    backfill_worker = SearchBackfillWorker(get_engine())
+    backfill_worker.start()
+    return backfill_worker
+
+def stop_search_backfill():
+    global backfill_worker
+    if backfill_worker is None:
+        return
+    backfill_worker.stop()
+    backfill_worker.join(timeout=5)
+    backfill_worker = None
@@ -0,0 +1,71 @@
+SNIPPET_LENGTH = 80
+BACKFILL_CONVERSATIONS_PER_CHUNK = 200
+
+STATS_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS conversation_stats_message_insert AFTER INSERT ON message BEGIN
+        INSERT INTO conversation_stats(conversation_id, message_count, last_message_at, last_snippet, total_characters)
+        VALUES (new.conversation_id, 1, new.message_date,
+                substr(message_text(coalesce(new.response_message, new.message_content)), 1, {SNIPPET_LENGTH}),
+                length(message_text(new.message_content)) + coalesce(length(message_text(new.response_message)), 0))
+        ON CONFLICT(conversation_id) DO UPDATE SET
+            message_count = message_count + 1,
+            total_characters = total_characters + excluded.total_characters,
+            last_snippet = CASE WHEN last_message_at IS NULL OR excluded.last_message_at >= last_message_at
+                                THEN excluded.last_snippet ELSE last_snippet END,
+            last_message_at = max(coalesce(last_message_at, excluded.last_message_at), excluded.last_message_at);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS conversation_stats_message_update AFTER UPDATE OF message_content, response_message ON message BEGIN
+        UPDATE conversation_stats SET
+            total_characters = total_characters
+                + length(message_text(new.message_content)) + coalesce(length(message_text(new.response_message)), 0)
+                - length(message_text(old.message_content)) - coalesce(length(message_text(old.response_message)), 0),
+            last_snippet = CASE WHEN new.message_date = last_message_at
+                                THEN substr(message_text(coalesce(new.response_message, new.message_content)), 1, {SNIPPET_LENGTH})
+                                ELSE last_snippet END
+        WHERE conversation_id = new.conversation_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS conversation_stats_message_delete AFTER DELETE ON message BEGIN
+        UPDATE conversation_stats SET
+            message_count = message_count - 1,
+            total_characters = total_characters - length(message_text(old.message_content)) - coalesce(length(message_text(old.response_message)), 0),
+            last_message_at = (SELECT message_date FROM message WHERE conversation_id = old.conversation_id
+                               ORDER BY message_date DESC LIMIT 1),
+            last_snippet = (SELECT substr(message_text(coalesce(response_message, message_content)), 1, {SNIPPET_LENGTH})
+                            FROM message WHERE conversation_id = old.conversation_id
+                            ORDER BY message_date DESC LIMIT 1)
+        WHERE conversation_id = old.conversation_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS conversation_stats_conversation_delete AFTER DELETE ON conversation BEGIN
+        DELETE FROM conversation_stats WHERE conversation_id = old.conversation_id;
+    END"""
+]
+
+BACKFILL_STATEMENT = f"""
+    INSERT OR REPLACE INTO conversation_stats(conversation_id, message_count, last_message_at, last_snippet, total_characters)
+    SELECT c.conversation_id,
+           (SELECT COUNT(*) FROM message WHERE conversation_id = c.conversation_id),
+           (SELECT MAX(message_date) FROM message WHERE conversation_id = c.conversation_id),
+           (SELECT substr(message_text(coalesce(response_message, message_content)), 1, {SNIPPET_LENGTH}) FROM message
+            WHERE conversation_id = c.conversation_id ORDER BY message_date DESC LIMIT 1),
+           (SELECT coalesce(SUM(length(message_text(message_content)) + coalesce(length(message_text(response_message)), 0)), 0)
+            FROM message WHERE conversation_id = c.conversation_id)
+    FROM conversation c WHERE c.rowid > ? AND c.rowid <= ?
+"""
+
+def create_stats_triggers(connection):
+    for statement in STATS_TRIGGERS:
+        connection.exec_driver_sql(statement)
+
+def backfill_conversation_stats(engine, chunk_size=BACKFILL_CONVERSATIONS_PER_CHUNK):
+    last_rowid = 0
+    while True:
+        with engine.begin() as connection:
+            batch_end = connection.exec_driver_sql(
+                "SELECT MAX(source_rowid) FROM (SELECT rowid AS source_rowid FROM conversation "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+                (last_rowid, chunk_size)
+            ).scalar()
+            if batch_end is None:
+                return
+            connection.exec_driver_sql(BACKFILL_STATEMENT, (last_rowid, batch_end))
+        last_rowid = batch_end
@@ -0,0 +1,13 @@
+SUMMARY_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS conversation_summary ("
+    "conversation_id VARCHAR(36) NOT NULL PRIMARY KEY REFERENCES conversation (conversation_id), "
+    "summary TEXT NOT NULL, summary_tokens INTEGER NOT NULL, covered_date DATETIME, covered_id VARCHAR(36), "
+    "updated_at DATETIME)",
+    """CREATE TRIGGER IF NOT EXISTS conversation_summary_conversation_delete AFTER DELETE ON conversation BEGIN
+        DELETE FROM conversation_summary WHERE conversation_id = old.conversation_id;
+    END"""
+]
+
+def create_summary_schema(connection):
+    for statement in SUMMARY_SCHEMA:
+        connection.exec_driver_sql(statement)
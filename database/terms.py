@@ -0,0 +1,18 @@
+import re
+
+# unicode61 belirteçleyicisiyle aynı ayrım: harf ve rakamlar token, geri kalan her şey (alt çizgi dahil) ayraç
+WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+def owner_prefix(owner):
+    # Sahip, kullanıcı satırının rowid'idir; rakamlar iki harf arasında kaldığı için önek her zaman tek anlamlıdır
+    return f"x{owner}x"
+
+def owner_terms(owner, text):
+    # Her kelime sahibin önekiyle dizinlenir; böylece bir kullanıcının terimleri FTS dizininde ayrı doclist'lerde durur
+    if text is None or owner is None:
+        return None
+    prefix = owner_prefix(owner)
+    return " ".join(prefix + word for word in WORD_PATTERN.findall(text))
+
+def register_term_functions(dbapi_connection):
+    dbapi_connection.create_function("owner_terms", 2, owner_terms, deterministic=True)
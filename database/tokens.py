@@ -0,0 +1,37 @@
+import re
+import math
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_ENCODING = "cl100k_base"
+WORD_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+_encoding = None
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            print(f"Token kodlaması yüklenemedi, yaklaşık sayım kullanılacak: {e}")
+            return None
+    return _encoding
+
+def count_tokens(text):
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # tiktoken yoksa BPE'ye yakın bir tahmin: kelime başına ~4 karakter, noktalama ayrı token
+    return sum(math.ceil(len(piece) / 4) for piece in WORD_PATTERN.findall(text))
+
+def message_tokens(content, response=None):
+    return {
+        "content_tokens": count_tokens(content),
+        "response_tokens": count_tokens(response) if response is not None else None
+    }
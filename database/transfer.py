@@ -0,0 +1,189 @@
+import os
+import json
+import datetime
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert
+
+from database import Conversation, Message, ConversationStats, create_session, get_engine, conversation_cache
+from database.codec import decode_text
+from database.tokens import message_tokens
+
+FORMAT_VERSION = 1
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+PROGRESS_INTERVAL = 1000
+CONFLICT_MODES = ("skip", "replace")
+
+CONVERSATION_FIELDS = ["conversation_id", "name", "created_at", "is_archived"]
+MESSAGE_FIELDS = ["message_id", "conversation_id", "message_content", "response_message", "message_date", "sender"]
+TOKEN_FIELDS = ["content_tokens", "response_tokens"]
+DATE_FIELDS = ("created_at", "message_date")
+
+def _json_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"JSON'a dönüştürülemeyen değer: {value!r}")
+
+def _write(f, record):
+    f.write(json.dumps(record, ensure_ascii=False, default=_json_value))
+    f.write("\n")
+
+def _conversation_filter(user_id=None, conversation_id=None):
+    conditions = []
+    if user_id is not None:
+        conditions.append(Conversation.user_id == user_id)
+    if conversation_id is not None:
+        conditions.append(Conversation.conversation_id == conversation_id)
+    return conditions
+
+def export_history(path, user_id=None, conversation_id=None, progress=None, batch_size=EXPORT_BATCH_SIZE):
+    session = create_session()
+    conditions = _conversation_filter(user_id, conversation_id)
+    stats = {"conversations": 0, "messages": 0}
+    try:
+        conversation_count, message_count = session.execute(
+            select(func.count(Conversation.conversation_id), func.coalesce(func.sum(ConversationStats.message_count), 0))
+            .outerjoin(ConversationStats, ConversationStats.conversation_id == Conversation.conversation_id)
+            .where(*conditions)
+        ).one()
+        total = conversation_count + message_count
+
+        with open(path, "w", encoding="utf-8") as f:
+            _write(f, {"type": "header", "format": FORMAT_VERSION, "exported_at": datetime.datetime.now()})
+
+            conversations = session.execute(
+                select(*[Conversation.__table__.c[name] for name in CONVERSATION_FIELDS])
+                .where(*conditions).order_by(Conversation.created_at)
+            ).yield_per(batch_size)
+            for row in conversations:
+                _write(f, dict(row._mapping, type="conversation"))
+                stats["conversations"] += 1
+
+            messages = session.execute(
+                select(*[Message.__table__.c[name] for name in MESSAGE_FIELDS])
+                .join(Conversation, Conversation.conversation_id == Message.conversation_id)
+                .where(*conditions).order_by(Message.conversation_id, Message.message_date)
+            ).yield_per(batch_size)
+            for row in messages:
+                record = dict(row._mapping, type="message")
+                record["message_content"] = decode_text(record["message_content"])
+                record["response_message"] = decode_text(record["response_message"])
+                _write(f, record)
+                stats["messages"] += 1
+                done = stats["conversations"] + stats["messages"]
+                if progress and done % PROGRESS_INTERVAL == 0:
+                    progress(done, total)
+        if progress:
+            progress(total, total)
+        return stats
+    finally:
+        session.close()
+
+def _owned_conversations(user_id):
+    return select(Conversation.conversation_id).where(Conversation.user_id == user_id)
+
+def _parse(record, fields):
+    values = {name: record.get(name) for name in fields}
+    for name in DATE_FIELDS:
+        if values.get(name):
+            values[name] = datetime.datetime.fromisoformat(values[name])
+    return values
+
+def _insert_statement(table, key, columns, conflict, user_id):
+    statement = insert(table)
+    if conflict == "replace":
+        # Var olan satır yalnızca içe aktaran kullanıcıya aitse üzerine yazılır
+        if "user_id" in table.c:
+            condition = table.c.user_id == statement.excluded.user_id
+        else:
+            condition = table.c.conversation_id.in_(_owned_conversations(user_id))
+        return statement.on_conflict_do_update(
+            index_elements=[key],
+            set_={name: statement.excluded[name] for name in columns if name != key},
+            where=condition
+        )
+    return statement.on_conflict_do_nothing(index_elements=[key])
+
+class HistoryImporter:
+    def __init__(self, engine, user_id, conflict="skip", batch_size=IMPORT_BATCH_SIZE):
+        if conflict not in CONFLICT_MODES:
+            raise ValueError(f"Bilinmeyen çakışma davranışı: {conflict}")
+        self.engine = engine
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.conversation_statement = _insert_statement(
+            Conversation.__table__, "conversation_id", CONVERSATION_FIELDS + ["user_id"], conflict, user_id
+        )
+        self.message_statement = _insert_statement(
+            Message.__table__, "message_id", MESSAGE_FIELDS + TOKEN_FIELDS, conflict, user_id
+        )
+        self.conversations = []
+        self.messages = []
+        self.stats = {"conversations": 0, "messages": 0, "skipped": 0, "rejected": 0}
+
+    def add(self, record):
+        kind = record.get("type")
+        if kind == "conversation":
+            values = _parse(record, CONVERSATION_FIELDS)
+            values["user_id"] = self.user_id
+            self.conversations.append(values)
+        elif kind == "message":
+            values = _parse(record, MESSAGE_FIELDS)
+            values.update(message_tokens(values["message_content"], values["response_message"]))
+            self.messages.append(values)
+        elif kind == "header":
+            if record.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Desteklenmeyen arşiv sürümü: {record.get('format')}")
+        if len(self.conversations) + len(self.messages) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.conversations and not self.messages:
+            return
+        with self.engine.begin() as connection:
+            if self.conversations:
+                written = connection.execute(self.conversation_statement, self.conversations).rowcount
+                self.stats["conversations"] += written
+                self.stats["skipped"] += len(self.conversations) - written
+            messages = self._owned_messages(connection)
+            if messages:
+                written = connection.execute(self.message_statement, messages).rowcount
+                self.stats["messages"] += written
+                self.stats["skipped"] += len(messages) - written
+        self.conversations = []
+        self.messages = []
+
+    def _owned_messages(self, connection):
+        # Konuşmalar aynı işlemde önce yazıldığı için arşivle gelen yeni konuşmalar da sahiplik sorgusunda görünür
+        conversation_ids = {values["conversation_id"] for values in self.messages}
+        if not conversation_ids:
+            return []
+        owned = set(connection.execute(
+            _owned_conversations(self.user_id).where(Conversation.conversation_id.in_(conversation_ids))
+        ).scalars())
+        messages = [values for values in self.messages if values["conversation_id"] in owned]
+        self.stats["rejected"] += len(self.messages) - len(messages)
+        return messages
+
+def import_history(path, user_id, conflict="skip", progress=None, batch_size=IMPORT_BATCH_SIZE):
+    importer = HistoryImporter(get_engine(), user_id, conflict, batch_size)
+    total = os.path.getsize(path)
+    done = 0
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            done += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{number}. satır okunamadı: {e}")
+            importer.add(record)
+            if progress and number % PROGRESS_INTERVAL == 0:
+                progress(done, total)
+    importer.flush()
+    conversation_cache.clear()
+    if progress:
+        progress(total, total)
+    return importer.stats
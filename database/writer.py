@@ -0,0 +1,153 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+from database import Message
+from database.engine import get_engine, load_database_settings
+from database.fastpath import message_row, response_values, insert_messages, update_responses, upsert_summaries
+
+DEFAULT_WRITE_BEHIND = {
+    "max_batch": 64,
+    "flush_interval_ms": 50
+}
+
+_STOP = object()
+
+class WriteBehindQueue(threading.Thread):
+    def __init__(self, max_batch, flush_interval):
+        super().__init__(name="db-writer", daemon=True)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.batches_committed = 0
+        self.operations_committed = 0
+
+    def submit(self, kind, values):
+        future = Future()
+        self.queue.put((kind, values, future))
+        return future
+
+    def create_message(self, conversation_id, content, sender="user", response=None):
+        row = message_row(conversation_id, content, sender, response)
+        message = Message(**row)
+        future = self.submit("insert_message", row)
+        return message, future
+
+    def update_response(self, message_id, response):
+        return self.submit("update_response", response_values(message_id, response))
+
+    def save_summary(self, conversation_id, summary):
+        return self.submit("upsert_summary", dict(summary, conversation_id=conversation_id))
+
+    def _collect_batch(self, first):
+        batch = [first]
+        if first is _STOP:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch
+
+    def _apply(self, connection, operations):
+        rows = []
+        pending = {}
+        updates = []
+        summaries = {}
+        for kind, values, future in operations:
+            if kind == "insert_message":
+                row = dict(values)
+                rows.append(row)
+                pending[row["message_id"]] = row
+            elif kind == "update_response":
+                row = pending.get(values["message_id"])
+                if row is not None:
+                    row["response_message"] = values["response_message"]
+                    row["response_tokens"] = values["response_tokens"]
+                else:
+                    updates.append(values)
+            elif kind == "upsert_summary":
+                summaries[values["conversation_id"]] = values
+        insert_messages(connection, rows)
+        update_responses(connection, updates)
+        # Özetler mesajlardan sonra yazılır, aynı konuşmanın birden fazla özeti varsa yalnızca sonuncusu kalır
+        upsert_summaries(connection, summaries.values())
+
+    def _commit(self, operations):
+        if not operations:
+            return
+        try:
+            with get_engine().begin() as connection:
+                self._apply(connection, operations)
+        except Exception as e:
+            if len(operations) > 1:
+                # Toplu yazım başarısızsa işlemler tek tek yeniden denenir, yalnızca hatalı satır başarısız olur
+                for operation in operations:
+                    self._commit([operation])
+                return
+            print(f"Mesaj veritabanına yazılamadı: {e}")
+            operations[0][2].set_exception(e)
+            return
+        self.batches_committed += 1
+        self.operations_committed += len(operations)
+        for _, values, future in operations:
+            future.set_result(values.get("message_id"))
+
+    def run(self):
+        while True:
+            batch = self._collect_batch(self.queue.get())
+            # Durdurma işaretinden önceki işlemler yazılır, ardından iş parçacığı çıkar
+            for index, item in enumerate(batch):
+                if item is _STOP:
+                    self._commit(batch[:index])
+                    return
+            self._commit(batch)
+
+    def flush(self, timeout=None):
+        marker = self.submit("flush", {"message_id": None})
+        return marker.result(timeout)
+
+    def stop(self, timeout=10):
+        self.queue.put(_STOP)
+        self.join(timeout)
+
+write_queue = None
+_queue_lock = threading.Lock()
+
+def start_write_queue(db_settings=None):
+    global write_queue
+    with _queue_lock:
+        if write_queue is not None:
+            return write_queue
+        if db_settings is None:
+            db_settings = load_database_settings()
+        config = dict(DEFAULT_WRITE_BEHIND, **db_settings.get('write_behind', {}))
+        write_queue = WriteBehindQueue(config['max_batch'], config['flush_interval_ms'] / 1000)
+        write_queue.start()
+        return write_queue
+
+def stop_write_queue():
+    global write_queue
+    with _queue_lock:
+        if write_queue is None:
+            return
+        write_queue.stop()
+        write_queue = None
+
+def queue_message(conversation_id, content, sender="user", response=None):
+    return start_write_queue().create_message(conversation_id, content, sender, response)
+
+def queue_response_update(message_id, response):
+    return start_write_queue().update_response(message_id, response)
+
+def queue_summary(conversation_id, summary):
+    return start_write_queue().save_summary(conversation_id, summary)
@@ -1,13 +1,23 @@
+from utils.startup_utils import startup, watch_first_paint
 import sys
 import os
-import json
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QIcon
 
 from ui.login_window import LoginWindow
 from ui.main_window import MainWindow
-from database import create_db, User, get_db_session
+from database import create_db, User, get_db_session, start_search_backfill, stop_search_backfill, configure_cache
+from database.maintenance import start_maintenance, stop_maintenance
+from database.writer import start_write_queue, stop_write_queue
+from database.backup import start_backup_scheduler, stop_backup_scheduler
+from database.retention import start_retention, stop_retention
+from database.key_migration import start_key_migration, stop_key_migration
+from utils.async_utils import stop_async_bridge
+from utils.config_utils import config
+from utils.services import warm_up, stop_warm_up
+
+startup.record("imports", startup.started)
 
 def create_assets_dirs():
     dirs = ["assets", "assets/models", "assets/icons", "assets/styles"]
@@ -15,18 +25,46 @@ def create_assets_dirs():
         if not os.path.exists(directory):
             os.makedirs(directory)
 
+def apply_settings(section, value):
+    if section == "database.cache":
+        configure_cache(value)
+
 def main():
-    create_assets_dirs()
-    app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon("assets/icons/app_icon.png"))
-    create_db()
+    with startup.phase("assets"):
+        create_assets_dirs()
+    with startup.phase("qapplication"):
+        app = QApplication(sys.argv)
+        app.setWindowIcon(QIcon("assets/icons/app_icon.png"))
+    with startup.phase("settings"):
+        config.load()
+        config.watch()
+        app.aboutToQuit.connect(config.unwatch)
+        config.section_changed.connect(apply_settings)
+    with startup.phase("database"):
+        create_db()
+    with startup.phase("services"):
+        start_key_migration()
+        app.aboutToQuit.connect(stop_key_migration)
+        start_maintenance()
+        app.aboutToQuit.connect(stop_maintenance)
+        start_search_backfill()
+        app.aboutToQuit.connect(stop_search_backfill)
+        start_write_queue()
+        app.aboutToQuit.connect(stop_write_queue)
+        start_backup_scheduler()
+        app.aboutToQuit.connect(stop_backup_scheduler)
+        start_retention()
+        app.aboutToQuit.connect(stop_retention)
+        app.aboutToQuit.connect(stop_async_bridge)
     try:
-        with open('settings.json', 'r', encoding='utf-8') as f:
-            settings = json.load(f)
-        app_name = settings['app_name']
-        app.setApplicationName(app_name)
-        login_window = LoginWindow()
-        login_window.show()
+        app.setApplicationName(config.get('app_name'))
+        with startup.phase("login_window"):
+            login_window = LoginWindow()
+        watch_first_paint(login_window, config.get('startup.trace_file'))
+        with startup.phase("show"):
+            login_window.show()
+        QTimer.singleShot(0, warm_up)
+        app.aboutToQuit.connect(stop_warm_up)
     except Exception as e:
         print(f"Hata: {e}")
         sys.exit(1)
@@ -1,12 +1,13 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea, QFrame, QHBoxLayout, QTextEdit, QSizePolicy, QProgressBar, QGraphicsOpacityEffect
-from PyQt6.QtCore import pyqtSignal, Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve, QEvent, QRect
+from PyQt6.QtCore import pyqtSignal, Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve, QEvent, QRect, QThread
 from PyQt6.QtGui import QIcon, QFont, QColor, QPalette, QCursor, QPainter, QPainterPath
 import os
 import json
 import datetime
 import tempfile
-import sounddevice as sd
-import soundfile as sf
+
+from database import get_db_session, fetch_messages_page, page_cursor, MESSAGE_PAGE_SIZE
+from utils.services import sounddevice as sd, soundfile as sf
 
 class MessageCard(QFrame):
     def __init__(self, text, sender="user", parent=None, tema_yonetici=None):
@@ -30,15 +31,23 @@ class MessageCard(QFrame):
         sender_label.setObjectName("senderLabel")
         layout.addWidget(sender_label)
         
-        message_label = QLabel(text)
-        message_label.setWordWrap(True)
-        message_label.setTextFormat(Qt.TextFormat.RichText)
-        message_label.setObjectName("messageLabel")
-        layout.addWidget(message_label)
+        self.text = text
+        self.message_label = QLabel(text)
+        self.message_label.setWordWrap(True)
+        self.message_label.setTextFormat(Qt.TextFormat.RichText)
+        self.message_label.setObjectName("messageLabel")
+        layout.addWidget(self.message_label)
         
         self.setStyleSheet(self._get_style())
         self.animasyonBaslat()
     
+    def set_text(self, text):
+        self.text = text
+        self.message_label.setText(text)
+    
+    def append_text(self, text):
+        self.set_text(self.text + text)
+    
     def animasyonBaslat(self):
         self.opak_anim = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.opak_anim.setDuration(150)
@@ -229,6 +238,28 @@ class VoiceRecordButton(QPushButton):
             new_value = 0
         self.progress.setValue(new_value)
 
+class MessagePageLoader(QThread):
+    page_loaded = pyqtSignal(str, object)
+    
+    def __init__(self, conversation_id, before, limit=MESSAGE_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.conversation_id = conversation_id
+        self.before = before
+        self.limit = limit
+    
+    def run(self):
+        session = get_db_session()
+        try:
+            page = fetch_messages_page(session, self.conversation_id, self.before, self.limit)
+        except Exception as e:
+            print(f"Eski mesajlar yüklenirken hata: {e}")
+            page = []
+        finally:
+            session.close()
+        self.page_loaded.emit(self.conversation_id, page)
+
+STREAM_FLUSH_MS = 16
+
 class ChatPanel(QWidget):
     mesaj_gonderildi = pyqtSignal(str)
     ses_kaydi_basladi = pyqtSignal()
@@ -238,6 +269,17 @@ class ChatPanel(QWidget):
         super().__init__(parent)
         self.tema_yonetici = tema_yonetici
         self.aktif_konusma = None
+        self.eski_sayfa_imleci = None
+        self.daha_fazla_var = False
+        self.sayfa_yukleyici = None
+        self.kaydirma_capasi = None
+        self.canli_kart = None
+        self.canli_konusma = None
+        self.bekleyen_metin = []
+        self.akis_zamanlayici = QTimer(self)
+        self.akis_zamanlayici.setSingleShot(True)
+        self.akis_zamanlayici.setInterval(STREAM_FLUSH_MS)
+        self.akis_zamanlayici.timeout.connect(self.flush_ai_deltas)
         self.init_ui()
         
     def init_ui(self):
@@ -259,6 +301,10 @@ class ChatPanel(QWidget):
         self.scroll_area.setWidget(self.mesaj_container)
         layout.addWidget(self.scroll_area)
         
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.on_scroll)
+        scroll_bar.rangeChanged.connect(self.on_scroll_range_changed)
+        
         self.input_container = QWidget()
         self.input_container.setObjectName("inputContainer")
         self.input_container.setFixedHeight(60)
@@ -377,22 +423,118 @@ class ChatPanel(QWidget):
             self.load_messages()
             
     def clear(self):
+        self.canli_kart = None
+        self.canli_konusma = None
+        self.bekleyen_metin = []
+        self.eski_sayfa_imleci = None
+        self.daha_fazla_var = False
+        self.kaydirma_capasi = None
         while self.mesaj_layout.count():
             item = self.mesaj_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+    
+    def clear_messages(self):
+        self.clear()
                 
     def load_messages(self):
         if not self.aktif_konusma:
             return
-            
-        for message in self.aktif_konusma.messages:
-            self.add_message(message.text, message.sender)
+        
+        session = get_db_session()
+        try:
+            page = fetch_messages_page(session, self.aktif_konusma.conversation_id)
+        finally:
+            session.close()
+        
+        self.insert_page(page)
+        self.scroll_to_bottom()
+    
+    def insert_page(self, page):
+        index = 0
+        for message in page:
+            self.mesaj_layout.insertWidget(index, MessageCard(message.message_content, "user", self, self.tema_yonetici))
+            index += 1
+            if message.response_message:
+                self.mesaj_layout.insertWidget(index, MessageCard(message.response_message, "ai", self, self.tema_yonetici))
+                index += 1
+        
+        if page:
+            self.eski_sayfa_imleci = page_cursor(page)
+        self.daha_fazla_var = len(page) >= MESSAGE_PAGE_SIZE
+    
+    def on_scroll(self, value):
+        if value > 200 or not self.daha_fazla_var or not self.aktif_konusma:
+            return
+        if self.sayfa_yukleyici is not None and self.sayfa_yukleyici.isRunning():
+            return
+        
+        self.sayfa_yukleyici = MessagePageLoader(self.aktif_konusma.conversation_id, self.eski_sayfa_imleci, parent=self)
+        self.sayfa_yukleyici.page_loaded.connect(self.on_older_page_loaded)
+        self.sayfa_yukleyici.start()
+    
+    def on_older_page_loaded(self, conversation_id, page):
+        if not self.aktif_konusma or conversation_id != self.aktif_konusma.conversation_id:
+            return
+        
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if page:
+            self.kaydirma_capasi = (scroll_bar.maximum(), scroll_bar.value())
+        self.insert_page(page)
+        if not page:
+            self.daha_fazla_var = False
+    
+    def on_scroll_range_changed(self, minimum, maximum):
+        if self.kaydirma_capasi is None:
+            return
+        
+        eski_maksimum, eski_deger = self.kaydirma_capasi
+        self.kaydirma_capasi = None
+        self.scroll_area.verticalScrollBar().setValue(eski_deger + maximum - eski_maksimum)
             
     def add_message(self, text, sender="user"):
         message_card = MessageCard(text, sender, self, self.tema_yonetici)
         self.mesaj_layout.addWidget(message_card)
         self.scroll_to_bottom()
+    
+    def add_user_message(self, text):
+        self.add_message(text, "user")
+    
+    def add_ai_message(self, text):
+        self.add_message(text, "ai")
+    
+    def begin_ai_message(self, conversation_id):
+        self.flush_ai_deltas()
+        self.canli_kart = MessageCard("", "ai", self, self.tema_yonetici)
+        self.canli_konusma = conversation_id
+        self.mesaj_layout.addWidget(self.canli_kart)
+        self.scroll_to_bottom()
+    
+    def append_ai_delta(self, conversation_id, delta):
+        if self.canli_kart is None or conversation_id != self.canli_konusma:
+            return
+        # Parçalar biriktirilip kare başına bir kez etikete yazılır
+        self.bekleyen_metin.append(delta)
+        if not self.akis_zamanlayici.isActive():
+            self.akis_zamanlayici.start()
+    
+    def flush_ai_deltas(self):
+        if self.canli_kart is None or not self.bekleyen_metin:
+            return
+        self.canli_kart.append_text("".join(self.bekleyen_metin))
+        self.bekleyen_metin = []
+        self.scroll_to_bottom()
+    
+    def finish_ai_message(self, conversation_id, text=None):
+        if self.canli_kart is None or conversation_id != self.canli_konusma:
+            return
+        self.akis_zamanlayici.stop()
+        self.bekleyen_metin = []
+        if text is not None:
+            self.canli_kart.set_text(text)
+        self.canli_kart = None
+        self.canli_konusma = None
+        self.scroll_to_bottom()
         
     def send_message_clicked(self):
         text = self.mesaj_input.toPlainText().strip()
@@ -1,9 +1,16 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea, QFrame, QHBoxLayout, QMenu, QLineEdit, QDialog, QSizePolicy, QMessageBox, QFileDialog
-from PyQt6.QtCore import pyqtSignal, Qt, QSize, QPropertyAnimation, QEasingCurve, QPoint
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea, QFrame, QHBoxLayout, QMenu, QLineEdit, QDialog, QSizePolicy, QMessageBox, QFileDialog, QListWidget, QListWidgetItem, QProgressDialog
+from PyQt6.QtCore import pyqtSignal, Qt, QSize, QPropertyAnimation, QEasingCurve, QPoint, QTimer, QThread
 from PyQt6.QtGui import QIcon, QFont, QAction, QColor, QPainter, QPainterPath
 
+import html
 import datetime
-from database import Conversation, get_db_session
+from database import Conversation, get_db_session, search, conversation_cache
+from database.transfer import export_history, import_history
+from database.context import context_builder
+from utils.async_utils import get_async_bridge, get_async_database
+
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_RESULT_LIMIT = 30
 
 class ConversationButton(QPushButton):
     rename_clicked = pyqtSignal()
@@ -38,11 +45,24 @@ class ConversationButton(QPushButton):
         title_label.setObjectName("titleLabel")
         text_layout.addWidget(title_label)
         
-        date_label = QLabel(self.conversation.created_at.strftime("%d.%m.%Y %H:%M"))
+        stats = self.conversation.stats
+        if stats and stats.message_count:
+            date_text = f"{stats.message_count} mesaj · {stats.last_message_at.strftime('%d.%m.%Y %H:%M')}"
+        else:
+            date_text = self.conversation.created_at.strftime("%d.%m.%Y %H:%M")
+        date_label = QLabel(date_text)
         date_label.setFont(QFont("Segoe UI", 8))
         date_label.setObjectName("dateLabel")
         text_layout.addWidget(date_label)
         
+        snippet_text = stats.last_snippet.strip() if stats and stats.last_snippet else ""
+        if snippet_text:
+            snippet_label = QLabel(snippet_text.splitlines()[0])
+            snippet_label.setFont(QFont("Segoe UI", 8))
+            snippet_label.setObjectName("dateLabel")
+            snippet_label.setTextFormat(Qt.TextFormat.PlainText)
+            text_layout.addWidget(snippet_label)
+        
         layout.addWidget(text_container, 1)
         
         self.rename_btn = QPushButton()
@@ -145,12 +165,65 @@ class ConversationButton(QPushButton):
             }}
         """
 
+class SearchWorker(QThread):
+    results_ready = pyqtSignal(int, object)
+    
+    def __init__(self, request_no, query, user_id, parent=None):
+        super().__init__(parent)
+        self.request_no = request_no
+        self.query = query
+        self.user_id = user_id
+    
+    def run(self):
+        session = get_db_session()
+        try:
+            results = search(session, self.query, self.user_id, SEARCH_RESULT_LIMIT)
+        except Exception as e:
+            print(f"Arama sırasında hata: {e}")
+            results = []
+        finally:
+            session.close()
+        self.results_ready.emit(self.request_no, results)
+
+class HistoryTransferWorker(QThread):
+    progress_changed = pyqtSignal(int, int)
+    transfer_finished = pyqtSignal(object)
+    transfer_failed = pyqtSignal(str)
+    
+    def __init__(self, direction, path, user_id, conversation_id=None, parent=None):
+        super().__init__(parent)
+        self.direction = direction
+        self.path = path
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+    
+    def report_progress(self, done, total):
+        self.progress_changed.emit(done, total)
+    
+    def run(self):
+        try:
+            if self.direction == "export":
+                stats = export_history(self.path, self.user_id, self.conversation_id, self.report_progress)
+            else:
+                stats = import_history(self.path, self.user_id, progress=self.report_progress)
+        except Exception as e:
+            self.transfer_failed.emit(str(e))
+            return
+        self.transfer_finished.emit(stats)
+
 class ConversationPanel(QWidget):
     konusma_secildi = pyqtSignal(object)
     
     def __init__(self, parent=None, tema_yonetici=None):
         super().__init__(parent)
         self.tema_yonetici = tema_yonetici
+        self.db = getattr(parent, 'db', None)
+        user = getattr(parent, 'user', None)
+        self.user_id = user.user_id if user is not None else None
+        self.arama_istek_no = 0
+        self.arama_isciler = []
+        self.aktarim_iscisi = None
+        self.yukleme_no = 0
         self.init_ui()
         self.load_conversations()
         
@@ -177,13 +250,39 @@ class ConversationPanel(QWidget):
         self.arsivle_btn = QPushButton()
         self.arsivle_btn.setIcon(QIcon("assets/icons/archive.png"))
         self.arsivle_btn.setObjectName("archiveButton")
+        self.arsivle_btn.setToolTip("Geçmişi dışa aktar")
         self.arsivle_btn.setFixedSize(44, 44)
         self.arsivle_btn.clicked.connect(self.archive_all_conversations)
         header_layout.addWidget(self.arsivle_btn)
         
+        self.ice_aktar_btn = QPushButton("⇪")
+        self.ice_aktar_btn.setObjectName("archiveButton")
+        self.ice_aktar_btn.setToolTip("Geçmişi içe aktar")
+        self.ice_aktar_btn.setFixedSize(44, 44)
+        self.ice_aktar_btn.clicked.connect(self.import_conversations)
+        header_layout.addWidget(self.ice_aktar_btn)
+        
         header_layout.addStretch()
         layout.addWidget(header)
         
+        self.arama_input = QLineEdit()
+        self.arama_input.setObjectName("searchInput")
+        self.arama_input.setPlaceholderText("Sohbetlerde ara...")
+        self.arama_input.setClearButtonEnabled(True)
+        self.arama_input.textChanged.connect(self.on_search_text_changed)
+        layout.addWidget(self.arama_input)
+        
+        self.arama_zamanlayici = QTimer(self)
+        self.arama_zamanlayici.setSingleShot(True)
+        self.arama_zamanlayici.setInterval(SEARCH_DEBOUNCE_MS)
+        self.arama_zamanlayici.timeout.connect(self.run_search)
+        
+        self.arama_sonuclari = QListWidget()
+        self.arama_sonuclari.setObjectName("searchResults")
+        self.arama_sonuclari.itemClicked.connect(self.open_search_result)
+        self.arama_sonuclari.hide()
+        layout.addWidget(self.arama_sonuclari)
+        
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -234,11 +333,96 @@ class ConversationPanel(QWidget):
             #conversationScrollArea QWidget {{
                 background-color: {renkler['arka_plan']};
             }}
+            
+            #searchInput {{
+                margin: 8px;
+            }}
+            
+            #searchResults {{
+                background-color: {renkler['arka_plan']};
+                border: none;
+            }}
+            
+            #searchResults::item {{
+                border-bottom: 1px solid {renkler['kenar']};
+            }}
+            
+            #searchResults::item:selected {{
+                background-color: {renkler['buton_hover']};
+            }}
         """
+    
+    def on_search_text_changed(self, text):
+        if not text.strip():
+            self.arama_zamanlayici.stop()
+            self.arama_istek_no += 1
+            self.arama_sonuclari.clear()
+            self.arama_sonuclari.hide()
+            self.scroll_area.show()
+            return
+        self.arama_zamanlayici.start()
+    
+    def run_search(self):
+        query = self.arama_input.text().strip()
+        if not query:
+            return
+        
+        self.arama_istek_no += 1
+        worker = SearchWorker(self.arama_istek_no, query, self.user_id, self)
+        worker.results_ready.connect(self.show_search_results)
+        worker.finished.connect(lambda: self.arama_isciler.remove(worker))
+        self.arama_isciler.append(worker)
+        worker.start()
+    
+    def show_search_results(self, request_no, results):
+        if request_no != self.arama_istek_no:
+            return
+        
+        self.arama_sonuclari.clear()
+        for result in results:
+            snippet = html.escape(result['snippet'] or "").replace("&lt;b&gt;", "<b>").replace("&lt;/b&gt;", "</b>")
+            label = QLabel(f"<b>{html.escape(result['conversation_name'])}</b><br>{snippet}")
+            label.setTextFormat(Qt.TextFormat.RichText)
+            label.setWordWrap(True)
+            label.setContentsMargins(8, 6, 8, 6)
+            
+            item = QListWidgetItem()
+            item.setData(Qt.ItemDataRole.UserRole, result['conversation_id'])
+            item.setSizeHint(label.sizeHint())
+            self.arama_sonuclari.addItem(item)
+            self.arama_sonuclari.setItemWidget(item, label)
+        
+        if not results:
+            self.arama_sonuclari.addItem("Sonuç bulunamadı")
+        
+        self.scroll_area.hide()
+        self.arama_sonuclari.show()
+    
+    def open_search_result(self, item):
+        conversation_id = item.data(Qt.ItemDataRole.UserRole)
+        if not conversation_id:
+            return
+        
+        conversation = conversation_cache.get(conversation_id)
+        if conversation is None:
+            session = get_db_session()
+            try:
+                conversation = conversation_cache.load(lambda: session.get(Conversation, conversation_id))
+            finally:
+                session.close()
+        
+        if conversation:
+            self.konusma_secildi.emit(conversation)
         
     def load_conversations(self):
+        self.yukleme_no += 1
+        get_async_bridge().start(self.load_conversations_async(self.yukleme_no))
+    
+    async def load_conversations_async(self, yukleme_no):
+        conversations = await get_async_bridge().call(get_async_database().get_conversations())
+        if yukleme_no != self.yukleme_no:
+            return
         self.clear_conversations()
-        conversations = self.parent().db.get_conversations()
         for conversation in conversations:
             self.add_conversation_button(conversation)
             
@@ -298,7 +482,7 @@ class ConversationPanel(QWidget):
         if not title.strip():
             return
             
-        conversation = self.parent().db.create_conversation(title)
+        conversation = self.db.create_conversation(title)
         self.add_conversation_button(conversation)
         self.conversation_clicked(conversation)
         dialog.accept()
@@ -336,7 +520,7 @@ class ConversationPanel(QWidget):
             return
             
         conversation.title = new_title
-        self.parent().db.update_conversation(conversation)
+        self.db.update_conversation(conversation)
         self.load_conversations()
         dialog.accept()
         
@@ -350,43 +534,80 @@ class ConversationPanel(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.parent().db.delete_conversation(conversation)
+            self.db.delete_conversation(conversation)
+            context_builder.forget(conversation.conversation_id)
             self.load_conversations()
             
     def archive_conversation(self, conversation):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
-            "Konuşmayı Kaydet",
-            f"{conversation.title}.txt",
-            "Metin Dosyası (*.txt)"
+            "Konuşmayı Dışa Aktar",
+            f"{conversation.name}.jsonl",
+            "JSON Lines (*.jsonl)"
         )
         
         if file_path:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(f"Konuşma: {conversation.title}\n")
-                f.write(f"Tarih: {conversation.created_at}\n\n")
-                
-                for message in conversation.messages:
-                    sender = "Siz" if message.sender == "user" else "Yapay Zeka"
-                    f.write(f"{sender}: {message.text}\n\n")
+            self.start_transfer("export", file_path, conversation.conversation_id)
                     
     def archive_all_conversations(self):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
-            "Tüm Konuşmaları Kaydet",
-            "konusmalar.txt",
-            "Metin Dosyası (*.txt)"
+            "Tüm Konuşmaları Dışa Aktar",
+            "konusmalar.jsonl",
+            "JSON Lines (*.jsonl)"
         )
         
         if file_path:
-            with open(file_path, "w", encoding="utf-8") as f:
-                conversations = self.parent().db.get_conversations()
-                for conversation in conversations:
-                    f.write(f"Konuşma: {conversation.title}\n")
-                    f.write(f"Tarih: {conversation.created_at}\n\n")
-                    
-                    for message in conversation.messages:
-                        sender = "Siz" if message.sender == "user" else "Yapay Zeka"
-                        f.write(f"{sender}: {message.text}\n\n")
-                        
-                    f.write("-" * 50 + "\n\n") 
\ No newline at end of file
+            self.start_transfer("export", file_path)
+    
+    def import_conversations(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Konuşmaları İçe Aktar",
+            "",
+            "JSON Lines (*.jsonl)"
+        )
+        
+        if file_path:
+            self.start_transfer("import", file_path)
+    
+    def start_transfer(self, direction, file_path, conversation_id=None):
+        if self.aktarim_iscisi is not None and self.aktarim_iscisi.isRunning():
+            QMessageBox.information(self, "Aktarım", "Devam eden bir aktarım var.")
+            return
+        
+        baslik = "Dışa aktarılıyor..." if direction == "export" else "İçe aktarılıyor..."
+        self.aktarim_ilerleme = QProgressDialog(baslik, None, 0, 1000, self)
+        self.aktarim_ilerleme.setWindowTitle("Aktarım")
+        self.aktarim_ilerleme.setMinimumDuration(300)
+        self.aktarim_ilerleme.setValue(0)
+        
+        self.aktarim_iscisi = HistoryTransferWorker(direction, file_path, self.user_id, conversation_id, self)
+        self.aktarim_iscisi.progress_changed.connect(self.on_transfer_progress)
+        self.aktarim_iscisi.transfer_finished.connect(lambda stats: self.on_transfer_finished(direction, stats))
+        self.aktarim_iscisi.transfer_failed.connect(self.on_transfer_failed)
+        self.aktarim_iscisi.start()
+    
+    def on_transfer_progress(self, done, total):
+        if total:
+            self.aktarim_ilerleme.setValue(int(done * 1000 / total))
+    
+    def on_transfer_finished(self, direction, stats):
+        self.aktarim_ilerleme.close()
+        if direction == "import":
+            self.load_conversations()
+            QMessageBox.information(
+                self, "İçe Aktarma",
+                f"{stats['conversations']} konuşma ve {stats['messages']} mesaj içe aktarıldı, "
+                f"{stats['skipped']} kayıt zaten vardı."
+                + (f" Başka bir kullanıcının konuşmasına ait {stats['rejected']} mesaj atlandı." if stats['rejected'] else "")
+            )
+        else:
+            QMessageBox.information(
+                self, "Dışa Aktarma",
+                f"{stats['conversations']} konuşma ve {stats['messages']} mesaj dışa aktarıldı."
+            )
+    
+    def on_transfer_failed(self, error):
+        self.aktarim_ilerleme.close()
+        QMessageBox.warning(self, "Aktarım", f"Aktarım başarısız: {error}")
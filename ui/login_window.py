@@ -1,15 +1,15 @@
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QStackedWidget, QMessageBox, QFrame, QProgressBar
 from PyQt6.QtCore import Qt, QSize, pyqtSignal, QPropertyAnimation, QEasingCurve, QTimer, QRect, pyqtProperty
 from PyQt6.QtGui import QIcon, QPixmap, QFont, QColor, QPainter, QRadialGradient, QBrush, QLinearGradient, QPainterPath
-import json
 import os
 import math
 import random
 import time
 
-from database import User, get_db_session
-from utils.email_utils import email_manager
+from database import User, get_db_session, find_user, user_cache
+from utils.services import email_manager
 from utils.animation_utils import AnimatableWidget
+from utils.config_utils import config
 import validators
 
 class AnimatedLogo(AnimatableWidget):
@@ -412,12 +412,9 @@ class LoginWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        with open('settings.json', 'r', encoding='utf-8') as f:
-            self.settings = json.load(f)
-        
-        self.app_name = self.settings['app_name']
+        self.app_name = config.get('app_name')
         self.is_dark_theme = True
-        self.theme = self.settings['ui']['theme']['dark']
+        self.theme = config.get('ui.theme.dark')
         self.pending_verification_user = None
         
         self.setWindowTitle(self.app_name)
@@ -428,11 +425,23 @@ class LoginWindow(QMainWindow):
         
         self.init_ui()
         self.apply_styles()
+        config.value_changed.connect(self.on_setting_changed)
+        config.section_changed.connect(self.on_settings_changed)
         
         self.login_successful.connect(self.on_login_successful)
         
         self.start_intro_animation()
     
+    def on_setting_changed(self, key, value):
+        if key == "app_name":
+            self.app_name = value
+            self.setWindowTitle(value)
+    
+    def on_settings_changed(self, section, value):
+        if section == "ui.theme":
+            self.theme = config.get('ui.theme.dark' if self.is_dark_theme else 'ui.theme.light')
+            self.apply_styles()
+    
     def init_ui(self):
         central_widget = QWidget()
         main_layout = QVBoxLayout(central_widget)
@@ -788,10 +797,10 @@ class LoginWindow(QMainWindow):
     def toggle_theme(self):
         if self.is_dark_theme:
             self.is_dark_theme = False
-            self.theme = self.settings['ui']['theme']['light']
+            self.theme = config.get('ui.theme.light')
         else:
             self.is_dark_theme = True
-            self.theme = self.settings['ui']['theme']['dark']
+            self.theme = config.get('ui.theme.dark')
         
         self.update_theme_button_icon()
         
@@ -883,7 +892,7 @@ class LoginWindow(QMainWindow):
             return
         try:
             session = get_db_session()
-            user = session.query(User).filter((User.email == email_or_username) | (User.username == email_or_username)).first()
+            user = find_user(session, email_or_username)
             
             if not user:
                 QMessageBox.warning(self, "Hata", "Kullanıcı bulunamadı.")
@@ -987,6 +996,7 @@ class LoginWindow(QMainWindow):
                 user.verification_code = None
                 session.commit()
                 session.close()
+                user_cache.invalidate(user.user_id)
                 
                 QMessageBox.information(self, "Başarılı", "Hesabınız başarıyla doğrulandı. Şimdi giriş yapabilirsiniz.")
                 self.stacked_widget.setCurrentIndex(0)
@@ -1074,6 +1084,7 @@ class LoginWindow(QMainWindow):
             
             session.commit()
             session.close()
+            user_cache.invalidate(user.user_id)
             
             QMessageBox.information(self, "Başarılı", "Parolanız başarıyla sıfırlandı. Şimdi giriş yapabilirsiniz.")
             
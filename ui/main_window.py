@@ -2,15 +2,17 @@ from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPus
 from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer, QPoint, QPropertyAnimation, QEasingCurve, QEvent, QByteArray, QRect, QSettings
 from PyQt6.QtGui import QIcon, QFont, QMovie, QAction, QPixmap, QKeySequence, QShortcut, QColor, QPalette, QPainter, QPainterPath, QPolygon, QLinearGradient, QBrush, QPen, QImage, QFontDatabase, QCursor
 
-import json
 import os
 import datetime
 import tempfile
+from collections import deque
 
 from ui.chat_panel import ChatPanel
 from ui.conversation_panel import ConversationPanel
 from database import User, Message, Conversation, get_db_session, Database
-from utils.openai_utils import chatgpt_manager
+from database.writer import queue_message, queue_response_update, stop_write_queue
+from utils.services import chatgpt_manager
+from utils.config_utils import config
 
 class PanelCollapseButton(QPushButton):
     def __init__(self, direction, parent=None):
@@ -222,12 +224,8 @@ class TemaYoneticisi:
             }
         }
         
-        try:
-            with open("ayarlar.json", "r", encoding="utf-8") as f:
-                ayarlar = json.load(f)
-                varsayilan_tema = ayarlar.get("sistem", {}).get("tema", "koyu")
-                self.aktif_tema = self.ayarlar.value("tema", varsayilan_tema)
-        except Exception:
+        self.aktif_tema = self.ayarlar.value("tema", config.get('ui.default_theme'))
+        if self.aktif_tema not in self.temalar:
             self.aktif_tema = "koyu"
     
     def tema_degistir(self, tema_adi):
@@ -401,9 +399,14 @@ class TemaYoneticisi:
         return css
 
 class MainWindow(QMainWindow):
+    kayit_basarisiz = pyqtSignal(str)
+    
     def __init__(self, user):
         super().__init__()
         self.user = user
+        self.current_conversation = None
+        self.bekleyen_yanitlar = {}
+        self.aktif_mod = "Normal"
         self.db = Database()
         self.tema_yoneticisi = TemaYoneticisi()
         self.setWindowTitle("DinamikChat")
@@ -412,6 +415,16 @@ class MainWindow(QMainWindow):
         
         self.init_ui()
         self.tema_uygula()
+        config.value_changed.connect(self.on_setting_changed)
+        chatgpt_manager.response_started.connect(self.on_response_started)
+        chatgpt_manager.token_received.connect(self.chat_panel.append_ai_delta)
+        chatgpt_manager.response_completed.connect(self.on_response_completed)
+        chatgpt_manager.response_failed.connect(self.on_response_failed)
+        self.kayit_basarisiz.connect(self.on_save_failed)
+    
+    def on_setting_changed(self, key, value):
+        if key == "ui.default_theme" and self.tema_yoneticisi.tema_degistir(value):
+            self.tema_uygula()
     
     def tema_uygula(self):
         self.setStyleSheet(self.tema_yoneticisi.css_degiskenler())
@@ -601,31 +614,17 @@ class MainWindow(QMainWindow):
         modes_menu.setObjectName("customMenu")
         modes_menu.setMinimumWidth(200)
         
-        normal_action = QAction("Normal", modes_menu)
-        normal_action.setCheckable(True)
-        normal_action.setChecked(True)
-        modes_menu.addAction(normal_action)
-        
-        edebi_action = QAction("Edebi", modes_menu)
-        edebi_action.setCheckable(True)
-        modes_menu.addAction(edebi_action)
-        
-        ogretici_action = QAction("Öğretici", modes_menu)
-        ogretici_action.setCheckable(True)
-        modes_menu.addAction(ogretici_action)
-        
-        uzman_action = QAction("Uzman", modes_menu)
-        uzman_action.setCheckable(True)
-        modes_menu.addAction(uzman_action)
-        
-        teknik_action = QAction("Teknik", modes_menu)
-        teknik_action.setCheckable(True)
-        modes_menu.addAction(teknik_action)
+        for mod in ("Normal", "Edebi", "Öğretici", "Uzman", "Teknik"):
+            mod_action = QAction(mod, modes_menu)
+            mod_action.setCheckable(True)
+            mod_action.setChecked(mod == self.aktif_mod)
+            modes_menu.addAction(mod_action)
         
         pos = self.normal_btn.mapToGlobal(QPoint(0, self.normal_btn.height()))
         action = modes_menu.exec(pos)
         
         if action:
+            self.aktif_mod = action.text()
             self.normal_btn.setText(action.text())
     
     def show_admin_menu(self):
@@ -693,18 +692,7 @@ class MainWindow(QMainWindow):
             return
         
         self.current_conversation = conversation
-        
-        session = get_db_session()
-        messages = session.query(Message).filter(Message.conversation_id == conversation.conversation_id).order_by(Message.message_date).all()
-        self.chat_panel.clear_messages()
-        
-        for message in messages:
-            self.chat_panel.add_user_message(message.message_content)
-            if message.response_message:
-                self.chat_panel.add_ai_message(message.response_message)
-        
-        session.close()
-        self.chat_panel.scroll_to_bottom()
+        self.chat_panel.set_conversation(conversation)
     
     def handle_user_message(self, message):
         if not message.strip():
@@ -718,31 +706,49 @@ class MainWindow(QMainWindow):
             if not self.current_conversation:
                 return
         
-        session = get_db_session()
-        new_message = Message(
-            message_id=Message.generate_message_id(),
-            conversation_id=self.current_conversation.conversation_id,
-            message_content=message
-        )
-        
-        session.add(new_message)
-        session.commit()
-        
+        new_message, future = queue_message(self.current_conversation.conversation_id, message)
+        self.kaydi_izle(future)
         self.get_ai_response(new_message)
-        session.close()
+    
+    def kaydi_izle(self, future):
+        # Geri çağrı yazma iş parçacığında çalışır; sinyal uyarıyı arayüz iş parçacığına taşır
+        def on_done(future):
+            if future.exception() is not None:
+                self.kayit_basarisiz.emit(str(future.exception()))
+        future.add_done_callback(on_done)
+    
+    def on_save_failed(self, error):
+        QMessageBox.warning(self, "Kayıt Hatası", f"Bir mesaj veritabanına kaydedilemedi ve konuşma geçmişinde görünmeyecek.\n\n{error}")
     
     def get_ai_response(self, message):
-        def handle_response(response):
-            self.chat_panel.add_ai_message(response)
-            
-            session = get_db_session()
-            db_message = session.query(Message).filter_by(message_id=message.message_id).first()
-            if db_message:
-                db_message.response_message = response
-                session.commit()
-            session.close()
-        
-        chatgpt_manager.get_response(message.message_content, handle_response)
+        # Yanıtlar konuşma başına gönderildikleri sırayla gelir
+        self.bekleyen_yanitlar.setdefault(message.conversation_id, deque()).append(message)
+        system_prompt = config.get('api.openai.modes').get(self.aktif_mod)
+        # Geçmiş token bütçesine göre işçi iş parçacığında son mesajlardan ve önbellekteki özetten kurulur
+        chatgpt_manager.stream_response(message.conversation_id, message.message_content, system_prompt, context=message)
+    
+    def _pop_pending(self, conversation_id):
+        pending = self.bekleyen_yanitlar.get(conversation_id)
+        if not pending:
+            return None
+        message = pending.popleft()
+        if not pending:
+            del self.bekleyen_yanitlar[conversation_id]
+        return message
+    
+    def on_response_started(self, conversation_id):
+        if self.current_conversation and conversation_id == self.current_conversation.conversation_id:
+            self.chat_panel.begin_ai_message(conversation_id)
+    
+    def on_response_completed(self, conversation_id, response, usage):
+        message = self._pop_pending(conversation_id)
+        if message is not None:
+            self.kaydi_izle(queue_response_update(message.message_id, response))
+        self.chat_panel.finish_ai_message(conversation_id, response)
+    
+    def on_response_failed(self, conversation_id, error):
+        self._pop_pending(conversation_id)
+        self.chat_panel.finish_ai_message(conversation_id)
     
     def handle_voice_recording(self, file_path):
         if not file_path or not os.path.exists(file_path):
@@ -756,27 +762,14 @@ class MainWindow(QMainWindow):
             if not self.current_conversation:
                 return
         
-        session = get_db_session()
-        new_message = Message(
-            message_id=Message.generate_message_id(),
-            conversation_id=self.current_conversation.conversation_id,
-            message_content="[Sesli Mesaj]"
-        )
-        
-        session.add(new_message)
-        session.commit()
+        new_message, future = queue_message(self.current_conversation.conversation_id, "[Sesli Mesaj]")
+        self.kaydi_izle(future)
         
         QMessageBox.information(self, "Ses Kaydı", "Ses kaydı alındı. (Bu özellik henüz tam olarak çalışmıyor)")
         
         response = "Sesli mesaj özelliği şu anda geliştirme aşamasındadır. Yakında sesli mesajlar da anlaşılacak."
         self.chat_panel.add_ai_message(response)
-        
-        db_message = session.query(Message).filter_by(message_id=new_message.message_id).first()
-        if db_message:
-            db_message.response_message = response
-            session.commit()
-        
-        session.close()
+        self.kaydi_izle(queue_response_update(new_message.message_id, response))
         
         try:
             os.remove(file_path)
@@ -790,6 +783,7 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            stop_write_queue()
             event.accept()
         else:
             event.ignore() 
\ No newline at end of file
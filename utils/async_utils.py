@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal, Qt
+
+class Pending:
+    def __init__(self, future):
+        self.future = future
+
+    def __await__(self):
+        return (yield self.future)
+
+class AsyncBridge(QObject):
+    resumed = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="asyncio-bridge", daemon=True)
+        self.thread.start()
+        self.resumed.connect(self._resume, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call(self, coroutine):
+        # Sorgu asyncio döngüsünde çalışır, sonucu bekleyen arayüz kodu GUI iş parçacığında devam eder
+        return Pending(self.submit(coroutine))
+
+    def start(self, coroutine):
+        self._step(coroutine, None, None)
+
+    def _step(self, coroutine, value, error):
+        try:
+            if error is not None:
+                awaited = coroutine.throw(error)
+            else:
+                awaited = coroutine.send(value)
+        except StopIteration:
+            return
+        except Exception as e:
+            print(f"Asenkron arayüz görevi başarısız: {e}")
+            return
+        awaited.add_done_callback(lambda future: self.resumed.emit(coroutine, future))
+
+    def _resume(self, coroutine, future):
+        error = future.exception()
+        self._step(coroutine, None if error is not None else future.result(), error)
+
+    def stop(self):
+        if not self.loop.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+async_bridge = None
+async_database = None
+
+def get_async_bridge():
+    global async_bridge
+    if async_bridge is None:
+        async_bridge = AsyncBridge()
+    return async_bridge
+
+def get_async_database():
+    global async_database
+    if async_database is None:
+        from database.async_database import AsyncDatabase
+        async_database = AsyncDatabase()
+    return async_database
+
+def stop_async_bridge():
+    global async_bridge, async_database
+    if async_bridge is None:
+        return
+    if async_database is not None:
+        async_bridge.submit(async_database.dispose()).result(timeout=5)
+        async_database = None
+    async_bridge.stop()
+    async_bridge = None
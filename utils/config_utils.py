@@ -0,0 +1,196 @@
+import os
+import re
+import copy
+import json
+import threading
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+SETTINGS_FILE = 'settings.json'
+RELOAD_DELAY_MS = 200
+THEMES = ("koyu", "acik")
+# Yalnızca /completions uç noktasını destekleyen modeller sohbet isteklerinde 404 döner
+COMPLETION_ONLY_MODEL = re.compile(r"-instruct\b|^(text-|code-)?(davinci|curie|babbage|ada)\b")
+
+def _positive(value):
+    return value > 0
+
+def is_chat_model(model):
+    return isinstance(model, str) and bool(model) and not COMPLETION_ONLY_MODEL.search(model)
+
+SCHEMA = {
+    "app_name": (str, "DinamikChat", None),
+    "version": (str, "1.0.0", None),
+    "database": (dict, {}, None),
+    "ui.theme.dark": (dict, {}, None),
+    "ui.theme.light": (dict, {}, None),
+    "ui.default_theme": (str, "koyu", lambda value: value in THEMES),
+    "ui.modes": (dict, {}, None),
+    "api.openai.model": (str, "gpt-3.5-turbo", None),
+    "api.openai.api_key": (str, "OPENAI_API_KEY", None),
+    "api.openai.base_url": (str, "https://api.openai.com/v1", None),
+    "api.openai.temperature": ((int, float), 0.7, lambda value: 0 <= value <= 2),
+    "api.openai.max_tokens": (int, 2000, _positive),
+    "api.openai.fallback_models": (list, [], lambda value: all(is_chat_model(model) for model in value)),
+    "api.openai.scheduler": (dict, {}, None),
+    "api.openai.transport": (dict, {}, None),
+    "api.openai.cache": (dict, {}, None),
+    "api.openai.modes": (dict, {}, None),
+    "api.openai.context": (dict, {}, None),
+    "email.user": (str, "", None),
+    "email.password": (str, "", None),
+    "email.smtp_server": (str, "smtp.gmail.com", None),
+    "email.smtp_port": (int, 587, _positive),
+    "email.verification": (dict, {}, None),
+    "email.password_reset": (dict, {}, None),
+    "model.default_path": (str, "assets/models/head.obj", None),
+    "storage.chat_history": (dict, {}, None),
+    "startup.trace_file": (str, "", None)
+}
+
+_MISSING = object()
+
+def get_path(data, key, default=None):
+    value = data
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
+
+def set_path(data, key, value):
+    parts = key.split(".")
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = value
+
+def validate(data):
+    errors = []
+    for key, (types, default, check) in SCHEMA.items():
+        value = get_path(data, key, _MISSING)
+        if value is _MISSING:
+            continue
+        if not isinstance(value, types) or isinstance(value, bool) and types is not bool:
+            errors.append((key, f"{key}: beklenmeyen tür {type(value).__name__}"))
+        elif check is not None and not check(value):
+            errors.append((key, f"{key}: geçersiz değer {value!r}"))
+    return errors
+
+def flatten(data, prefix=""):
+    leaves = {}
+    for name, value in data.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict) and value:
+            leaves.update(flatten(value, f"{key}."))
+        else:
+            leaves[key] = value
+    return leaves
+
+class ConfigService(QObject):
+    value_changed = pyqtSignal(str, object)
+    section_changed = pyqtSignal(str, object)
+    reloaded = pyqtSignal()
+    reload_failed = pyqtSignal(str)
+
+    def __init__(self, path=SETTINGS_FILE):
+        super().__init__()
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+        self.watcher = None
+        self.reload_timer = None
+        self.stamp = None
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self):
+        self.stamp = self._stamp()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("Ayar dosyasının kökü bir nesne olmalı")
+        return data
+
+    def load(self):
+        with self._lock:
+            if self._data is not None:
+                return self._data
+            try:
+                data = self._read()
+            except Exception as e:
+                print(f"Ayarlar okunamadı, varsayılanlar kullanılacak: {e}")
+                data = {}
+            for key, message in validate(data):
+                print(f"Geçersiz ayar varsayılanla değiştirildi: {message}")
+                set_path(data, key, copy.deepcopy(SCHEMA[key][1]))
+            self._data = data
+            return data
+
+    def get(self, key, default=_MISSING):
+        if default is _MISSING:
+            default = copy.deepcopy(SCHEMA[key][1]) if key in SCHEMA else None
+        return get_path(self._data if self._data is not None else self.load(), key, default)
+
+    def reload(self):
+        try:
+            data = self._read()
+        except Exception as e:
+            print(f"Ayarlar yeniden yüklenemedi: {e}")
+            self.reload_failed.emit(str(e))
+            return []
+        errors = validate(data)
+        if errors:
+            message = "; ".join(message for _, message in errors)
+            print(f"Ayar dosyası şemaya uymuyor, önceki ayarlar korunuyor: {message}")
+            self.reload_failed.emit(message)
+            return []
+        old = flatten(self.load())
+        with self._lock:
+            self._data = data
+        new = flatten(data)
+        changed = sorted(key for key in old.keys() | new.keys() if old.get(key, _MISSING) != new.get(key, _MISSING))
+        sections = set()
+        for key in changed:
+            self.value_changed.emit(key, new.get(key))
+            parts = key.split(".")
+            sections.update(".".join(parts[:i]) for i in range(1, len(parts)))
+        for section in sorted(sections, key=lambda name: -name.count(".")):
+            self.section_changed.emit(section, get_path(data, section))
+        if changed:
+            self.reloaded.emit()
+        return changed
+
+    def watch(self):
+        if self.watcher is not None:
+            return
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.on_reload_timeout)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPath(os.path.dirname(os.path.abspath(self.path)))
+        if os.path.exists(self.path):
+            self.watcher.addPath(os.path.abspath(self.path))
+        self.watcher.fileChanged.connect(lambda path: self.reload_timer.start())
+        self.watcher.directoryChanged.connect(lambda path: self.reload_timer.start())
+
+    def on_reload_timeout(self):
+        # Editörler dosyayı yeniden adlandırarak kaydettiğinde izleme düşer, tekrar eklenir
+        path = os.path.abspath(self.path)
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+        if self._stamp() != self.stamp:
+            self.reload()
+
+    def unwatch(self):
+        if self.watcher is None:
+            return
+        self.reload_timer.stop()
+        self.watcher.deleteLater()
+        self.watcher = None
+
+config = ConfigService()
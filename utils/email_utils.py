@@ -5,15 +5,17 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import threading
-import json
+from utils.config_utils import config
 
 class EmailManager:
     def __init__(self):
         self.verification_codes = {}
-        with open('settings.json', 'r', encoding='utf-8') as f:
-            settings = json.load(f)
-        
-        self.email_settings = settings['email']
+        self.email_settings = config.get('email')
+        config.section_changed.connect(self.on_settings_changed)
+    
+    def on_settings_changed(self, section, value):
+        if section == "email":
+            self.email_settings = value
         
     def generate_verification_code(self, email):
         code = ''.join(random.choices(string.digits, k=6))
@@ -179,5 +181,3 @@ class EmailManager:
         email_thread = threading.Thread(target=send_email)
         email_thread.daemon = True
         email_thread.start()
-
-email_manager = EmailManager() 
\ No newline at end of file
@@ -0,0 +1,114 @@
+import time
+import random
+import threading
+import email.utils
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_TRANSPORT = {
+    "pool_size": 8,
+    "max_retries": 3,
+    "backoff_base_ms": 500,
+    "backoff_max_ms": 8000,
+    "connect_timeout": 10,
+    "read_timeout": 60,
+    "deadline_seconds": 120
+}
+
+def retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HttpTransport:
+    def __init__(self, settings=None):
+        self.lock = threading.Lock()
+        self.session = None
+        self.attempts = 0
+        self.retries = 0
+        self.configure(settings)
+
+    def configure(self, settings=None):
+        settings = dict(DEFAULT_TRANSPORT, **(settings or {}))
+        self.max_retries = max(0, int(settings['max_retries']))
+        self.backoff_base = settings['backoff_base_ms'] / 1000
+        self.backoff_max = settings['backoff_max_ms'] / 1000
+        self.connect_timeout = settings['connect_timeout']
+        self.read_timeout = settings['read_timeout']
+        self.deadline_seconds = settings['deadline_seconds']
+        if self.session is not None and settings['pool_size'] == self.pool_size:
+            return
+        self.pool_size = settings['pool_size']
+        # Yeniden denemeler burada yapılır, urllib3'ün kendi denemeleri kapalıdır
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        old, self.session = self.session, session
+        if old is not None:
+            old.close()
+
+    def backoff(self, attempt, response=None):
+        if response is not None:
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                return delay
+        # Tam titremeli üstel bekleme, aynı anda düşen istemcilerin aynı anda dönmesini önler
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def deadline(self, seconds=None):
+        return time.monotonic() + (self.deadline_seconds if seconds is None else seconds)
+
+    def request(self, method, url, deadline=None, **kwargs):
+        deadline = self.deadline() if deadline is None else deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout(f"İstek süresi doldu: {url}")
+            timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+            with self.lock:
+                self.attempts += 1
+            response = None
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                # Kısa hata gövdesi okunursa bağlantı kapanmadan havuza döner
+                response.content
+                response.close()
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+            delay = self.backoff(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                if response is not None:
+                    raise requests.HTTPError(f"{response.status_code} yanıtı, süre dolmadan yeniden denenemedi", response=response)
+                raise requests.Timeout(f"İstek süresi doldu: {url}")
+            with self.lock:
+                self.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def metrics(self):
+        with self.lock:
+            return {"attempts": self.attempts, "retries": self.retries, "pool_size": self.pool_size}
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+http_transport = HttpTransport()
@@ -1,8 +1,8 @@
 import numpy as np
-import json
 import os
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 import pyttsx3
+from utils.config_utils import config
 
 class ModelManager(QObject):
     speech_started = pyqtSignal()
@@ -10,10 +10,7 @@ class ModelManager(QObject):
     
     def __init__(self):
         super().__init__()
-        with open('settings.json', 'r', encoding='utf-8') as f:
-            settings = json.load(f)
-        
-        self.model_path = settings['model']['default_path']
+        self.model_path = config.get('model.default_path')
         self.vertices = []
         self.faces = []
         self.normals = []
@@ -31,6 +28,17 @@ class ModelManager(QObject):
                 break
         
         self._load_model()
+        config.value_changed.connect(self.on_settings_changed)
+    
+    def on_settings_changed(self, key, value):
+        if key == "model.default_path" and value != self.model_path:
+            self.model_path = value
+            self.vertices = []
+            self.faces = []
+            self.normals = []
+            self.texture_coords = []
+            self.is_model_loaded = False
+            self._load_model()
     
     def _load_model(self):
         try:
@@ -214,5 +222,3 @@ class ModelManager(QObject):
             rotated_normals.append(rotated_n.tolist())
             
         return rotated_normals
-
-model_manager = ModelManager() 
\ No newline at end of file
@@ -6,110 +6,286 @@ import requests
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 import random
 import re
+import itertools
+from utils.config_utils import config
+from utils.scheduler_utils import RequestScheduler, DEFAULT_SCHEDULER, PRIORITY_NORMAL
+from utils.http_utils import http_transport, RETRY_STATUSES
+from database.response_cache import response_cache, cache_key
+from database.context import context_builder
+
+FAILOVER_STATUSES = RETRY_STATUSES + (404,)
+
+def iter_sse_events(lines):
+    # Olaylar boş satırla ayrılır, çok satırlı data alanları birleştirilir, ':' ile başlayanlar yorumdur
+    data = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+def simulated_response(message):
+    if "nasılsın" in message.lower():
+        response = "İyiyim, teşekkür ederim! Size nasıl yardımcı olabilirim?"
+    elif "selam" in message.lower() or "merhaba" in message.lower():
+        response = "Merhaba! Size nasıl yardımcı olabilirim?"
+    elif "nedir" in message.lower():
+        topic = re.search(r"([a-zğüşıöçA-ZĞÜŞİÖÇ]+)\s+nedir", message.lower())
+        if topic:
+            topic = topic.group(1)
+            response = f"{topic.capitalize()}, belirli bir kavram veya nesnenin açıklamasıdır. Daha spesifik bilgi için lütfen sorunuzu detaylandırın."
+        else:
+            response = "Neyi açıklamamı istersiniz? Lütfen sorunuzu detaylandırın."
+    elif "yapay zeka" in message.lower() or "ai" in message.lower():
+        response = "Yapay zeka, insan zekasını taklit eden ve toplanan verilere göre yinelemeli olarak kendini geliştirebilen sistemlerdir. Bilgisayar bilimi dalıdır."
+    elif "yardım" in message.lower():
+        response = "Size şu konularda yardımcı olabilirim:\n- Sorularınızı yanıtlama\n- Bilgi verme\n- Önerilerde bulunma\n- Metin oluşturma\n\nNasıl yardımcı olabilirim?"
+    elif "hava durumu" in message.lower():
+        response = "Maalesef gerçek zamanlı hava durumu verilerine erişimim yok. Ancak güncel hava durumu için bir hava durumu sitesini veya uygulamasını kontrol edebilirsiniz."
+    elif "saat" in message.lower():
+        response = "Şu anki saati göremiyorum, ancak cihazınızın saatini kontrol edebilirsiniz."
+    elif "teşekkür" in message.lower():
+        response = "Rica ederim! Başka bir konuda yardıma ihtiyacınız olursa lütfen sorun."
+    elif "dinle" in message.lower() or "ses" in message.lower() or "müzik" in message.lower():
+        response = "Ses çalma veya müzik dinleme özelliğim henüz mevcut değil."
+    elif "göster" in message.lower() or "resim" in message.lower() or "fotoğraf" in message.lower():
+        response = "Görsel içerik gösterme özelliğim henüz mevcut değil."
+    else:
+        responses = [
+            "Bu konu hakkında size yardımcı olmak isterim. Daha fazla detay verebilir misiniz?",
+            "İlginç bir soru. Bu konu üzerinde biraz daha konuşabilir miyiz?",
+            "Anladığım kadarıyla bu konuyla ilgileniyorsunuz. Size nasıl yardımcı olabilirim?",
+            "Bu sorunuzu yanıtlamak için elimden geleni yapacağım. Biraz daha açıklayabilir misiniz?",
+            "Bu konuda size yardımcı olmaktan memnuniyet duyarım. Tam olarak neyi bilmek istiyorsunuz?"
+        ]
+        response = random.choice(responses)
+    return response
 
 class OpenAIChatManager(QObject):
     response_received = pyqtSignal(str)
+    token_received = pyqtSignal(object, str)
+    response_completed = pyqtSignal(object, str, dict)
+    response_failed = pyqtSignal(object, str)
+    response_started = pyqtSignal(object)
+    queue_depth_changed = pyqtSignal(int)
     
     def __init__(self):
         super().__init__()
         
-        self.load_settings()
-        self.waiting_for_response = False
-        self.current_message_id = None
-        self.abort_current = False
+        self.scheduler = None
+        self.request_ids = itertools.count(1)
+        self.active = {}
+        self.aborted = set()
         self.lock = threading.Lock()
+        self.load_settings()
+        config.section_changed.connect(self.on_settings_changed)
     
     def load_settings(self):
-        try:
-            with open('settings.json', 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-            if 'api' in settings and 'openai' in settings['api']:
-                self.api_key = settings['api']['openai']['api_key']
-                self.model = settings['api']['openai']['model']
-                self.temperature = settings['api']['openai']['temperature']
-                self.max_tokens = settings['api']['openai']['max_tokens']
-            else:
-                self.api_key = "OPENAI_API_KEY"
-                self.model = "gpt-3.5-turbo"
-                self.temperature = 0.7
-                self.max_tokens = 2000
-        except Exception as e:
-            print(f"Ayarlar yüklenirken hata oluştu: {e}")
-            self.api_key = "OPENAI_API_KEY"
-            self.model = "gpt-3.5-turbo"
-            self.temperature = 0.7
-            self.max_tokens = 2000
+        self.api_key = config.get('api.openai.api_key')
+        self.api_base = config.get('api.openai.base_url').rstrip("/")
+        self.model = config.get('api.openai.model')
+        self.temperature = config.get('api.openai.temperature')
+        self.max_tokens = config.get('api.openai.max_tokens')
+        self.fallback_models = [model for model in config.get('api.openai.fallback_models') if model != self.model]
+        http_transport.configure(config.get('api.openai.transport'))
+        response_cache.configure(config.get('api.openai.cache'))
+        context_builder.configure(config.get('api.openai.context'))
+        limits = dict(DEFAULT_SCHEDULER, **config.get('api.openai.scheduler'))
+        if self.scheduler is None:
+            self.scheduler = RequestScheduler(limits['workers'], limits['max_concurrent'], name="openai")
+        else:
+            self.scheduler.set_limits(limits['workers'], limits['max_concurrent'])
+    
+    def on_settings_changed(self, section, value):
+        if section == "api.openai":
+            self.load_settings()
+    
+    def resolve_api_key(self):
+        # Ayar dosyasında ortam değişkeninin adı da yazılabilir
+        key = os.environ.get(self.api_key, self.api_key)
+        if not key or key == "OPENAI_API_KEY":
+            return None
+        return key
     
     def get_response(self, message, callback=None):
-        if self.waiting_for_response:
-            return False
+        return self.stream_response(None, message, callback=callback)
+    
+    def stream_response(self, conversation_id, message, system_prompt=None, callback=None, priority=PRIORITY_NORMAL,
+                        history=None, context=None):
+        # Aynı konuşmadaki istekler sırayla, farklı konuşmalar paralel işlenir
+        # context kaydedilen Message'dır; geçmiş ondan işçi iş parçacığında kurulur ve yanıt gelince pencereye eklenir
+        request_id = next(self.request_ids)
+        with self.lock:
+            self.active[request_id] = conversation_id
+        self.scheduler.submit(conversation_id, self._run, conversation_id, message, system_prompt, history, context,
+                              request_id, callback, priority=priority)
+        self.queue_depth_changed.emit(self.scheduler.queue_depth())
+        return request_id
+    
+    def metrics(self):
+        return dict(self.scheduler.metrics(), cache=response_cache.metrics(), context=context_builder.metrics())
+    
+    def build_request(self, message, system_prompt=None, model=None, history=None):
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.extend(history or [])
+        messages.append({"role": "user", "content": message})
+        return {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+    
+    def _is_current(self, request_id):
+        return request_id not in self.aborted
+    
+    def _finish(self, request_id):
+        with self.lock:
+            self.active.pop(request_id, None)
+            self.aborted.discard(request_id)
+        self.queue_depth_changed.emit(self.scheduler.queue_depth())
+    
+    def _run(self, conversation_id, message, system_prompt, history, context, request_id, callback):
+        if not self._is_current(request_id):
+            self._finish(request_id)
+            self.response_failed.emit(conversation_id, "Yanıt iptal edildi")
+            return
+        self.response_started.emit(conversation_id)
+        started = time.perf_counter()
+        if context is not None:
+            try:
+                history = context_builder.build(conversation_id, message, system_prompt, exclude=context.message_id)
+            except Exception as e:
+                print(f"Konuşma geçmişi kurulamadı: {e}")
+                self._finish(request_id)
+                self.response_failed.emit(conversation_id, f"Konuşma geçmişi kurulamadı: {e}")
+                return
+        key = cache_key(self.model, self.temperature, system_prompt, message, history)
+        cached = response_cache.get(key)
+        if cached is not None:
+            # Önbellekten gelen yanıt tek parça halinde hemen iletilir
+            response, stats = cached
+            stats["saved_ms"] = stats.get("elapsed_ms", 0)
+            stats["elapsed_ms"] = stats["time_to_first_token_ms"] = (time.perf_counter() - started) * 1000
+            self.token_received.emit(conversation_id, response)
+            self._complete(conversation_id, request_id, response, stats, callback, context)
+            return
+        stats = {"model": self.model, "source": "network"}
+        parts = []
         
-        self.waiting_for_response = True
-        message_id = time.time()
-        self.current_message_id = message_id
+        def deliver(delta):
+            if not delta or not self._is_current(request_id):
+                return
+            if not parts:
+                stats["time_to_first_token_ms"] = (time.perf_counter() - started) * 1000
+            parts.append(delta)
+            self.token_received.emit(conversation_id, delta)
         
-        thread = threading.Thread(target=self._simulate_response, args=(message, message_id, callback))
-        thread.daemon = True
-        thread.start()
-
-        return True
-    
-    def _simulate_response(self, message, message_id, callback):
         try:
-            if "nasılsın" in message.lower():
-                response = "İyiyim, teşekkür ederim! Size nasıl yardımcı olabilirim?"
-            elif "selam" in message.lower() or "merhaba" in message.lower():
-                response = "Merhaba! Size nasıl yardımcı olabilirim?"
-            elif "nedir" in message.lower():
-                topic = re.search(r"([a-zğüşıöçA-ZĞÜŞİÖÇ]+)\s+nedir", message.lower())
-                if topic:
-                    topic = topic.group(1)
-                    response = f"{topic.capitalize()}, belirli bir kavram veya nesnenin açıklamasıdır. Daha spesifik bilgi için lütfen sorunuzu detaylandırın."
-                else:
-                    response = "Neyi açıklamamı istersiniz? Lütfen sorunuzu detaylandırın."
-            elif "yapay zeka" in message.lower() or "ai" in message.lower():
-                response = "Yapay zeka, insan zekasını taklit eden ve toplanan verilere göre yinelemeli olarak kendini geliştirebilen sistemlerdir. Bilgisayar bilimi dalıdır."
-            elif "yardım" in message.lower():
-                response = "Size şu konularda yardımcı olabilirim:\n- Sorularınızı yanıtlama\n- Bilgi verme\n- Önerilerde bulunma\n- Metin oluşturma\n\nNasıl yardımcı olabilirim?"
-            elif "hava durumu" in message.lower():
-                response = "Maalesef gerçek zamanlı hava durumu verilerine erişimim yok. Ancak güncel hava durumu için bir hava durumu sitesini veya uygulamasını kontrol edebilirsiniz."
-            elif "saat" in message.lower():
-                response = "Şu anki saati göremiyorum, ancak cihazınızın saatini kontrol edebilirsiniz."
-            elif "teşekkür" in message.lower():
-                response = "Rica ederim! Başka bir konuda yardıma ihtiyacınız olursa lütfen sorun."
-            elif "dinle" in message.lower() or "ses" in message.lower() or "müzik" in message.lower():
-                response = "Ses çalma veya müzik dinleme özelliğim henüz mevcut değil."
-            elif "göster" in message.lower() or "resim" in message.lower() or "fotoğraf" in message.lower():
-                response = "Görsel içerik gösterme özelliğim henüz mevcut değil."
+            api_key = self.resolve_api_key()
+            if api_key:
+                stats.update(self._stream_with_failover(api_key, message, system_prompt, history, deliver, request_id, parts))
             else:
-                responses = [
-                    "Bu konu hakkında size yardımcı olmak isterim. Daha fazla detay verebilir misiniz?",
-                    "İlginç bir soru. Bu konu üzerinde biraz daha konuşabilir miyiz?",
-                    "Anladığım kadarıyla bu konuyla ilgileniyorsunuz. Size nasıl yardımcı olabilirim?",
-                    "Bu sorunuzu yanıtlamak için elimden geleni yapacağım. Biraz daha açıklayabilir misiniz?",
-                    "Bu konuda size yardımcı olmaktan memnuniyet duyarım. Tam olarak neyi bilmek istiyorsunuz?"
-                ]
-                response = random.choice(responses)
-            if callback and message_id == self.current_message_id and not self.abort_current:
-                with self.lock:
-                    self.waiting_for_response = False
-                callback(response)
-            with self.lock:
-                if message_id == self.current_message_id:
-                    self.waiting_for_response = False
+                # API anahtarı yoksa yerel yanıt aynı sinyallerle kelime kelime iletilir
+                stats["model"] = "simulated"
+                stats["source"] = "simulated"
+                for delta in re.findall(r"\S+\s*", simulated_response(message)):
+                    deliver(delta)
+                stats["completion_tokens"] = len(parts)
+            response = "".join(parts)
+            stats["elapsed_ms"] = (time.perf_counter() - started) * 1000
+            # Yalnızca tamamlanmış gerçek API yanıtları önbelleğe yazılır
+            if api_key and self._is_current(request_id) and stats.get("finish_reason") != "length":
+                response_cache.put(key, stats["model"], response, stats)
+            self._complete(conversation_id, request_id, response, stats, callback, context)
         except Exception as e:
             print(f"Yanıt üretirken hata: {e}")
-            with self.lock:
-                self.waiting_for_response = False
+            self._finish(request_id)
+            self.response_failed.emit(conversation_id, str(e))
     
-    def abort_response(self):
-        with self.lock:
-            self.abort_current = True
-            self.waiting_for_response = False
-        
-        time.sleep(0.2)
-        
+    def _complete(self, conversation_id, request_id, response, stats, callback, context=None):
+        current = self._is_current(request_id)
+        # Tur, aynı konuşmanın sıradaki isteği başlamadan bu iş parçacığında bağlama eklenir
+        if current and context is not None:
+            context_builder.record(conversation_id, context, response)
+        self._finish(request_id)
+        if current:
+            self.response_completed.emit(conversation_id, response, stats)
+            self.response_received.emit(response)
+            if callback:
+                callback(response)
+        else:
+            self.response_failed.emit(conversation_id, "Yanıt iptal edildi")
+    
+    def _stream_with_failover(self, api_key, message, system_prompt, history, deliver, request_id, parts):
+        # Tüm denemeler ve yedek modeller aynı son tarihi paylaşır
+        deadline = http_transport.deadline()
+        models = [self.model] + self.fallback_models
+        for index, model in enumerate(models):
+            try:
+                stats = self._stream_completion(api_key, self.build_request(message, system_prompt, model, history), deliver, request_id, deadline)
+            except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+                status = e.response.status_code if e.response is not None else None
+                # Metin akmaya başladıktan sonra başka modele geçilirse yanıt ikilenir
+                if parts or index == len(models) - 1 or status is not None and status not in FAILOVER_STATUSES:
+                    raise
+                print(f"{model} yanıt vermedi ({e}), {models[index + 1]} deneniyor")
+                continue
+            stats["model"] = model
+            stats["failovers"] = index
+            return stats
+    
+    def _stream_completion(self, api_key, payload, deliver, request_id, deadline):
+        stats = {}
+        response = http_transport.request(
+            "POST",
+            f"{self.api_base}/chat/completions",
+            deadline=deadline,
+            headers={"Authorization": f"Bearer {api_key}", "Accept": "text/event-stream"},
+            json=payload,
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+            # chunk_size=None ile satırlar ağdan geldiği anda okunur, 512 baytlık tampon beklenmez
+            for data in iter_sse_events(response.iter_lines(chunk_size=None)):
+                if not self._is_current(request_id):
+                    break
+                if time.monotonic() > deadline:
+                    raise requests.Timeout("Yanıt akışı süre sınırını aştı")
+                # [DONE] sonrasında akış sonuna kadar okunur ki bağlantı havuza geri dönebilsin
+                if data == "[DONE]":
+                    continue
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    stats.update(chunk["usage"])
+                for choice in chunk.get("choices") or []:
+                    deliver((choice.get("delta") or {}).get("content"))
+                    if choice.get("finish_reason"):
+                        stats["finish_reason"] = choice["finish_reason"]
+        finally:
+            response.close()
+        return stats
+    
+    def abort_response(self, conversation_id=None):
+        # Sıradaki istekler de iptal işaretlenir, çalıştıklarında hemen response_failed yayarlar
         with self.lock:
-            self.abort_current = False
-
-chatgpt_manager = OpenAIChatManager() 
\ No newline at end of file
+            self.aborted.update(
+                request_id for request_id, owner in self.active.items()
+                if conversation_id is None or owner == conversation_id
+            )
@@ -0,0 +1,178 @@
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+DEFAULT_SCHEDULER = {
+    "workers": 8,
+    "max_concurrent": 4
+}
+
+class Job:
+    def __init__(self, key, fn, args, kwargs, priority, sequence):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.sequence = sequence
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+class RequestScheduler:
+    def __init__(self, workers=DEFAULT_SCHEDULER["workers"], max_concurrent=DEFAULT_SCHEDULER["max_concurrent"], name="istek"):
+        self.workers = workers
+        self.max_concurrent = max(1, min(max_concurrent, workers))
+        self.name = name
+        self.queues = {}
+        self.ready = []
+        self.running = set()
+        self.threads = []
+        self.idle = 0
+        self.stopped = False
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.max_depth = 0
+        self.wait_seconds = 0.0
+
+    def _push_ready(self, key):
+        # Bir konuşma ancak önündeki istek bittiğinde tekrar sıraya girer, böylece sırası korunur
+        head = self.queues[key][0]
+        heapq.heappush(self.ready, (head.priority, head.sequence, key))
+
+    def submit(self, conversation_id, fn, *args, priority=PRIORITY_NORMAL, **kwargs):
+        with self.condition:
+            if self.stopped:
+                raise RuntimeError("Zamanlayıcı durduruldu")
+            sequence = next(self.sequence)
+            key = conversation_id if conversation_id is not None else ("tekil", sequence)
+            job = Job(key, fn, args, kwargs, priority, sequence)
+            pending = self.queues.setdefault(key, deque())
+            pending.append(job)
+            if len(pending) == 1 and key not in self.running:
+                self._push_ready(key)
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._depth())
+            if self.idle == 0 and len(self.threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"{self.name}-{len(self.threads)}", daemon=True)
+                self.threads.append(thread)
+                thread.start()
+            self.condition.notify()
+            return job.future
+
+    def _depth(self):
+        return sum(len(pending) for pending in self.queues.values())
+
+    def _next_job(self):
+        while True:
+            while self.ready:
+                _, sequence, key = heapq.heappop(self.ready)
+                pending = self.queues.get(key)
+                if not pending or pending[0].sequence != sequence or key in self.running:
+                    continue
+                job = pending.popleft()
+                if not pending:
+                    del self.queues[key]
+                if not job.future.set_running_or_notify_cancel():
+                    self.cancelled += 1
+                    if key in self.queues:
+                        self._push_ready(key)
+                    continue
+                return job
+            return None
+
+    def _work(self):
+        while True:
+            with self.condition:
+                self.idle += 1
+                while not self.stopped and (len(self.running) >= self.max_concurrent or not self.ready):
+                    self.condition.wait()
+                self.idle -= 1
+                if self.stopped:
+                    return
+                job = self._next_job()
+                if job is None:
+                    continue
+                self.running.add(job.key)
+                self.wait_seconds += time.perf_counter() - job.queued_at
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.future.set_exception(e)
+                failed = True
+            else:
+                job.future.set_result(result)
+                failed = False
+            with self.condition:
+                self.running.discard(job.key)
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                if job.key in self.queues:
+                    self._push_ready(job.key)
+                self.condition.notify_all()
+
+    def cancel(self, conversation_id=None):
+        with self.condition:
+            keys = list(self.queues) if conversation_id is None else [conversation_id]
+            count = 0
+            for key in keys:
+                for job in self.queues.pop(key, ()):
+                    if job.future.cancel():
+                        count += 1
+            self.cancelled += count
+            return count
+
+    def set_limits(self, workers=None, max_concurrent=None):
+        with self.condition:
+            if workers is not None:
+                self.workers = max(workers, len(self.threads), 1)
+            if max_concurrent is not None:
+                self.max_concurrent = max(1, min(max_concurrent, self.workers))
+            self.condition.notify_all()
+
+    def queue_depth(self, conversation_id=None):
+        with self.condition:
+            if conversation_id is None:
+                return self._depth()
+            return len(self.queues.get(conversation_id, ()))
+
+    def metrics(self):
+        with self.condition:
+            started = self.completed + self.failed + len(self.running)
+            return {
+                "queued": self._depth(),
+                "running": len(self.running),
+                "waiting_conversations": sum(1 for key in self.queues if key not in self.running),
+                "per_conversation": {key: len(pending) for key, pending in self.queues.items() if not isinstance(key, tuple)},
+                "max_depth": self.max_depth,
+                "workers": len(self.threads),
+                "max_concurrent": self.max_concurrent,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "avg_wait_ms": self.wait_seconds / started * 1000 if started else 0.0
+            }
+
+    def stop(self, timeout=5):
+        self.cancel()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
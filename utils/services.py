@@ -0,0 +1,85 @@
+import time
+import importlib
+import threading
+from PyQt6.QtCore import QThread, Qt, pyqtSignal
+
+class LazyService:
+    def __init__(self, name, module, attribute=None):
+        self._name = name
+        self._module = module
+        self._attribute = attribute
+        self._instance = None
+        self._lock = threading.RLock()
+        self.init_seconds = None
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._module)
+                    instance = getattr(module, self._attribute)() if self._attribute else module
+                    self.init_seconds = time.perf_counter() - start
+                    self._instance = instance
+        return self._instance
+
+    def is_ready(self):
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+services = {}
+
+def register(name, module, attribute=None):
+    services[name] = LazyService(name, module, attribute)
+    return services[name]
+
+chatgpt_manager = register("chatgpt_manager", "utils.openai_utils", "OpenAIChatManager")
+email_manager = register("email_manager", "utils.email_utils", "EmailManager")
+model_manager = register("model_manager", "utils.model_utils", "ModelManager")
+sounddevice = register("sounddevice", "sounddevice")
+soundfile = register("soundfile", "soundfile")
+
+WARM_UP_ORDER = ["chatgpt_manager", "email_manager", "sounddevice", "soundfile"]
+
+class WarmUpWorker(QThread):
+    module_imported = pyqtSignal(str)
+
+    def __init__(self, names, parent=None):
+        super().__init__(parent)
+        self.names = names
+
+    def run(self):
+        # Modüller arka planda içe aktarılır, QObject servisleri GUI iş parçacığında kurulur
+        for name in self.names:
+            try:
+                importlib.import_module(services[name]._module)
+            except Exception as e:
+                print(f"{name} önceden yüklenemedi: {e}")
+                continue
+            self.module_imported.emit(name)
+
+def initialize_service(name):
+    try:
+        services[name].get()
+    except Exception as e:
+        print(f"{name} başlatılamadı: {e}")
+
+warm_up_worker = None
+
+def warm_up(names=None):
+    global warm_up_worker
+    if warm_up_worker is not None:
+        return warm_up_worker
+    warm_up_worker = WarmUpWorker([name for name in names or WARM_UP_ORDER if not services[name].is_ready()])
+    warm_up_worker.module_imported.connect(initialize_service, Qt.ConnectionType.QueuedConnection)
+    warm_up_worker.start()
+    return warm_up_worker
+
+def stop_warm_up():
+    if warm_up_worker is not None:
+        warm_up_worker.wait(5000)
+
+def service_timings():
+    return {name: service.init_seconds for name, service in services.items() if service.is_ready()}
@@ -0,0 +1,110 @@
+import time
+
+# İçe aktarma evresi bu modülün yüklendiği andan başlar, main.py onu ilk sırada içe aktarır
+STARTED = time.perf_counter()
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, QEvent
+
+TRACE_ENV = "DINAMIKCHAT_STARTUP_TRACE"
+
+class StartupProfiler:
+    def __init__(self, started=STARTED):
+        self.started = started
+        self.phases = []
+        self.marks = []
+        self.callbacks = []
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end=None):
+        end = time.perf_counter() if end is None else end
+        with self._lock:
+            self.phases.append((name, start, end, threading.get_ident()))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def mark(self, name):
+        with self._lock:
+            self.marks.append((name, time.perf_counter(), threading.get_ident()))
+
+    def summary(self):
+        # Aynı adlı evreler toplanır, süreler milisaniye cinsindendir
+        totals = {}
+        for name, start, end, _ in self.phases:
+            totals[name] = totals.get(name, 0.0) + (end - start) * 1000
+        for name, at, _ in self.marks:
+            totals[name] = (at - self.started) * 1000
+        return totals
+
+    def trace_events(self):
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "DinamikChat"}}]
+        for name, start, end, thread in self.phases:
+            events.append({
+                "name": name, "cat": "startup", "ph": "X", "pid": pid, "tid": thread,
+                "ts": round((start - self.started) * 1e6), "dur": round((end - start) * 1e6)
+            })
+        for name, at, thread in self.marks:
+            events.append({
+                "name": name, "cat": "startup", "ph": "i", "s": "p", "pid": pid, "tid": thread,
+                "ts": round((at - self.started) * 1e6)
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "summary": self.summary()}
+
+    def write_trace(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace_events(), f, indent=1)
+
+    def when_finished(self, callback):
+        if self.finished:
+            callback(self.summary())
+        else:
+            self.callbacks.append(callback)
+
+    def finish(self, trace_file=None):
+        if self.finished:
+            return
+        self.mark("first_paint")
+        self.finished = True
+        trace_file = os.environ.get(TRACE_ENV) or trace_file
+        if trace_file:
+            try:
+                self.write_trace(trace_file)
+            except Exception as e:
+                print(f"Başlangıç izi yazılamadı: {e}")
+        summary = self.summary()
+        for callback in self.callbacks:
+            callback(summary)
+        self.callbacks = []
+
+class FirstPaintFilter(QObject):
+    def __init__(self, profiler, trace_file=None, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.trace_file = trace_file
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint and not self.profiler.finished:
+            watched.removeEventFilter(self)
+            self.profiler.finish(self.trace_file)
+        return False
+
+def watch_first_paint(widget, trace_file=None):
+    paint_filter = FirstPaintFilter(startup, trace_file, widget)
+    widget.installEventFilter(paint_filter)
+    return paint_filter
+
+startup = StartupProfiler()